@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class GameApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'game_api'
+
+    def ready(self):
+        from .database import configure_sqlite
+        from .metrics import install_query_instrumentation, metrics_settings
+
+        # Apply the SQLite pragmas to each new connection
+        connection_created.connect(configure_sqlite)
+
+        # Count the SQL queries of every request on each new connection
+        options = metrics_settings()
+        if options["ENABLED"] and options["DB_QUERIES"]:
+            connection_created.connect(install_query_instrumentation)
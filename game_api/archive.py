@@ -0,0 +1,192 @@
+"""
+Packed roll storage for archived games.
+
+A completed game's rolls take 12 to 21 ``Roll`` rows, each with its own ID,
+foreign key, timestamp and index entries. Archiving a game packs its rolls
+into the game's ``packed_rolls`` field and deletes the rows, which shrinks
+the game to a few dozen bytes and lets its rolls be read with the game.
+
+Retention: a game's event log is kept only while the game is not archived.
+Archiving also deletes the game's ``GameEvent`` and ``GameSnapshot`` rows,
+since the packed rolls already are its final state; an archived game can
+still be replayed as of its latest event, but its earlier events, including
+the corrections and undos, are dropped. Its ``event_sequence`` is kept, so
+the version of its cached state and ``ETag`` does not change.
+
+Packed format:
+
+- byte 0: the format version, with ``HAS_TIMES`` set if timestamps follow;
+- byte 1: the number of rolls;
+- one byte per roll: the pins knocked down, in the order they were bowled;
+- if ``HAS_TIMES`` is set, one varint per roll: the milliseconds since the
+  previous roll, or since the game was created for the first roll, zigzag
+  encoded so that clock adjustments do not break decoding.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+
+from .models import Game, GameEvent, GameSnapshot, Roll
+from .scoring import FrameState, score_rolls
+
+FORMAT_VERSION = 1
+
+# Header flag set when roll timestamps are stored
+HAS_TIMES = 0x80
+
+
+class PackedRolls:
+    """
+    The rolls decoded from a packed game.
+
+    Attributes:
+        pins (bytes): The pins knocked down by each roll, in order.
+        times (list[datetime]): When each roll was recorded, or None if
+            timestamps were not stored.
+    """
+
+    __slots__ = ("pins", "times")
+
+    def __init__(self, pins, times=None):
+        self.pins = pins
+        self.times = times
+
+    def rows(self):
+        """Return ``(frame, roll_number, knocked_down_pins)`` for each roll."""
+        state = FrameState()
+        return [(*state.advance(pins), pins) for pins in self.pins]
+
+
+def pack_rolls(pins, times=None, start=None):
+    """
+    Pack the rolls of a game.
+
+    Parameters:
+        pins (Iterable[int]): The pins knocked down by each roll, in order.
+        times (list[datetime]): When each roll was recorded, or None to only
+            store the pins. Timestamps are kept to the millisecond.
+        start (datetime): When the game was created; required with times.
+
+    Returns:
+        bytes: The packed rolls.
+    """
+    pins = bytes(pins)
+    header = FORMAT_VERSION | (HAS_TIMES if times is not None else 0)
+    data = bytearray([header, len(pins)])
+    data += pins
+
+    if times is not None:
+        previous = start
+        for time in times:
+            delta = (time - previous) // timedelta(milliseconds=1)
+            write_varint(data, (delta << 1) ^ (delta >> 63))
+            previous += timedelta(milliseconds=delta)
+    return bytes(data)
+
+
+def unpack_rolls(data, start=None):
+    """
+    Decode packed rolls.
+
+    Parameters:
+        data (bytes | memoryview): The packed rolls.
+        start (datetime): When the game was created; timestamps are only
+            decoded if it is given.
+
+    Returns:
+        PackedRolls: The decoded rolls.
+
+    Raises:
+        ValueError: If the data is not in a supported format.
+    """
+    data = bytes(data)
+    if not data or data[0] & ~HAS_TIMES != FORMAT_VERSION:
+        raise ValueError("Unsupported packed rolls format")
+
+    count = data[1]
+    pins = data[2 : 2 + count]
+    if len(pins) != count:
+        raise ValueError("Truncated packed rolls")
+
+    times = None
+    if data[0] & HAS_TIMES and start is not None:
+        times, previous, offset = [], start, 2 + count
+        for _ in range(count):
+            value, offset = read_varint(data, offset)
+            previous += timedelta(milliseconds=(value >> 1) ^ -(value & 1))
+            times.append(previous)
+    return PackedRolls(pins, times)
+
+
+def write_varint(data, value):
+    """Append an unsigned integer to data, seven bits per byte."""
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+def read_varint(data, offset):
+    """Read an unsigned integer written by write_varint; return it and the next offset."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def compact_games(games, keep_times=True):
+    """
+    Pack the rolls of completed games and delete their Roll rows.
+
+    Each game's rolls are checked against its stored roll count and score
+    first; games that do not match are left untouched. The event log and
+    snapshots of the compacted games are deleted too, and idempotency keys
+    are not kept, so only games whose clients can no longer retry and whose
+    history is no longer audited should be compacted.
+
+    Parameters:
+        games (list[Game]): Completed, unpacked games, locked by the caller's
+            transaction.
+        keep_times (bool): Whether to store the roll timestamps.
+
+    Returns:
+        tuple[list[Game], list[Game]]: The games compacted and the games skipped.
+    """
+    rolls = {game.id: [] for game in games}
+    rows = Roll.objects.filter(game_id__in=list(rolls)).order_by(
+        "game_id", "frame", "roll_number"
+    )
+    for game_id, pins, created_at in rows.values_list(
+        "game_id", "knocked_down_pins", "created_at"
+    ):
+        rolls[game_id].append((pins, created_at))
+
+    compacted, skipped = [], []
+    for game in games:
+        pins = [pins for pins, _ in rolls[game.id]]
+        result = score_rolls(pins)
+        if (
+            len(pins) != game.roll_count
+            or not result.valid
+            or not result.completed
+            or result.total != game.score
+        ):
+            skipped.append(game)
+            continue
+
+        times = [created_at for _, created_at in rolls[game.id]] if keep_times else None
+        game.packed_rolls = pack_rolls(pins, times, game.created_at)
+        compacted.append(game)
+
+    with transaction.atomic():
+        Game.objects.bulk_update(compacted, ["packed_rolls"])
+        game_ids = [game.id for game in compacted]
+        Roll.objects.filter(game_id__in=game_ids).delete()
+        GameEvent.objects.filter(game_id__in=game_ids).delete()
+        GameSnapshot.objects.filter(game_id__in=game_ids).delete()
+    return compacted, skipped
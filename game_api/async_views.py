@@ -0,0 +1,314 @@
+"""
+Native async versions of the game, roll, score and summary endpoints.
+
+These views use Django's async ORM and the shared AsyncOpenAI client, so
+under ASGI a single worker can keep many summary requests waiting on the LLM
+while it keeps serving roll and score traffic. Responses match the
+synchronous endpoints.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+
+from .conditional import game_cache_headers, not_modified
+from .feed import (
+    SNAPSHOT_FIELDS,
+    aevent_stream,
+    center_channel,
+    event_stream_response,
+    game_channel,
+    score_feed,
+)
+from .llm import LLMUnavailableError
+from .models import Game
+from .pagination import KeysetPagination
+from .replicas import ReplicaReadsMixin
+from .serializers import GameSerializer, RollSerializer
+from .services import (
+    IdempotencyKeyReused,
+    InvalidRollError,
+    aget_fallback_summary,
+    aget_game_summary,
+    submit_roll,
+)
+from .state import GameState, aget_cached_game_state, aget_game_state
+
+
+def error_response(message, status):
+    """Return a JSON error response in the same shape as the DRF views."""
+    return JsonResponse({"error": message}, status=status)
+
+
+def parse_json(request):
+    """Return the decoded JSON body of a request, or an empty dict."""
+    try:
+        body = json.loads(request.body or b"{}")
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncGameView(ReplicaReadsMixin, View):
+    """
+    Async view to list games, newest first, and to create games.
+
+    Accepts the ``cursor``, ``page_size`` and ``completed`` query parameters
+    of the synchronous listing.
+    """
+
+    async def get(self, request):
+        """
+        List one page of games.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            JsonResponse: The page of games and the link to the next one.
+        """
+        pagination = KeysetPagination()
+        page_size = pagination.get_page_size(request)
+        games = Game.objects.only(*GameSerializer().fields)
+
+        completed = request.GET.get("completed")
+        if completed is not None:
+            games = games.filter(completed=completed.lower() in ("true", "1"))
+
+        cursor = request.GET.get(pagination.cursor_query_param)
+        if cursor:
+            try:
+                games = pagination.filter_after(games, cursor)
+            except NotFound as error:
+                return JsonResponse({"detail": str(error.detail)}, status=404)
+
+        rows = [game async for game in games.order_by("-created_at", "-id")[: page_size + 1]]
+        page = rows[:page_size]
+
+        next_link = None
+        if len(rows) > page_size:
+            next_link = pagination.next_link(request.build_absolute_uri(), page[-1])
+        return JsonResponse(
+            {"next": next_link, "results": GameSerializer(page, many=True).data}
+        )
+
+    async def post(self, request):
+        """
+        Create a new game.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object with an optional title.
+
+        Returns:
+            JsonResponse: The created game.
+        """
+        serializer = GameSerializer(data=parse_json(request))
+        if not serializer.is_valid():
+            return JsonResponse({"error": serializer.errors}, status=400)
+
+        game = await Game.objects.acreate(**serializer.validated_data)
+        return JsonResponse(GameSerializer(game).data, status=201)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncGameRollView(View):
+    """
+    Async view to submit a roll for a specific game.
+
+    Supports the ``Idempotency-Key`` header like the synchronous view.
+    """
+
+    async def post(self, request, game_id):
+        """
+        Submit a roll for a specific game.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object containing the roll data.
+            game_id (int): The ID of the game.
+
+        Returns:
+            JsonResponse: The recorded roll or an error message.
+        """
+        knocked_down_pins = parse_json(request).get("knocked_down_pins")
+        if knocked_down_pins is None:
+            return error_response("knocked_down_pins is required", 400)
+        if (
+            not isinstance(knocked_down_pins, int)
+            or knocked_down_pins < 0
+            or knocked_down_pins > 10
+        ):
+            return error_response(
+                f"Invalid knocked_down_pins value. It must be an integer between 0 and 10.{knocked_down_pins}",
+                400,
+            )
+
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+            return error_response(
+                "Idempotency-Key must be between 1 and 255 characters", 400
+            )
+
+        # Transactions are not supported by the async ORM, so the locked
+        # write runs in a thread like the synchronous view
+        try:
+            roll, replayed = await sync_to_async(submit_roll)(
+                game_id, knocked_down_pins, idempotency_key
+            )
+        except Game.DoesNotExist:
+            return error_response("Game not found", 404)
+        except InvalidRollError as error:
+            return error_response(str(error), 400)
+        except IdempotencyKeyReused as error:
+            return error_response(str(error), 422)
+
+        response = JsonResponse(
+            {"message": "Roll recorded successfully", "data": RollSerializer(roll).data},
+            status=201,
+        )
+        if replayed:
+            response["Idempotent-Replayed"] = "true"
+        return response
+
+
+class AsyncGameScoreView(ReplicaReadsMixin, View):
+    """
+    Async view to retrieve the running score of a specific game.
+    """
+
+    async def get(self, request, game_id):
+        """
+        Retrieve the score for a specific game.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            JsonResponse: The score or an error message.
+        """
+        try:
+            state = await aget_game_state(game_id)
+        except Game.DoesNotExist:
+            return error_response("Game not found", 404)
+
+        headers = game_cache_headers(state, "score")
+        return not_modified(request, state, headers) or JsonResponse(
+            {"game_id": game_id, "score": state.score}, headers=headers
+        )
+
+
+class AsyncGameSummaryView(ReplicaReadsMixin, View):
+    """
+    Async view to generate a game summary for a specific game.
+
+    While the LLM is generating, the request only holds a coroutine, not a
+    worker thread. Falls back to a scorecard summary like the synchronous
+    view while the LLM is unavailable.
+    """
+
+    async def get(self, request, game_id):
+        """
+        Generate a game summary for a specific game.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            JsonResponse: The summary or an error message.
+        """
+        try:
+            game = None
+            state = await aget_cached_game_state(game_id)
+            if state is None:
+                game = await Game.objects.aget(id=game_id)
+                state = GameState.from_game(game)
+            response = not_modified(
+                request, state, game_cache_headers(state, "summary", weak=True)
+            )
+            if response is not None:
+                return response
+            if game is None:
+                game = await Game.objects.aget(id=game_id)
+        except Game.DoesNotExist:
+            return error_response("Game not found", 404)
+
+        try:
+            summary = await aget_game_summary(game)
+        except LLMUnavailableError as error:
+            return JsonResponse(
+                {
+                    "game_id": game.id,
+                    "summary": await aget_fallback_summary(game, error),
+                    "fallback": True,
+                },
+                headers={"Cache-Control": "no-store"},
+            )
+        return JsonResponse(
+            {"game_id": game.id, "summary": summary},
+            headers=game_cache_headers(GameState.from_game(game), "summary", weak=True),
+        )
+
+
+class AsyncGameLiveView(View):
+    """
+    Async view streaming live score updates of a specific game.
+
+    Each open stream only holds a coroutine waiting for updates, so one ASGI
+    worker can serve many lane displays and spectators.
+    """
+
+    async def get(self, request, game_id):
+        """
+        Stream the score updates of a specific game.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            StreamingHttpResponse: The event stream, or an error response.
+        """
+        if not await Game.objects.filter(id=game_id).aexists():
+            return error_response("Game not found", 404)
+
+        async def snapshots():
+            return [
+                game async for game in Game.objects.filter(id=game_id).only(*SNAPSHOT_FIELDS)
+            ]
+
+        return event_stream_response(
+            aevent_stream(score_feed, [game_channel(game_id)], snapshots)
+        )
+
+
+class AsyncCenterLiveView(View):
+    """
+    Async view streaming live score updates of every game at a bowling center.
+    """
+
+    async def get(self, request, center):
+        """
+        Stream the score updates of the games at a bowling center.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            center (str): The name of the bowling center.
+
+        Returns:
+            StreamingHttpResponse: The event stream.
+        """
+
+        async def snapshots():
+            games = Game.objects.filter(center=center, completed=False)
+            return [game async for game in games.only(*SNAPSHOT_FIELDS)]
+
+        return event_stream_response(
+            aevent_stream(score_feed, [center_channel(center)], snapshots)
+        )
@@ -0,0 +1,143 @@
+"""
+Vectorized scoring of many games at once.
+
+The rolls of the requested games are read with exactly two queries, one for
+the Roll rows of games in play and one for the packed rolls of archived
+games, and packed into a padded ``games x 21`` NumPy matrix, which is then
+scored frame by frame for every game simultaneously.
+"""
+
+from itertools import chain
+
+import numpy as np
+from django.db.models import QuerySet
+
+from .archive import unpack_rolls
+from .models import Game, Roll
+from .scoring import FRAMES, PINS
+
+# The most rolls a game can have: two per frame plus the 10th frame fill ball.
+MAX_ROLLS = 2 * FRAMES + 1
+
+
+def load_roll_matrix(games, chunk_size=10000):
+    """
+    Load the rolls of a set of games into a padded pin matrix.
+
+    Issues exactly two queries: the Roll rows, then the packed rolls of
+    archived games.
+
+    Parameters:
+        games (QuerySet | Iterable[int]): A Game queryset, or the game IDs to load.
+        chunk_size (int): Number of rolls fetched from the database at a time.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The sorted game IDs, the
+            ``len(game_ids) x 21`` pin matrix and the number of rolls per game.
+    """
+    if isinstance(games, QuerySet):
+        rolls = Roll.objects.filter(game__in=games.values("id"))
+        packed = Game.objects.filter(id__in=games.values("id"))
+    else:
+        game_ids = list(games)
+        rolls = Roll.objects.filter(game_id__in=game_ids)
+        packed = Game.objects.filter(id__in=game_ids)
+
+    rolls = rolls.order_by("game_id", "frame", "roll_number").values_list(
+        "game_id", "knocked_down_pins"
+    )
+    flat = np.fromiter(
+        chain.from_iterable(rolls.iterator(chunk_size=chunk_size)), dtype=np.int64
+    )
+    game_column, pins = flat[0::2], flat[1::2]
+
+    # Archived games have no Roll rows; their packed rolls are appended and
+    # everything is put back in game order
+    packed = packed.filter(packed_rolls__isnull=False).values_list("id", "packed_rolls")
+    packed_columns, packed_pins = [], []
+    for game_id, data in packed.iterator(chunk_size=chunk_size):
+        game_pins = np.frombuffer(unpack_rolls(data).pins, dtype=np.uint8)
+        packed_columns.append(np.full(len(game_pins), game_id, dtype=np.int64))
+        packed_pins.append(game_pins)
+    if packed_columns:
+        game_column = np.concatenate([game_column, *packed_columns])
+        pins = np.concatenate([pins, *packed_pins])
+        order = np.argsort(game_column, kind="stable")
+        game_column, pins = game_column[order], pins[order]
+
+    # Rolls are sorted by game, so each roll's position within its game is its
+    # offset from the first roll of that game
+    game_ids, starts, game_index = np.unique(
+        game_column, return_index=True, return_inverse=True
+    )
+    positions = np.arange(len(pins)) - starts[game_index]
+    in_range = positions < MAX_ROLLS
+
+    matrix = np.zeros((len(game_ids), MAX_ROLLS), dtype=np.int16)
+    matrix[game_index[in_range], positions[in_range]] = pins[in_range]
+    lengths = np.bincount(game_index, minlength=len(game_ids)).clip(max=MAX_ROLLS)
+
+    return game_ids, matrix, lengths
+
+
+def score_matrix(matrix, lengths):
+    """
+    Score every game of a padded pin matrix in one pass over the frames.
+
+    Rolls are expected to be valid; unlike the scoring engine, invalid
+    sequences are not detected.
+
+    Parameters:
+        matrix (np.ndarray): A ``games x 21`` matrix of pins per roll, padded with 0.
+        lengths (np.ndarray): The number of rolls recorded for each game.
+
+    Returns:
+        dict[str, np.ndarray]: The ``score`` of each game, and the number of
+            ``strikes``, ``spares`` and ``open_frames`` among its played frames.
+    """
+    games = len(matrix)
+    rows = np.arange(games)
+    index = np.zeros(games, dtype=np.intp)
+    result = {
+        "score": np.zeros(games, dtype=np.int32),
+        "strikes": np.zeros(games, dtype=np.int16),
+        "spares": np.zeros(games, dtype=np.int16),
+        "open_frames": np.zeros(games, dtype=np.int16),
+    }
+
+    for _ in range(FRAMES):
+        first = matrix[rows, index]
+        second = matrix[rows, index + 1]
+        third = matrix[rows, index + 2]
+
+        played = index < lengths
+        strike = first == PINS
+        spare = ~strike & (first + second == PINS)
+
+        # Strikes and spares both score the frame's pins plus the following
+        # roll(s), which for either is exactly the next three rolls
+        result["score"] += first + second + np.where(strike | spare, third, 0)
+        result["strikes"] += strike & played
+        result["spares"] += spare & played
+        result["open_frames"] += ~strike & ~spare & played
+
+        index += np.where(strike, 1, 2)
+
+    return result
+
+
+def batch_score(games, chunk_size=10000):
+    """
+    Score many games with two queries, like load_roll_matrix.
+
+    Parameters:
+        games (QuerySet | Iterable[int]): A Game queryset, or the game IDs to score.
+        chunk_size (int): Number of rolls fetched from the database at a time.
+
+    Returns:
+        dict[int, int]: The score of each game with at least one roll, keyed
+            by game ID.
+    """
+    game_ids, matrix, lengths = load_roll_matrix(games, chunk_size=chunk_size)
+    scores = score_matrix(matrix, lengths)["score"]
+    return dict(zip(game_ids.tolist(), scores.tolist()))
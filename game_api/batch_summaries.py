@@ -0,0 +1,284 @@
+"""
+Batched summaries of many games.
+
+A single game summary sends one prompt per game, with a sentence per roll.
+Recapping a whole night at a center that way takes hundreds of sequential
+LLM calls. Batched summaries instead write each game as one line of frame
+notation (``X 7/ 9- ...``) and ask the model for one summary line per
+game. Games are packed into as few calls as the per-call token budget
+allows, and the calls run concurrently on a bounded thread pool.
+
+Summaries are stored in the summary cache with the fingerprint of the roll
+state they describe, so the single game endpoint reuses them, and games
+with a current cached summary are not sent again.
+"""
+
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from openai import OpenAIError
+
+from .batch import load_roll_matrix
+from .cache import summary_cache
+from .llm import LLMUnavailableError
+from .scoring import PINS, score_rolls
+from .services import complete_summary, get_cached_summary, summary_fingerprints
+
+PROMPT_HEADER = (
+    "Summarize each bowling game below in one or two sentences.\n"
+    "Each game is written as: #<game id> <frames> = <score>, where frames are "
+    "separated by spaces, X is a strike, / a spare and - a miss.\n"
+    "Answer with exactly one line per game, in the same order, formatted as "
+    '"#<game id>: <summary>".\n'
+)
+
+# Characters per token used to estimate prompt sizes. Rolls and frame marks
+# tokenize more densely than prose, so this errs on the side of more tokens.
+CHARS_PER_TOKEN = 3
+
+# Error of the games the model left out of its answer
+NOT_SUMMARIZED = "Not summarized by the model"
+
+# A "#<game id>: <summary>" line of the model's answer
+ANSWER_LINE = re.compile(r"^\W*#?\s*(\d+)\s*[:.)\-]\s*(.+?)\s*$")
+
+
+def batch_summary_settings():
+    """Return the batched summary settings dictionary, with defaults filled in."""
+    options = {
+        "TOKEN_BUDGET": 4000,
+        "MAX_GAMES": 40,
+        "RESPONSE_TOKENS_PER_GAME": 60,
+        "CONCURRENCY": 4,
+        "TIMEOUT": 60,
+    }
+    options.update(getattr(settings, "SUMMARY_BATCH", {}))
+    return options
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens a text takes in a prompt."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def frame_marks(rolls):
+    """
+    Write the rolls of a frame in bowling notation.
+
+    Parameters:
+        rolls (list[int]): The pins knocked down by each roll of the frame.
+
+    Returns:
+        str: The frame's marks, e.g. ``X``, ``7/``, ``9-`` or ``X7/``.
+    """
+    marks, standing, first_ball = [], PINS, True
+    for pins in rolls:
+        if pins == standing:
+            marks.append("X" if first_ball else "/")
+            # Pins are reset after a strike or spare in the 10th frame
+            standing, first_ball = PINS, True
+        else:
+            marks.append(str(pins) if pins else "-")
+            standing, first_ball = standing - pins, False
+    return "".join(marks)
+
+
+def game_line(game_id, pins):
+    """
+    Write a game as one line of a batched prompt.
+
+    Parameters:
+        game_id (int): The ID of the game.
+        pins (Iterable[int]): The pins knocked down by each roll, in order.
+
+    Returns:
+        str: The line, e.g. ``#12 X 7/ 9- = 48 (in progress)``.
+    """
+    result = score_rolls(pins)
+    frames = " ".join(frame_marks(frame.rolls) for frame in result.frames)
+    line = f"#{game_id} {frames or '(no rolls)'} = {result.total}"
+    return line if result.completed else f"{line} (in progress)"
+
+
+def plan_batches(lines, options):
+    """
+    Pack game lines into batches that fit the token budget.
+
+    Games keep their order. A game whose line alone exceeds the budget is
+    sent on its own.
+
+    Parameters:
+        lines (dict[int, str]): The prompt line of each game, by ID.
+        options (dict): The batched summary settings.
+
+    Returns:
+        list[dict[int, str]]: The lines of each batch, by game ID.
+    """
+    budget = options["TOKEN_BUDGET"] - estimate_tokens(PROMPT_HEADER)
+    batches, batch, used = [], {}, 0
+    for game_id, line in lines.items():
+        cost = estimate_tokens(line) + options["RESPONSE_TOKENS_PER_GAME"]
+        if batch and (used + cost > budget or len(batch) == options["MAX_GAMES"]):
+            batches.append(batch)
+            batch, used = {}, 0
+        batch[game_id] = line
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_summaries(answer, game_ids):
+    """
+    Split the model's answer to a batch into per-game summaries.
+
+    Parameters:
+        answer (str): The model's answer.
+        game_ids (Iterable[int]): The IDs of the games in the batch; lines
+            about other games are ignored.
+
+    Returns:
+        dict[int, str]: The summary of each game the answer covers, by ID.
+    """
+    game_ids = set(game_ids)
+    summaries = {}
+    for line in answer.splitlines():
+        match = ANSWER_LINE.match(line)
+        if match is None:
+            continue
+        game_id = int(match.group(1))
+        if game_id in game_ids and game_id not in summaries:
+            summaries[game_id] = match.group(2)
+    return summaries
+
+
+class BatchSummaries:
+    """
+    The outcome of summarizing a set of games.
+
+    Attributes:
+        summaries (dict[int, str]): The summary of each game, by ID, in the
+            order the games were given; None for games the model did not
+            summarize.
+        errors (dict[int, str]): Why a game has no summary, by ID.
+        calls (int): The number of LLM calls made.
+        prompt_tokens (int): The estimated number of prompt tokens sent.
+        cached (int): The number of summaries served from the cache.
+    """
+
+    __slots__ = ("summaries", "errors", "calls", "prompt_tokens", "cached")
+
+    def __init__(self):
+        self.summaries = {}
+        self.errors = {}
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached = 0
+
+    def as_dict(self):
+        """Return the outcome as JSON-serializable data."""
+        games = []
+        for game_id, summary in self.summaries.items():
+            game = {"game_id": game_id, "summary": summary}
+            if game_id in self.errors:
+                game["error"] = self.errors[game_id]
+            games.append(game)
+        return {
+            "games": games,
+            "llm_calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached": self.cached,
+        }
+
+
+def summarize_batch(lines, options):
+    """
+    Summarize a batch of games with a single LLM call.
+
+    Parameters:
+        lines (dict[int, str]): The prompt line of each game, by ID.
+        options (dict): The batched summary settings.
+
+    Returns:
+        tuple[dict[int, str], int, str]: The summaries the answer covers, the
+            estimated prompt tokens and the error if the call failed.
+    """
+    prompt = PROMPT_HEADER + "\n".join(lines.values())
+    try:
+        answer = complete_summary(
+            prompt,
+            timeout=options["TIMEOUT"],
+            max_tokens=options["RESPONSE_TOKENS_PER_GAME"] * len(lines),
+        )
+    except (OpenAIError, LLMUnavailableError) as error:
+        return {}, estimate_tokens(prompt), str(error) or error.__class__.__name__
+    return parse_summaries(answer or "", lines), estimate_tokens(prompt), None
+
+
+def summarize_games(games):
+    """
+    Summarize many games with as few LLM calls as the token budget allows.
+
+    Games the model leaves out of its answer are sent once more in new
+    batches. Failed calls do not stop the other batches; their games are
+    reported with an error.
+
+    Parameters:
+        games (Iterable[Game]): The games to summarize.
+
+    Returns:
+        BatchSummaries: The summaries and the cost of generating them.
+    """
+    options = batch_summary_settings()
+    games = list(games)
+    fingerprints = summary_fingerprints(games)
+    outcome = BatchSummaries()
+
+    pending = []
+    for game in games:
+        summary = get_cached_summary(game.id, fingerprints[game.id])
+        outcome.summaries[game.id] = summary
+        if summary is None:
+            pending.append(game.id)
+        else:
+            outcome.cached += 1
+    if not pending:
+        return outcome
+
+    game_ids, matrix, lengths = load_roll_matrix(pending)
+    pins = {
+        game_id: matrix[row, : lengths[row]].tolist()
+        for row, game_id in enumerate(game_ids.tolist())
+    }
+    lines = {game_id: game_line(game_id, pins.get(game_id, [])) for game_id in pending}
+
+    with ThreadPoolExecutor(
+        max_workers=options["CONCURRENCY"], thread_name_prefix="batch-summary"
+    ) as executor:
+        for attempt in range(2):
+            batches = plan_batches(lines, options)
+            results = executor.map(lambda batch: summarize_batch(batch, options), batches)
+            for batch, (summaries, tokens, error) in zip(batches, results):
+                outcome.calls += 1
+                outcome.prompt_tokens += tokens
+                for game_id in batch:
+                    if game_id in summaries:
+                        outcome.summaries[game_id] = summaries[game_id]
+                        outcome.errors.pop(game_id, None)
+                        summary_cache.set(
+                            game_id, (fingerprints[game_id], summaries[game_id])
+                        )
+                    else:
+                        outcome.errors[game_id] = error or NOT_SUMMARIZED
+            # Retry the games the model left out, but not those of failed calls
+            lines = {
+                game_id: line
+                for game_id, line in lines.items()
+                if outcome.errors.get(game_id) == NOT_SUMMARIZED
+            }
+            if not lines:
+                break
+
+    return outcome
@@ -0,0 +1,201 @@
+"""
+Small caches with hit/miss accounting.
+
+``LRUCache`` is a bounded, thread-safe, in-process cache with a time to live.
+``DjangoCache`` offers the same interface on top of a Django cache alias, for
+deployments where several workers need to share entries. Each cache's
+``shared`` attribute tells whether other processes see its entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import registry
+
+
+class CacheStats:
+    """
+    Hit, miss and eviction counters of a cache.
+
+    Attributes:
+        hits (int): Number of lookups that found a live entry.
+        misses (int): Number of lookups that found no live entry.
+        evictions (int): Number of entries dropped to respect the size bound.
+    """
+
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        """float: The share of lookups that were hits, or 0.0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        """Return the counters and hit rate as a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class LRUCache:
+    """
+    A bounded in-process cache evicting the least recently used entries.
+
+    Parameters:
+        max_size (int): The maximum number of entries kept.
+        ttl (float): Seconds an entry stays valid, or None to never expire.
+    """
+
+    # Entries are only seen by the current process
+    shared = False
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the live entry for key, or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.stats.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Return the live entry for key without counting a lookup or refreshing it."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+            return entry[0]
+        return default
+
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entries if the cache is full."""
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key):
+        """Drop the entry for key, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DjangoCache:
+    """
+    The LRUCache interface on top of a Django cache alias.
+
+    Hit and miss counters are kept per process.
+
+    Parameters:
+        alias (str): The Django cache alias to use.
+        ttl (float): Seconds an entry stays valid, or None to never expire.
+        key_prefix (str): Prefix distinguishing these keys from other users of the alias.
+    """
+
+    def __init__(self, alias="default", ttl=None, key_prefix=""):
+        self.alias = alias
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.stats = CacheStats()
+
+    @property
+    def backend(self):
+        """The Django cache backend, looked up per call as Django recommends."""
+        return caches[self.alias]
+
+    @property
+    def shared(self):
+        """bool: Whether other processes see the entries, unless the alias is a LocMemCache."""
+        return not isinstance(self.backend, LocMemCache)
+
+    def make_key(self, key):
+        """Return the Django cache key for key."""
+        return f"{self.key_prefix}{key}"
+
+    def get(self, key, default=None):
+        """Return the live entry for key, or default."""
+        missing = object()
+        value = self.backend.get(self.make_key(key), missing)
+        if value is missing:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key, default=None):
+        """Return the live entry for key without counting a lookup."""
+        return self.backend.get(self.make_key(key), default)
+
+    def set(self, key, value):
+        """Store value under key."""
+        self.backend.set(self.make_key(key), value, self.ttl)
+
+    def delete(self, key):
+        """Drop the entry for key, if any."""
+        self.backend.delete(self.make_key(key))
+
+    def clear(self):
+        """Reset the counters; shared entries are left to expire."""
+        self.stats = CacheStats()
+
+
+def build_cache(options, key_prefix):
+    """
+    Build a cache from a settings dictionary.
+
+    Parameters:
+        options (dict): ``BACKEND`` (``locmem`` or ``django``), ``MAX_SIZE``,
+            ``TTL`` and, for the django backend, ``ALIAS``.
+        key_prefix (str): Prefix for keys stored in a Django cache.
+
+    Returns:
+        LRUCache | DjangoCache: The configured cache.
+    """
+    if options.get("BACKEND", "locmem") == "django":
+        return DjangoCache(
+            alias=options.get("ALIAS", "default"),
+            ttl=options.get("TTL"),
+            key_prefix=key_prefix,
+        )
+    return LRUCache(max_size=options.get("MAX_SIZE", 1024), ttl=options.get("TTL"))
+
+
+# Cached game summaries, keyed by game ID
+summary_cache = build_cache(getattr(settings, "SUMMARY_CACHE", {}), "summary:")
+registry.caches.register("summary", summary_cache)
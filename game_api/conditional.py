@@ -0,0 +1,99 @@
+"""
+HTTP caching of game reads.
+
+A game's score, scorecard and summary change only when a roll is recorded,
+corrected or undone, so their validators come from the cached game state:
+the entity tag from the game's ID and the sequence number of its latest
+event, ``Last-Modified`` from the time of its latest roll change. The roll
+count cannot identify a representation, since a correction changes the
+score without changing it. Views check a request's conditional headers against them before
+loading rolls, scoring or calling the LLM, and answer ``304 Not Modified``
+when the client's copy is current.
+
+Completed games never change again, so their responses may be cached by
+clients, reverse proxies and CDNs for ``COMPLETED_MAX_AGE`` seconds. Games
+in progress must be revalidated on every read.
+"""
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def http_cache_settings():
+    """Return the HTTP caching settings dictionary, with defaults filled in."""
+    options = {"COMPLETED_MAX_AGE": 31536000}
+    options.update(getattr(settings, "HTTP_CACHE", {}))
+    return options
+
+
+def game_etag(state, kind, weak=False):
+    """
+    Build the entity tag of a representation of a game.
+
+    Parameters:
+        state (GameState): The game's state.
+        kind (str): The representation, so that different endpoints of the
+            same game do not share tags.
+        weak (bool): Whether the representation is only semantically
+            equivalent between responses, like a regenerated summary.
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    etag = f'"{kind}-{state.game_id}-{state.version}"'
+    return f"W/{etag}" if weak else etag
+
+
+def game_cache_headers(state, kind, weak=False):
+    """
+    Build the validator and Cache-Control headers of a representation of a game.
+
+    Parameters:
+        state (GameState): The game's state.
+        kind (str): The representation, as for game_etag.
+        weak (bool): Whether to use a weak entity tag.
+
+    Returns:
+        dict[str, str]: The ``ETag``, ``Last-Modified`` and ``Cache-Control``
+            headers.
+    """
+    if state.completed:
+        max_age = http_cache_settings()["COMPLETED_MAX_AGE"]
+        cache_control = f"public, max-age={max_age}, immutable"
+    else:
+        cache_control = "no-cache"
+    headers = {"ETag": game_etag(state, kind, weak), "Cache-Control": cache_control}
+    if state.modified_at is not None:
+        headers["Last-Modified"] = http_date(state.modified_at.timestamp())
+    return headers
+
+
+def not_modified(request, state, headers):
+    """
+    Answer a conditional request whose cached copy is still current.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since``, and
+    entity tags are compared weakly, as RFC 9110 specifies.
+
+    Parameters:
+        request (HttpRequest): The HTTP request.
+        state (GameState): The game's state.
+        headers (dict[str, str]): The headers built by game_cache_headers.
+
+    Returns:
+        HttpResponse: A 304 Not Modified response carrying the headers, a
+            412 Precondition Failed response, or None if the full response
+            must be sent.
+    """
+    last_modified = None
+    if state.modified_at is not None:
+        last_modified = int(state.modified_at.timestamp())
+    response = get_conditional_response(
+        request, etag=headers["ETag"], last_modified=last_modified
+    )
+    if isinstance(response, HttpResponseNotModified):
+        for name, value in headers.items():
+            response[name] = value
+    return response
@@ -0,0 +1,79 @@
+"""
+Database connection setup.
+
+SQLite's defaults suit a single process: a rollback journal that makes
+readers and the writer block each other, a sync to disk on every commit and
+no memory map. ``configure_sqlite`` applies the ``SQLITE_PRAGMAS`` setting
+to every new SQLite connection instead; see the setting's comment for the
+trade-offs. Read replica connections only get the pragmas that tune reads.
+PostgreSQL connections need no setup.
+"""
+
+from django.conf import settings
+
+from .replicas import replica_settings
+
+# SQLite's own settings, for comparing against the configured ones
+SQLITE_DEFAULTS = {
+    "journal_mode": "delete",
+    "synchronous": "full",
+    "busy_timeout": 0,
+    "mmap_size": 0,
+}
+
+# Names of the values of PRAGMA synchronous
+SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+
+# Pragmas that only tune the connection's reads. Replica files are kept up to
+# date by an external tool, so their connections get these alone: setting
+# journal_mode writes to the database file.
+READ_PRAGMAS = ("busy_timeout", "mmap_size")
+
+
+def sqlite_pragmas():
+    """Return the pragmas applied to SQLite connections, with defaults filled in."""
+    pragmas = dict(SQLITE_DEFAULTS)
+    pragmas.update(getattr(settings, "SQLITE_PRAGMAS", {}))
+    return pragmas
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply the SQLITE_PRAGMAS setting to a new SQLite connection.
+
+    Connections to read replicas only get the pragmas in READ_PRAGMAS.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = sqlite_pragmas()
+    if connection.alias in replica_settings()["ALIASES"]:
+        pragmas = {name: pragmas[name] for name in READ_PRAGMAS}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def database_profile(connection):
+    """
+    Describe the settings a database connection actually runs with.
+
+    Parameters:
+        connection (BaseDatabaseWrapper): The database connection.
+
+    Returns:
+        dict: The database vendor, whether connections are pooled or kept
+            open, and for SQLite the pragmas in effect.
+    """
+    options = connection.settings_dict.get("OPTIONS", {})
+    profile = {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE", 0),
+        "pool": bool(options.get("pool")),
+    }
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for name in SQLITE_DEFAULTS:
+                cursor.execute(f"PRAGMA {name}")
+                profile[name] = cursor.fetchone()[0]
+        profile["synchronous"] = SYNCHRONOUS_LEVELS[profile["synchronous"]]
+    return profile
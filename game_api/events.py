@@ -0,0 +1,196 @@
+"""
+Append-only event log of games.
+
+``Roll`` rows say which frame a roll belongs to, but not in which order a
+game's rolls were changed, and their timestamps cannot tell under clock skew
+or concurrent inserts. Every change to a game's rolls is therefore also
+appended to the game's event log: a ``roll`` event per recorded roll, a
+``correction`` when a mis-keyed roll is replaced and an ``undo`` when the
+last roll is removed. Sequence numbers come from ``Game.event_sequence``
+while the game row is locked, so each game's events are numbered 1, 2, 3...
+in the order they happened. Events are never updated, and are only deleted
+when the game is archived (see ``game_api.archive``).
+
+Every ``SNAPSHOT_INTERVAL`` events the game's rolls are saved in a
+snapshot, and ``replay_game`` rebuilds a game as of any event from the
+latest snapshot before it plus the events after it. Archived games are only
+replayed as of their latest event, from their packed rolls.
+"""
+
+from django.conf import settings
+
+from .archive import unpack_rolls
+from .models import Game, GameEvent, GameSnapshot, Roll
+from .scoring import score_rolls
+
+
+def event_log_settings():
+    """Return the event log settings dictionary, with defaults filled in."""
+    options = {"SNAPSHOT_INTERVAL": 10}
+    options.update(getattr(settings, "EVENT_LOG", {}))
+    return options
+
+
+def append_events(games_events):
+    """
+    Append events to the logs of one or more games.
+
+    Each game's ``event_sequence`` is advanced in memory for the caller to
+    save with the game. Games whose log reaches a new multiple of
+    ``SNAPSHOT_INTERVAL`` are snapshotted from their Roll rows, so the rolls
+    must be written first.
+
+    Parameters:
+        games_events (list[tuple[Game, list[GameEvent]]]): Each game, locked
+            by the caller's transaction, with its new unsaved events in
+            order; their game and sequence are set here.
+
+    Returns:
+        list[GameEvent]: The saved events.
+    """
+    interval = event_log_settings()["SNAPSHOT_INTERVAL"]
+    events, due = [], []
+    for game, game_events in games_events:
+        start = game.event_sequence
+        for event in game_events:
+            game.event_sequence += 1
+            event.game = game
+            event.sequence = game.event_sequence
+            events.append(event)
+        if interval and game.event_sequence // interval > start // interval:
+            due.append(game)
+
+    events = GameEvent.objects.bulk_create(events)
+    if due:
+        take_snapshots(due)
+    return events
+
+
+def take_snapshots(games):
+    """
+    Snapshot the rolls of games as of their latest event, with a single query.
+
+    Parameters:
+        games (list[Game]): Unarchived games, with their rolls written.
+    """
+    pins = {game.id: bytearray() for game in games}
+    rows = Roll.objects.filter(game_id__in=list(pins)).order_by(
+        "game_id", "frame", "roll_number"
+    )
+    for game_id, knocked_down_pins in rows.values_list("game_id", "knocked_down_pins"):
+        pins[game_id].append(knocked_down_pins)
+    GameSnapshot.objects.bulk_create(
+        GameSnapshot(game=game, sequence=game.event_sequence, pins=bytes(pins[game.id]))
+        for game in games
+    )
+
+
+def apply_event(pins, event):
+    """
+    Apply an event to a game's rolls.
+
+    Parameters:
+        pins (bytearray): The pins knocked down by each roll, updated in place.
+        event (GameEvent): The next event of the game.
+    """
+    if event.kind == GameEvent.ROLL:
+        pins.append(event.knocked_down_pins)
+    elif event.kind == GameEvent.CORRECTION:
+        pins[event.roll_index] = event.knocked_down_pins
+    else:
+        del pins[event.roll_index]
+
+
+class GameReplay:
+    """
+    A game rebuilt from its event log.
+
+    Attributes:
+        game_id (int): The ID of the game.
+        sequence (int): The sequence number of the last event applied.
+        snapshot_sequence (int): The sequence number of the snapshot the
+            replay started from, or 0 if it started from the first event.
+        events_replayed (int): The number of events applied to the snapshot.
+        pins (bytes): The pins knocked down by each roll as of the event.
+    """
+
+    __slots__ = ("game_id", "sequence", "snapshot_sequence", "events_replayed", "pins")
+
+    def __init__(self, game_id, sequence, snapshot_sequence, events_replayed, pins):
+        self.game_id = game_id
+        self.sequence = sequence
+        self.snapshot_sequence = snapshot_sequence
+        self.events_replayed = events_replayed
+        self.pins = pins
+
+    def as_dict(self):
+        """Return the rebuilt game with its scores as JSON-serializable data."""
+        result = score_rolls(self.pins)
+        return {
+            "game_id": self.game_id,
+            "sequence": self.sequence,
+            "snapshot_sequence": self.snapshot_sequence,
+            "events_replayed": self.events_replayed,
+            "rolls": list(self.pins),
+            "score": result.total,
+            "completed": result.completed,
+            "frames": [
+                {"frame": frame.number, "rolls": frame.rolls, "score": frame.score}
+                for frame in result.frames
+            ],
+        }
+
+
+def replay_game(game_id, sequence=None):
+    """
+    Rebuild a game's rolls as of one of its events.
+
+    Starts from the latest snapshot taken at or before the event, so only
+    the events after it are read and applied. An archived game has no
+    events left, so it is read from its packed rolls instead.
+
+    Parameters:
+        game_id (int): The ID of the game.
+        sequence (int): The sequence number of the event to stop at, or None
+            for the game's latest event.
+
+    Returns:
+        GameReplay: The rebuilt game.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+        ValueError: If the game has no event with that sequence number, or
+            is archived and the event is not its latest.
+    """
+    latest, packed_rolls = Game.objects.values_list(
+        "event_sequence", "packed_rolls"
+    ).get(id=game_id)
+    if sequence is None:
+        sequence = latest
+    elif not 0 <= sequence <= latest:
+        raise ValueError(f"Game {game_id} has events 0 to {latest}")
+
+    if packed_rolls is not None:
+        if sequence != latest:
+            raise ValueError(
+                f"Game {game_id} is archived, only its latest event {latest} is kept"
+            )
+        return GameReplay(game_id, latest, latest, 0, unpack_rolls(packed_rolls).pins)
+
+    snapshot = (
+        GameSnapshot.objects.filter(game_id=game_id, sequence__lte=sequence)
+        .order_by("-sequence")
+        .only("sequence", "pins")
+        .first()
+    )
+    start = snapshot.sequence if snapshot is not None else 0
+    pins = bytearray(snapshot.pins if snapshot is not None else b"")
+
+    events = GameEvent.objects.filter(
+        game_id=game_id, sequence__gt=start, sequence__lte=sequence
+    ).order_by("sequence")
+    replayed = 0
+    for event in events.only("kind", "roll_index", "knocked_down_pins"):
+        apply_event(pins, event)
+        replayed += 1
+    return GameReplay(game_id, sequence, start, replayed, bytes(pins))
@@ -0,0 +1,140 @@
+"""
+Streaming export of games with their rolls and scores.
+
+Games and rolls are read with two chunked queries ordered by game ID and
+merged as they stream, so memory use stays constant however many rolls are
+exported. Every record carries the game ID as a cursor: passing the last
+exported ID as ``after`` resumes an interrupted export.
+"""
+
+import csv
+import json
+
+from .archive import unpack_rolls
+from .models import Game, Roll
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = ["id", "title", "created_at", "completed", "score", "frame_scores", "rolls"]
+
+
+def export_records(after=None, completed=None, chunk_size=2000, using=None):
+    """
+    Yield every game with its rolls and scores, in ascending ID order.
+
+    Parameters:
+        after (int): Only export games with an ID greater than this cursor.
+        completed (bool): Only export completed (True) or in-progress (False) games.
+        chunk_size (int): Number of rows fetched from the database at a time.
+        using (str): The database to read from, or None to let the routers
+            decide when the export is consumed.
+
+    Yields:
+        dict: One record per game, with its rolls as a list of pins.
+    """
+    games = Game.objects.order_by("id").values(
+        "id", "title", "created_at", "completed", "score", "frame_scores", "packed_rolls"
+    )
+    rolls = Roll.objects.order_by("game_id", "frame", "roll_number").values_list(
+        "game_id", "knocked_down_pins"
+    )
+    if using is not None:
+        games, rolls = games.using(using), rolls.using(using)
+    if after is not None:
+        games = games.filter(id__gt=after)
+        rolls = rolls.filter(game_id__gt=after)
+    if completed is not None:
+        games = games.filter(completed=completed)
+        rolls = rolls.filter(game__completed=completed)
+
+    roll_rows = rolls.iterator(chunk_size=chunk_size)
+    pending = next(roll_rows, None)
+
+    for game in games.iterator(chunk_size=chunk_size):
+        # Both queries are ordered by game, so the rolls of this game are
+        # the ones at the head of the roll stream
+        pins = []
+        while pending is not None and pending[0] <= game["id"]:
+            if pending[0] == game["id"]:
+                pins.append(pending[1])
+            pending = next(roll_rows, None)
+
+        # Archived games carry their rolls packed instead
+        packed_rolls = game.pop("packed_rolls")
+        if packed_rolls is not None:
+            pins = list(unpack_rolls(packed_rolls).pins)
+
+        game["created_at"] = game["created_at"].isoformat()
+        game["rolls"] = pins
+        yield game
+
+
+def render_ndjson(records):
+    """
+    Render records as newline-delimited JSON.
+
+    Parameters:
+        records (Iterable[dict]): The records to render.
+
+    Yields:
+        str: One JSON document per line.
+    """
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+def render_csv(records):
+    """
+    Render records as CSV, with frame scores and rolls as space separated numbers.
+
+    Parameters:
+        records (Iterable[dict]): The records to render.
+
+    Yields:
+        str: The header line, then one line per record.
+    """
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.pop()
+
+    for record in records:
+        record["frame_scores"] = " ".join(map(str, record["frame_scores"]))
+        record["rolls"] = " ".join(map(str, record["rolls"]))
+        writer.writerow([record[column] for column in CSV_COLUMNS])
+        yield buffer.pop()
+
+
+def render(records, export_format):
+    """
+    Render records in one of the supported export formats.
+
+    Parameters:
+        records (Iterable[dict]): The records to render.
+        export_format (str): ``ndjson`` or ``csv``.
+
+    Returns:
+        Iterator[str]: The rendered chunks.
+    """
+    if export_format == "csv":
+        return render_csv(records)
+    return render_ndjson(records)
+
+
+class _LineBuffer:
+    """A minimal file-like object collecting what csv.writer writes."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, value):
+        self.lines.append(value)
+
+    def pop(self):
+        value = "".join(self.lines)
+        self.lines.clear()
+        return value
@@ -0,0 +1,316 @@
+"""
+Live score feed.
+
+Recording a roll publishes a score update to the channel of its game and,
+for games played at a bowling center, to the channel of the center. Lane
+displays and spectator screens subscribe through a server-sent events
+stream instead of polling the score endpoint.
+
+``LocalBroker`` fans updates out to the subscribers of the current process.
+Every broker implements ``publish`` and ``asubscribe``, so a broker on top
+of a shared pub/sub service can replace it when games are served by several
+workers.
+"""
+
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+
+def game_channel(game_id):
+    """Return the channel of a game."""
+    return f"game:{game_id}"
+
+
+def center_channel(center):
+    """Return the channel of a bowling center."""
+    return f"center:{center}"
+
+
+def game_channels(game):
+    """Return the channels a game's updates are published to."""
+    channels = [game_channel(game.id)]
+    if game.center:
+        channels.append(center_channel(game.center))
+    return channels
+
+
+def score_update(game, previous_frame_scores, rolls):
+    """
+    Build the update published after rolls were recorded for a game.
+
+    Only the frames whose score changed are included, keyed by frame number.
+
+    Parameters:
+        game (Game): The game, with its cursor and score already advanced.
+        previous_frame_scores (list[int]): The frame scores before the rolls.
+        rolls (list[Roll]): The rolls just recorded, in order.
+
+    Returns:
+        dict: The update.
+    """
+    frames = {
+        str(number): frame_score
+        for number, frame_score in enumerate(game.frame_scores, start=1)
+        if number > len(previous_frame_scores)
+        or previous_frame_scores[number - 1] != frame_score
+    }
+    return {
+        "game_id": game.id,
+        "rolls": [
+            {
+                "frame": roll.frame,
+                "roll_number": roll.roll_number,
+                "knocked_down_pins": roll.knocked_down_pins,
+            }
+            for roll in rolls
+        ],
+        "frames": frames,
+        "score": game.score,
+        "roll_count": game.roll_count,
+        "completed": game.completed,
+    }
+
+
+# Game fields read to build snapshots
+SNAPSHOT_FIELDS = ["id", "frame_scores", "score", "roll_count", "completed"]
+
+
+def game_snapshot(game):
+    """Return the full score state of a game, sent when a client connects."""
+    return {
+        "game_id": game.id,
+        "frame_scores": game.frame_scores,
+        "score": game.score,
+        "roll_count": game.roll_count,
+        "completed": game.completed,
+    }
+
+
+def format_event(event, data, event_id=None):
+    """
+    Format a server-sent event.
+
+    Parameters:
+        event (str): The event type.
+        data (dict): The event data, sent as JSON.
+        event_id (str): The event ID, if any.
+
+    Returns:
+        str: The event, terminated by a blank line.
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def aevent_stream(broker, channels, snapshots):
+    """
+    Stream the updates of some channels as server-sent events.
+
+    The stream subscribes first and then sends a ``snapshot`` event for each
+    game returned by ``snapshots``, so no update is lost in between. Each
+    update is sent as a ``score`` event, and a comment is sent after
+    ``broker.keepalive`` seconds without updates to keep the connection open.
+
+    Streams are only served asynchronously: an open stream waits on its
+    event loop, where a synchronous stream would hold a worker thread for as
+    long as the client stays connected.
+
+    Parameters:
+        broker (LocalBroker): The broker to subscribe to.
+        channels (list[str]): The channels to stream.
+        snapshots (callable): Async callable returning the games to send
+            snapshots of.
+
+    Yields:
+        str: The server-sent events.
+    """
+    with broker.asubscribe(channels) as subscription:
+        for game in await snapshots():
+            yield format_event("snapshot", game_snapshot(game))
+        while True:
+            update = await subscription.get(broker.keepalive)
+            yield keepalive_event() if update is None else update_event(update)
+
+
+def update_event(update):
+    """Format a score update as a server-sent event."""
+    return format_event(
+        "score", update, event_id=f"{update['game_id']}:{update['roll_count']}"
+    )
+
+
+def keepalive_event():
+    """Return a server-sent comment that keeps an idle connection open."""
+    return ": keepalive\n\n"
+
+
+def event_stream_response(events):
+    """
+    Wrap server-sent events in a streaming response.
+
+    Parameters:
+        events (async iterator): The events, from aevent_stream.
+
+    Returns:
+        StreamingHttpResponse: The event stream, never cached or buffered.
+    """
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Ask nginx and similar proxies not to buffer the events
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Accepts the ``text/event-stream`` media type requested by EventSource
+    clients. Only error responses are rendered by it, as JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
+
+
+class AsyncSubscription:
+    """
+    A subscriber's queue of updates, read from an event loop.
+
+    Updates are published from worker threads, so they are handed over to
+    the subscriber's event loop. When the subscriber falls behind by more
+    than ``max_queue`` updates the oldest ones are dropped; every update
+    carries the running score, so the next one received brings the
+    subscriber up to date.
+
+    Parameters:
+        broker (LocalBroker): The broker the subscription belongs to.
+        channels (list[str]): The channels subscribed to.
+        max_queue (int): The maximum number of undelivered updates kept.
+    """
+
+    def __init__(self, broker, channels, max_queue):
+        self.broker = broker
+        self.channels = channels
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=max_queue)
+
+    def put(self, update):
+        """Queue an update from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, update)
+        except RuntimeError:
+            # The subscriber's event loop has been closed
+            self.close()
+
+    def _put(self, update):
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(update)
+
+    async def get(self, timeout):
+        """Return the next update, or None if none arrives within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        """Stop receiving updates."""
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalBroker:
+    """
+    Fans score updates out to the subscribers of the current process.
+
+    Parameters:
+        max_queue (int): The maximum number of undelivered updates kept per
+            subscriber.
+        keepalive (float): Seconds between keep-alive comments on idle streams.
+    """
+
+    def __init__(self, max_queue=100, keepalive=15):
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channels, update):
+        """
+        Deliver an update to every subscriber of the given channels.
+
+        A subscriber of several of the channels receives the update once.
+
+        Parameters:
+            channels (list[str]): The channels to publish to.
+            update (dict): The update.
+        """
+        with self._lock:
+            subscribers = {
+                subscription
+                for channel in channels
+                for subscription in self._subscriptions.get(channel, ())
+            }
+        for subscription in subscribers:
+            subscription.put(update)
+
+    def asubscribe(self, channels):
+        """Return an AsyncSubscription bound to the running event loop."""
+        return self._register(AsyncSubscription(self, channels, self.max_queue))
+
+    def unsubscribe(self, subscription):
+        """Stop delivering updates to a subscription."""
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def subscriber_count(self, channel):
+        """Return the number of subscribers of a channel."""
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    def _register(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+
+def build_broker(options):
+    """
+    Build a score feed broker from a settings dictionary.
+
+    Parameters:
+        options (dict): ``MAX_QUEUE`` and ``KEEPALIVE``.
+
+    Returns:
+        LocalBroker: The configured broker.
+    """
+    return LocalBroker(
+        max_queue=options.get("MAX_QUEUE", 100),
+        keepalive=options.get("KEEPALIVE", 15),
+    )
+
+
+# The process-wide score feed
+score_feed = build_broker(getattr(settings, "SCORE_FEED", {}))
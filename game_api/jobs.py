@@ -0,0 +1,242 @@
+"""
+Background generation of game summaries.
+
+The prompt is built from the database in the request thread; only the slow
+LLM call runs on a bounded thread pool, so summary requests never hold a
+web worker while the model is generating. No external broker is needed.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .cache import summary_cache
+from .llm import LLMUnavailableError
+from .metrics import llm_fallbacks
+from .services import (
+    complete_summary,
+    fallback_reason,
+    format_fallback_summary,
+    format_summary_prompt,
+    summary_fingerprint,
+    summary_rolls,
+)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class SummaryJob:
+    """
+    A summary being generated in the background.
+
+    Attributes:
+        id (str): The job ID.
+        game_id (int): The ID of the game being summarized.
+        fingerprint (tuple): The roll state fingerprint the summary describes.
+        status (str): pending, running, done or failed.
+        summary (str): The generated summary, once done.
+        fallback (bool): Whether the summary was built from the scorecard
+            because the LLM was unavailable.
+        error (str): Why the job failed, if it did.
+        created_at (float): Monotonic time the job was submitted.
+        started_at (float): Monotonic time a worker picked the job up.
+    """
+
+    __slots__ = (
+        "id",
+        "game_id",
+        "fingerprint",
+        "status",
+        "summary",
+        "fallback",
+        "error",
+        "created_at",
+        "started_at",
+    )
+
+    def __init__(self, game_id, fingerprint):
+        self.id = uuid.uuid4().hex
+        self.game_id = game_id
+        self.fingerprint = fingerprint
+        self.status = PENDING
+        self.summary = None
+        self.fallback = False
+        self.error = None
+        self.created_at = time.monotonic()
+        self.started_at = None
+
+    @property
+    def finished(self):
+        """bool: Whether the job is done or has failed."""
+        return self.status in (DONE, FAILED)
+
+    def as_dict(self):
+        """Return the public state of the job."""
+        data = {"job_id": self.id, "game_id": self.game_id, "status": self.status}
+        if self.status == DONE:
+            data["summary"] = self.summary
+            if self.fallback:
+                data["fallback"] = True
+        elif self.status == FAILED:
+            data["error"] = self.error
+        return data
+
+
+class SummaryJobQueue:
+    """
+    A thread pool generating summaries, with deduplication and timeouts.
+
+    Concurrent requests for the same game and roll state share one job.
+    A job still running after ``timeout`` seconds is reported as failed.
+    A job whose LLM call fails because the LLM is unavailable ends with the
+    scorecard summary instead, which is neither cached nor shared with later
+    requests, so they try the LLM again.
+
+    Parameters:
+        max_workers (int): Maximum number of summaries generated at once.
+        timeout (float): Seconds a job may run before it is considered failed.
+        retention (float): Seconds finished jobs stay available for polling.
+    """
+
+    def __init__(self, max_workers=4, timeout=30, retention=600):
+        self.timeout = timeout
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="summary"
+        )
+        self._jobs = {}
+        self._by_state = {}
+        self._lock = threading.Lock()
+
+    def submit(self, game, fingerprint=None):
+        """
+        Start generating the summary of a game, unless a job already covers it.
+
+        Parameters:
+            game (Game): The Game instance to summarize.
+            fingerprint (tuple): The game's summary_fingerprint, if already known.
+
+        Returns:
+            SummaryJob: The new job, or the existing one for the same roll state.
+        """
+        if fingerprint is None:
+            fingerprint = summary_fingerprint(game)
+        with self._lock:
+            self._purge()
+            job = self._find(game.id, fingerprint)
+        if job is not None:
+            return job
+
+        # Build the prompt and the fallback summary here, so the worker never
+        # needs a database connection
+        rolls = list(summary_rolls(game))
+        prompt = format_summary_prompt(game, rolls)
+        fallback = format_fallback_summary(game, rolls)
+
+        with self._lock:
+            # Another request may have submitted the same job meanwhile
+            job = self._find(game.id, fingerprint)
+            if job is None:
+                job = SummaryJob(game.id, fingerprint)
+                self._jobs[job.id] = job
+                self._by_state[(game.id, fingerprint)] = job
+                self._executor.submit(self._run, job, prompt, fallback)
+        return job
+
+    def get(self, job_id):
+        """
+        Look up a job, marking it as failed if it has exceeded its timeout.
+
+        Parameters:
+            job_id (str): The job ID.
+
+        Returns:
+            SummaryJob: The job, or None if it is unknown or has been purged.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._expire(job)
+            return job
+
+    def _run(self, job, prompt, fallback):
+        """Generate the summary of a job on a worker thread."""
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.monotonic()
+
+        try:
+            summary = complete_summary(prompt, timeout=self.timeout)
+        except LLMUnavailableError as error:
+            llm_fallbacks.inc(reason=fallback_reason(error))
+            with self._lock:
+                if not job.finished:
+                    job.status = DONE
+                    job.summary = fallback
+                    job.fallback = True
+            return
+        except Exception as error:
+            with self._lock:
+                job.status = FAILED
+                job.error = str(error) or error.__class__.__name__
+            return
+
+        summary_cache.set(job.game_id, (job.fingerprint, summary))
+        with self._lock:
+            if not job.finished:
+                job.status = DONE
+                job.summary = summary
+
+    def _find(self, game_id, fingerprint):
+        """Return the live job for a game's roll state, if any. Requires the lock."""
+        job = self._by_state.get((game_id, fingerprint))
+        if job is not None:
+            self._expire(job)
+            if job.status != FAILED and not job.fallback:
+                return job
+        return None
+
+    def _expire(self, job):
+        """Mark a running job as failed once it has exceeded the timeout."""
+        if job.status == RUNNING and time.monotonic() - job.started_at > self.timeout:
+            job.status = FAILED
+            job.error = "Summary generation timed out"
+
+    def _purge(self):
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.monotonic() - self.retention
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and job.created_at < cutoff
+        ]:
+            job = self._jobs.pop(job_id)
+            if self._by_state.get((job.game_id, job.fingerprint)) is job:
+                del self._by_state[(job.game_id, job.fingerprint)]
+
+
+def build_queue(options):
+    """
+    Build a summary job queue from a settings dictionary.
+
+    Parameters:
+        options (dict): ``MAX_WORKERS``, ``TIMEOUT`` and ``RETENTION``.
+
+    Returns:
+        SummaryJobQueue: The configured queue.
+    """
+    return SummaryJobQueue(
+        max_workers=options.get("MAX_WORKERS", 4),
+        timeout=options.get("TIMEOUT", 30),
+        retention=options.get("RETENTION", 600),
+    )
+
+
+# The process-wide summary job queue
+summary_jobs = build_queue(getattr(settings, "SUMMARY_JOBS", {}))
@@ -0,0 +1,389 @@
+"""
+Shared OpenAI clients.
+
+Clients are created once and reused, so their HTTP connection pools (and
+kept-alive connections) serve every summary instead of being rebuilt per
+request. The async client also bounds the number of concurrent LLM calls.
+
+Calls go through ``call_llm`` or ``acall_llm``, which keep a slow or failing
+API from piling up requests: clients give up after ``CONNECT_TIMEOUT`` and
+``READ_TIMEOUT``, transient errors are retried with jittered exponential
+backoff, and a circuit breaker stops calling the API while most recent calls
+fail. Callers then get an ``LLMUnavailableError`` right away and can fall
+back to a summary that needs no LLM.
+"""
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from functools import lru_cache
+
+import httpx
+from decouple import config
+from django.conf import settings
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+
+from .metrics import llm_circuit_state, llm_retries, time_llm_call
+
+# Errors worth retrying: timeouts, connection failures, rate limits and 5xx
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+# Circuit breaker states, with their llm_circuit_state values
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+CIRCUIT_STATES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# The async client and semaphore of each running event loop
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def llm_settings():
+    """Return the LLM settings dictionary, with defaults filled in."""
+    options = {
+        "MODEL": "gpt-4o-mini",
+        "BASE_URL": None,
+        "MAX_CONCURRENCY": 16,
+        "MAX_CONNECTIONS": 32,
+        "KEEPALIVE_CONNECTIONS": 16,
+        "KEEPALIVE_EXPIRY": 30,
+        "CONNECT_TIMEOUT": 3.0,
+        "READ_TIMEOUT": 20.0,
+        "RETRIES": 2,
+        "RETRY_BACKOFF": 0.5,
+        "RETRY_MAX_DELAY": 4.0,
+        "BREAKER_WINDOW": 20,
+        "BREAKER_MIN_CALLS": 10,
+        "BREAKER_ERROR_RATE": 0.5,
+        "BREAKER_COOLDOWN": 30.0,
+    }
+    options.update(getattr(settings, "LLM", {}))
+    return options
+
+
+def client_timeout(options):
+    """Build the HTTP timeouts of the OpenAI clients from the LLM settings."""
+    return httpx.Timeout(options["READ_TIMEOUT"], connect=options["CONNECT_TIMEOUT"])
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the LLM API cannot produce a completion right now."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised instead of calling the LLM API while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling the LLM API while most recent calls fail.
+
+    The breaker keeps the outcomes of the last ``window`` calls. Once it has
+    at least ``min_calls`` of them and the share of failures reaches
+    ``error_rate``, it opens: calls are refused for ``cooldown`` seconds.
+    It then lets a single probe call through (half open). The probe's
+    success closes the breaker, its failure opens it again. Safe to share
+    between threads and event loops.
+
+    Parameters:
+        window (int): The number of recent calls the error rate is taken over.
+        min_calls (int): The fewest calls the breaker may open on.
+        error_rate (float): The share of failed calls that opens the breaker.
+        cooldown (float): Seconds to refuse calls for once open.
+        clock (callable): Returns the current time in seconds.
+    """
+
+    def __init__(
+        self, window=20, min_calls=10, error_rate=0.5, cooldown=30.0, clock=time.monotonic
+    ):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.clock = clock
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._changed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """str: ``closed``, ``half_open`` or ``open``."""
+        return self._state
+
+    @property
+    def is_open(self):
+        """
+        bool: Whether calls are refused right now.
+
+        Unlike allow, asking does not claim the half-open probe call.
+        """
+        with self._lock:
+            return self._state != CLOSED and self.clock() - self._changed_at < self.cooldown
+
+    def allow(self):
+        """
+        Ask whether a call may be made now.
+
+        Returns:
+            bool: False while the breaker is open, or while a probe call is
+                already in flight when half open.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            # A probe that never reported back is replaced after a cooldown
+            if self.clock() - self._changed_at < self.cooldown:
+                return False
+            self._transition(HALF_OPEN)
+            return True
+
+    def record_success(self):
+        """Record a call the API answered."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a call that failed on a timeout, connection error or 5xx."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self._state == CLOSED:
+                self._outcomes.append(False)
+                failures = self._outcomes.count(False)
+                if (
+                    len(self._outcomes) >= self.min_calls
+                    and failures >= self.error_rate * len(self._outcomes)
+                ):
+                    self._transition(OPEN)
+
+    def reset(self):
+        """Close the breaker and forget past calls."""
+        with self._lock:
+            self._transition(CLOSED)
+
+    def _transition(self, state):
+        self._state = state
+        self._changed_at = self.clock()
+        self._outcomes.clear()
+        llm_circuit_state.set(CIRCUIT_STATES[state])
+
+
+def build_breaker(options):
+    """Create the circuit breaker of the LLM API from the LLM settings."""
+    llm_circuit_state.set(CIRCUIT_STATES[CLOSED])
+    return CircuitBreaker(
+        window=options["BREAKER_WINDOW"],
+        min_calls=options["BREAKER_MIN_CALLS"],
+        error_rate=options["BREAKER_ERROR_RATE"],
+        cooldown=options["BREAKER_COOLDOWN"],
+    )
+
+
+# The circuit breaker shared by every LLM call of the process
+llm_breaker = build_breaker(llm_settings())
+
+
+def retry_delay(attempt, options):
+    """
+    Pick how long to wait before retrying a failed call.
+
+    Uses "full jitter": a random delay up to an exponentially growing cap,
+    so that clients failing together do not retry together.
+
+    Parameters:
+        attempt (int): The number of the failed attempt, from 0.
+        options (dict): The LLM settings.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    cap = min(options["RETRY_MAX_DELAY"], options["RETRY_BACKOFF"] * 2**attempt)
+    return random.uniform(0, cap)
+
+
+def ensure_llm_available():
+    """
+    Refuse work that needs the LLM while the circuit breaker is open.
+
+    Raises:
+        CircuitOpenError: If the breaker refuses calls right now.
+    """
+    if llm_breaker.is_open:
+        raise CircuitOpenError("The LLM API circuit breaker is open")
+
+
+def call_llm(create, client="sync"):
+    """
+    Make an LLM API call through the circuit breaker, retrying transient errors.
+
+    Parameters:
+        create (callable): Makes the API call and returns its response.
+        client (str): The client label of the retry metrics.
+
+    Returns:
+        The response returned by create.
+
+    Raises:
+        LLMUnavailableError: If the breaker is open or every attempt failed.
+        APIStatusError: If the API rejected the request itself, e.g. with 400.
+    """
+    options = llm_settings()
+    for attempt in range(options["RETRIES"] + 1):
+        if not llm_breaker.allow():
+            raise CircuitOpenError("The LLM API circuit breaker is open")
+        try:
+            response = create()
+        except RETRYABLE_ERRORS as error:
+            llm_breaker.record_failure()
+            failure = error
+        except APIStatusError:
+            # The API is up; retrying the same request would fail the same way
+            llm_breaker.record_success()
+            raise
+        else:
+            llm_breaker.record_success()
+            return response
+        if attempt < options["RETRIES"]:
+            llm_retries.inc(client=client)
+            time.sleep(retry_delay(attempt, options))
+    raise LLMUnavailableError(
+        f"The LLM API failed {options['RETRIES'] + 1} times: {failure}"
+    ) from failure
+
+
+async def acall_llm(create, client="async"):
+    """
+    Make an async LLM API call through the circuit breaker, retrying transient errors.
+
+    Waits between attempts without blocking the event loop.
+
+    Parameters:
+        create (callable): Returns a coroutine making the API call.
+        client (str): The client label of the retry metrics.
+
+    Returns:
+        The response returned by create's coroutine.
+
+    Raises:
+        LLMUnavailableError: If the breaker is open or every attempt failed.
+        APIStatusError: If the API rejected the request itself, e.g. with 400.
+    """
+    options = llm_settings()
+    for attempt in range(options["RETRIES"] + 1):
+        if not llm_breaker.allow():
+            raise CircuitOpenError("The LLM API circuit breaker is open")
+        try:
+            response = await create()
+        except RETRYABLE_ERRORS as error:
+            llm_breaker.record_failure()
+            failure = error
+        except APIStatusError:
+            llm_breaker.record_success()
+            raise
+        else:
+            llm_breaker.record_success()
+            return response
+        if attempt < options["RETRIES"]:
+            llm_retries.inc(client=client)
+            await asyncio.sleep(retry_delay(attempt, options))
+    raise LLMUnavailableError(
+        f"The LLM API failed {options['RETRIES'] + 1} times: {failure}"
+    ) from failure
+
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """
+    Get the process-wide OpenAI client.
+
+    Returns:
+        OpenAI: The shared client.
+    """
+    options = llm_settings()
+    # Retries are made by call_llm, through the circuit breaker
+    return OpenAI(
+        api_key=config("OPENAI_API_KEY"),
+        base_url=options["BASE_URL"],
+        timeout=client_timeout(options),
+        max_retries=0,
+    )
+
+
+def get_async_openai_client():
+    """
+    Get the AsyncOpenAI client and concurrency semaphore of the running event loop.
+
+    An ASGI worker runs a single event loop, so it shares one client and one
+    keep-alive connection pool across all requests. Connections cannot be
+    shared between event loops, so each loop gets its own.
+
+    Returns:
+        tuple[AsyncOpenAI, asyncio.Semaphore]: The client and the semaphore
+            bounding concurrent calls.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        options = llm_settings()
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=options["MAX_CONNECTIONS"],
+                max_keepalive_connections=options["KEEPALIVE_CONNECTIONS"],
+                keepalive_expiry=options["KEEPALIVE_EXPIRY"],
+            )
+        )
+        client = AsyncOpenAI(
+            api_key=config("OPENAI_API_KEY"),
+            base_url=options["BASE_URL"],
+            http_client=http_client,
+            timeout=client_timeout(options),
+            max_retries=0,
+        )
+        _async_clients[loop] = (client, asyncio.Semaphore(options["MAX_CONCURRENCY"]))
+    return _async_clients[loop]
+
+
+async def acomplete_summary(prompt, timeout=None):
+    """
+    Ask the LLM to complete a summary prompt without blocking the event loop.
+
+    At most ``MAX_CONCURRENCY`` calls are in flight per event loop; further
+    calls wait for a free slot. Retries give up their slot while waiting.
+
+    Parameters:
+        prompt (str): The prompt built by build_summary_prompt.
+        timeout (float): Seconds to wait for the API, or None for the client default.
+
+    Returns:
+        str: The generated summary.
+
+    Raises:
+        LLMUnavailableError: If the LLM API is unavailable.
+    """
+    client, semaphore = get_async_openai_client()
+    options = {} if timeout is None else {"timeout": timeout}
+
+    async def create():
+        async with semaphore:
+            with time_llm_call("async"):
+                return await client.chat.completions.create(
+                    model=llm_settings()["MODEL"],
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.8,
+                    **options,
+                )
+
+    response = await acall_llm(create)
+    return response.choices[0].message.content
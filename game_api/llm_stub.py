@@ -0,0 +1,129 @@
+"""
+A local stand-in for the OpenAI chat completions API.
+
+Used by tests and benchmarks to exercise the real HTTP client code paths
+without network access, with a configurable response delay and injected
+errors.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLLMServer:
+    """
+    A threaded HTTP server answering chat completion requests.
+
+    Every response echoes the number of the request it answers, e.g.
+    "Summary 3", unless ``respond`` builds it. Use it as a context manager,
+    and point the OpenAI clients at ``base_url``.
+
+    Parameters:
+        delay (float): Seconds to wait before answering each request.
+        respond (callable): Builds the answer from the prompt and the request
+            number, e.g. to answer batched summary prompts.
+        fail (callable): Returns the HTTP error status to answer a request
+            with, given its number, or None to answer it normally.
+    """
+
+    def __init__(self, delay=0.0, respond=None, fail=None):
+        self.delay = delay
+        self.respond = respond
+        self.fail = fail
+        self.requests = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        """str: The base URL to configure the OpenAI clients with."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        """Start serving requests in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and close its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def complete(self, body):
+        """
+        Build the response to a chat completion request.
+
+        Parameters:
+            body (dict): The decoded request body.
+
+        Returns:
+            tuple[int, dict]: The HTTP status and response body.
+        """
+        prompt = body["messages"][-1]["content"]
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+            self.prompts.append(prompt)
+
+        time.sleep(self.delay)
+        error_status = None if self.fail is None else self.fail(number)
+        if error_status is not None:
+            return error_status, {
+                "error": {
+                    "message": f"Injected error {error_status}",
+                    "type": "server_error",
+                    "code": None,
+                }
+            }
+        content = f"Summary {number}" if self.respond is None else self.respond(prompt, number)
+        return 200, {
+            "id": f"chatcmpl-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                status, payload = stub.complete(json.loads(self.rfile.read(length)))
+                content = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out before the answer was ready
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
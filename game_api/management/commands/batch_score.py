@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from game_api.batch import load_roll_matrix, score_matrix
+from game_api.models import Game
+
+
+class Command(BaseCommand):
+    """
+    Score many games at once with the vectorized batch scorer.
+
+    The rolls of every selected game are loaded with a single query, which
+    makes this suitable for league standings over tens of thousands of games.
+    """
+
+    help = "Score games in bulk and print one line (or JSON object) per game."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "game_ids", nargs="*", type=int, help="Only score these games."
+        )
+        parser.add_argument(
+            "--completed",
+            action="store_true",
+            help="Only score completed games.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print one JSON object per game with strike, spare and open frame counts.",
+        )
+
+    def handle(self, *args, **options):
+        games = Game.objects.all()
+        if options["game_ids"]:
+            games = games.filter(id__in=options["game_ids"])
+        if options["completed"]:
+            games = games.filter(completed=True)
+
+        game_ids, matrix, lengths = load_roll_matrix(games)
+        result = score_matrix(matrix, lengths)
+
+        for row, game_id in enumerate(game_ids.tolist()):
+            if options["json"]:
+                record = {"game_id": game_id, "rolls": int(lengths[row])}
+                record.update({key: int(values[row]) for key, values in result.items()})
+                self.stdout.write(json.dumps(record))
+            else:
+                self.stdout.write(f"{game_id} {result['score'][row]}")
@@ -0,0 +1,859 @@
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from game_api import state
+from game_api.archive import compact_games
+from game_api.batch import batch_score
+from game_api.cache import DjangoCache, summary_cache
+from game_api.database import database_profile
+from game_api.llm import get_openai_client, llm_settings
+from game_api.llm_stub import StubLLMServer
+from game_api.models import Game, GameEvent, GameSnapshot, Roll
+from game_api.scoring import FrameState
+from game_api.services import (
+    calculate_score,
+    game_pins,
+    generate_game_summary,
+    record_rolls,
+)
+from game_api.state import game_state_cache
+from game_api.views import GameRollView
+
+# A complete game mixing open frames, spares and strikes, ending with a
+# strike in the 10th frame so all three fill-ball rolls are exercised.
+SAMPLE_GAME = [10, 7, 3, 9, 0, 10, 0, 8, 8, 2, 0, 6, 10, 10, 10, 8, 1]
+
+SCENARIOS = [
+    "rolls",
+    "batch-scoring",
+    "roll-index",
+    "async-load",
+    "hot-paths",
+    "archive",
+    "concurrent-writes",
+]
+
+# Database profiles compared by the concurrent-writes scenario, as the
+# environment variables that select them. SQLite profiles run against a new
+# database file. PostgreSQL profiles use the database configured by the
+# DATABASE_* variables, which must be migrated; their games are deleted
+# afterwards. "current" is the profile the command runs with.
+DATABASE_PROFILES = {
+    # SQLite's defaults, with a new connection per request
+    "rollback": {
+        "DATABASE_ENGINE": "sqlite",
+        "DATABASE_CONN_MAX_AGE": "0",
+        "SQLITE_JOURNAL_MODE": "delete",
+        "SQLITE_SYNCHRONOUS": "full",
+        "SQLITE_MMAP_SIZE": "0",
+    },
+    # The default SQLite profile
+    "wal": {
+        "DATABASE_ENGINE": "sqlite",
+        "DATABASE_CONN_MAX_AGE": "60",
+        "SQLITE_JOURNAL_MODE": "wal",
+        "SQLITE_SYNCHRONOUS": "normal",
+    },
+    "postgresql": {"DATABASE_ENGINE": "postgresql", "DATABASE_POOL": "False"},
+    "postgresql-pool": {"DATABASE_ENGINE": "postgresql", "DATABASE_POOL": "True"},
+    "current": {},
+}
+
+# The most queries each hot path may issue per request, enforced by --check.
+# Savepoints are not counted.
+QUERY_BUDGETS = {
+    # Lock the game, insert the roll and its event, update the frame cursor;
+    # every SNAPSHOT_INTERVAL rolls, also read the rolls and insert a snapshot
+    "POST /games/<id>/rolls/": 6,
+    # Check the per-process cached state's version against the game row, or
+    # read the running score from the game row on a state cache miss
+    "GET /games/<id>/score/ (completed)": 1,
+    "GET /games/<id>/score/ (in progress)": 1,
+    # Answered from the cached state's validators once its version is checked
+    "GET /games/<id>/score/ (not modified)": 1,
+    # Served from a state cache shared between workers, with no version check
+    "GET /games/<id>/score/ (shared cache)": 0,
+    # One keyset page
+    "GET /games/": 1,
+    # Read the game's rolls in frame order
+    "calculate_score": 1,
+    # Read the game's rolls for the prompt
+    "generate_game_summary": 1,
+    # Check the cached state's version, then read the game, its last roll
+    # and, when not cached, its rolls
+    "GET /games/<id>/summary/ (generated)": 4,
+    "GET /games/<id>/summary/ (cached)": 3,
+}
+
+
+class Command(BaseCommand):
+    """
+    Measure the cost of the game API hot paths.
+
+    Every scenario runs inside a transaction that is rolled back afterwards,
+    so the command can safely be pointed at a populated database.
+    """
+
+    help = "Benchmark the roll submission and scoring hot paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "scenarios",
+            nargs="*",
+            choices=SCENARIOS,
+            help="Scenarios to run (default: all).",
+        )
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma separated numbers of games for the batch-scoring scenario.",
+        )
+        parser.add_argument(
+            "--games",
+            type=int,
+            default=100000,
+            help="Number of games seeded for the roll-index scenario (~17 rolls each).",
+        )
+        parser.add_argument(
+            "--summaries",
+            type=int,
+            default=50,
+            help="Number of concurrent summary requests in the async-load scenario.",
+        )
+        parser.add_argument(
+            "--llm-delay",
+            type=float,
+            default=1.0,
+            help="Seconds the stub LLM server takes to answer in the async-load scenario.",
+        )
+        parser.add_argument(
+            "--database-size",
+            type=int,
+            default=10000,
+            help=(
+                "Number of games seeded for the hot-paths scenario, half of them "
+                "in progress, and for the archive scenario."
+            ),
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Number of requests timed per hot path.",
+        )
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=8,
+            help="Number of concurrent writers in the concurrent-writes scenario.",
+        )
+        parser.add_argument(
+            "--writer-games",
+            type=int,
+            default=10,
+            help="Number of full games each writer bowls in the concurrent-writes scenario.",
+        )
+        parser.add_argument(
+            "--profiles",
+            default="rollback,wal",
+            help=(
+                "Comma separated database profiles compared by the concurrent-writes "
+                f"scenario, among: {', '.join(DATABASE_PROFILES)}."
+            ),
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for generated games."
+        )
+        parser.add_argument(
+            "--json",
+            metavar="PATH",
+            help="Also write the results as JSON to PATH ('-' for stdout).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if a hot path issues more queries per request than its budget.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        sizes = [int(size) for size in options["sizes"].split(",")]
+
+        results = {}
+        for scenario in options["scenarios"] or SCENARIOS:
+            self.stdout.write(f"== {scenario}")
+            if scenario == "concurrent-writes":
+                # The writers commit on their own connections, so this
+                # scenario cannot run inside a rolled back transaction
+                results[scenario] = self.concurrent_writes(
+                    options["profiles"].split(","),
+                    options["writers"],
+                    options["writer_games"],
+                )
+                continue
+            with transaction.atomic():
+                if scenario == "rolls":
+                    results[scenario] = self.roll_queries()
+                elif scenario == "batch-scoring":
+                    results[scenario] = self.batch_scoring(sizes)
+                elif scenario == "roll-index":
+                    results[scenario] = self.roll_index(options["games"])
+                elif scenario == "async-load":
+                    results[scenario] = self.async_load(
+                        options["summaries"], options["llm_delay"]
+                    )
+                elif scenario == "hot-paths":
+                    results[scenario] = self.hot_paths(
+                        options["database_size"], options["requests"]
+                    )
+                elif scenario == "archive":
+                    results[scenario] = self.archive(options["database_size"])
+                transaction.set_rollback(True)
+
+        if options["json"]:
+            report = json.dumps(
+                {"environment": environment(options), "results": results}, indent=2
+            )
+            if options["json"] == "-":
+                self.stdout.write(report)
+            else:
+                with open(options["json"], "w") as output:
+                    output.write(report + "\n")
+
+        if options["check"]:
+            self.check_budgets(results.get("hot-paths", {}))
+
+    def roll_queries(self):
+        """Submit a full game roll by roll and print the queries each request issued."""
+        factory = APIRequestFactory()
+        view = GameRollView.as_view()
+        game = Game.objects.create(title="benchmark")
+
+        self.stdout.write("roll  pins  status  reads  writes")
+        total_reads = total_writes = 0
+        per_roll = []
+        for number, pins in enumerate(SAMPLE_GAME, start=1):
+            request = factory.post(
+                f"/games/{game.id}/rolls/", {"knocked_down_pins": pins}, format="json"
+            )
+            with CaptureQueriesContext(connection) as queries:
+                response = view(request, game_id=game.id)
+            reads, writes = count_queries(queries)
+            total_reads += reads
+            total_writes += writes
+            per_roll.append({"reads": reads, "writes": writes})
+            self.stdout.write(
+                f"{number:>4}  {pins:>4}  {response.status_code:>6}  {reads:>5}  {writes:>6}"
+            )
+        self.stdout.write(f"total reads: {total_reads}, total writes: {total_writes}")
+        return {"reads": total_reads, "writes": total_writes, "per_roll": per_roll}
+
+    def batch_scoring(self, sizes):
+        """Compare scoring games one by one with the vectorized batch scorer."""
+        self.stdout.write("   games  per-game (s)  batch (s)  speedup")
+        results = []
+        seeded = 0
+        for size in sorted(sizes):
+            self.seed_games(size - seeded)
+            seeded = size
+            games = Game.objects.filter(title="benchmark").order_by("id")
+
+            started = time.perf_counter()
+            per_game = {game.id: calculate_score(game) for game in games.iterator()}
+            per_game_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            batch = batch_score(games)
+            batch_time = time.perf_counter() - started
+
+            if any(batch.get(game_id, 0) != score for game_id, score in per_game.items()):
+                self.stderr.write("batch scores do not match per-game scores")
+            self.stdout.write(
+                f"{size:>8}  {per_game_time:>12.3f}  {batch_time:>9.3f}  "
+                f"{per_game_time / batch_time:>6.1f}x"
+            )
+            results.append(
+                {"games": size, "per_game_s": per_game_time, "batch_s": batch_time}
+            )
+        return results
+
+    def roll_index(self, games, samples=1000):
+        """Show the query plans and timings of per-game roll lookups on a large table."""
+        self.seed_games(games)
+        self.stdout.write(f"rolls in table: {Roll.objects.count()}")
+
+        game_ids = list(
+            Game.objects.filter(title="benchmark")
+            .order_by("?")
+            .values_list("id", flat=True)[:samples]
+        )
+        lookups = {
+            "scoring (frame, roll_number)": lambda game: game_pins(game),
+            "summary (created_at)": lambda game: game.rolls.order_by("created_at"),
+        }
+        results = {}
+        for name, lookup in lookups.items():
+            game = Game(id=game_ids[0])
+            self.stdout.write(f"-- {name}")
+            self.stdout.write(lookup(game).explain())
+
+            started = time.perf_counter()
+            for game_id in game_ids:
+                list(lookup(Game(id=game_id)))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{len(game_ids)} lookups: {elapsed * 1e6 / len(game_ids):.0f} us per game"
+            )
+            results[name] = {"us_per_game": elapsed * 1e6 / len(game_ids)}
+        return results
+
+    def async_load(self, summaries, delay):
+        """
+        Hold many summary requests open on one event loop while serving scores.
+
+        Summaries go through the async views to a local stub LLM server that
+        answers after ``delay`` seconds. Score requests are timed while the
+        summaries are in flight.
+        """
+        self.seed_games(summaries)
+        game_ids = list(
+            Game.objects.filter(title="benchmark")
+            .order_by("-id")
+            .values_list("id", flat=True)[:summaries]
+        )
+        # The async client is cached per event loop, so a fresh loop picks up
+        # the stub server's URL
+        options = {**llm_settings(), "BASE_URL": None}
+
+        with StubLLMServer(delay=delay) as server:
+            options["BASE_URL"] = server.base_url
+            with override_settings(LLM=options, ALLOWED_HOSTS=["testserver"]):
+                results = async_to_sync(self.run_async_load)(game_ids)
+
+        elapsed, statuses, latencies = results
+        concurrency = options["MAX_CONCURRENCY"]
+        self.stdout.write(
+            f"{len(game_ids)} summaries ({statuses.count(200)} ok) in {elapsed:.2f}s, "
+            f"{server.requests} LLM calls, at most {concurrency} in flight "
+            f"(one at a time would take {len(game_ids) * delay:.2f}s)"
+        )
+        self.stdout.write(
+            f"{len(latencies)} score requests meanwhile: "
+            f"median {statistics.median(latencies) * 1e3:.1f} ms, "
+            f"max {max(latencies) * 1e3:.1f} ms"
+        )
+        return {
+            "summaries": len(game_ids),
+            "succeeded": statuses.count(200),
+            "elapsed_s": elapsed,
+            "llm_calls": server.requests,
+            "score_requests": latency_stats(latencies),
+        }
+
+    async def run_async_load(self, game_ids):
+        """Fire the summaries concurrently and poll scores until they complete."""
+        client = AsyncClient()
+        started = time.perf_counter()
+        summaries = asyncio.gather(
+            *(client.get(f"/async/games/{game_id}/summary/") for game_id in game_ids)
+        )
+        summaries = asyncio.ensure_future(summaries)
+
+        latencies = []
+        while not summaries.done():
+            request_started = time.perf_counter()
+            await client.get(f"/async/games/{game_ids[0]}/score/")
+            latencies.append(time.perf_counter() - request_started)
+
+        responses = await summaries
+        elapsed = time.perf_counter() - started
+        return elapsed, [response.status_code for response in responses], latencies
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def hot_paths(self, database_size, requests):
+        """
+        Time the API hot paths through the full request stack.
+
+        Every path is called ``requests`` times. Latency percentiles and
+        throughput are measured one request at a time, together with the most
+        queries any single request issued.
+        """
+        completed = self.seed_games(database_size - database_size // 2)
+        in_progress = self.seed_games(database_size // 2, in_progress=True)
+        client = Client()
+        results = {}
+
+        def sample(game_ids):
+            return [self.random.choice(game_ids) for _ in range(requests)]
+
+        # Full games, one roll per request
+        games = [
+            Game.objects.create(title="benchmark")
+            for _ in range(max(1, requests // len(SAMPLE_GAME)))
+        ]
+        rolls = [(game.id, pins) for game in games for pins in SAMPLE_GAME]
+        results["POST /games/<id>/rolls/"] = self.measure(
+            lambda game_id, pins: client.post(
+                f"/games/{game_id}/rolls/",
+                {"knocked_down_pins": pins},
+                content_type="application/json",
+            ),
+            rolls,
+        )
+
+        for label, game_ids in (("completed", completed), ("in progress", in_progress)):
+            results[f"GET /games/<id>/score/ ({label})"] = self.measure(
+                lambda game_id: client.get(f"/games/{game_id}/score/"),
+                [(game_id,) for game_id in sample(game_ids)],
+            )
+
+        # Clients revalidating the score they already have
+        revalidated = sample(completed)
+        etags = {
+            game_id: client.get(f"/games/{game_id}/score/")["ETag"]
+            for game_id in set(revalidated)
+        }
+        results["GET /games/<id>/score/ (not modified)"] = self.measure(
+            lambda game_id: client.get(
+                f"/games/{game_id}/score/", HTTP_IF_NONE_MATCH=etags[game_id]
+            ),
+            [(game_id,) for game_id in revalidated],
+        )
+
+        # The same reads from a state cache shared between workers; a file
+        # cache stands in for Redis or Memcached
+        shared_reads = sample(completed)
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            CACHES={
+                **settings.CACHES,
+                "benchmark-state": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                },
+            }
+        ), mock.patch.object(
+            state,
+            "game_state_cache",
+            DjangoCache("benchmark-state", ttl=600, key_prefix="game-state:"),
+        ):
+            for game_id in set(shared_reads):
+                client.get(f"/games/{game_id}/score/")
+            results["GET /games/<id>/score/ (shared cache)"] = self.measure(
+                lambda game_id: client.get(f"/games/{game_id}/score/"),
+                [(game_id,) for game_id in shared_reads],
+            )
+
+        # Page through the listing, starting over after the last page
+        pages = {"next": "/games/"}
+
+        def list_games():
+            response = client.get(pages["next"])
+            pages["next"] = response.json()["next"] or "/games/"
+            return response
+
+        results["GET /games/"] = self.measure(list_games, [()] * requests)
+
+        results["calculate_score"] = self.measure(
+            lambda game_id: calculate_score(Game(id=game_id)),
+            [(game_id,) for game_id in sample(completed)],
+        )
+
+        with StubLLMServer() as server:
+            options = {**llm_settings(), "BASE_URL": server.base_url}
+            with override_settings(LLM=options):
+                # The sync client is created once, so rebuild it for the stub
+                get_openai_client.cache_clear()
+                try:
+                    summarized = sample(completed)[: max(1, requests // 5)]
+                    results["generate_game_summary"] = self.measure(
+                        lambda game_id: generate_game_summary(Game(id=game_id)),
+                        [(game_id,) for game_id in summarized],
+                    )
+                    summary_cache.clear()
+                    for label in ("generated", "cached"):
+                        results[f"GET /games/<id>/summary/ ({label})"] = self.measure(
+                            lambda game_id: client.get(f"/games/{game_id}/summary/"),
+                            [(game_id,) for game_id in dict.fromkeys(summarized)],
+                        )
+                finally:
+                    get_openai_client.cache_clear()
+
+        # The games are rolled back and their IDs reused, so drop their states
+        # from the cache, which may be shared with the running server
+        for game_id in completed + in_progress + [game.id for game in games]:
+            game_state_cache.delete(game_id)
+
+        self.stdout.write(
+            f"{'path':<40} {'requests':>8} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>7}"
+        )
+        for path, result in results.items():
+            self.stdout.write(
+                f"{path:<40} {result['requests']:>8} {result['throughput']:>8.0f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['max_queries']:>7}"
+            )
+        return results
+
+    def archive(self, database_size, batch_size=500):
+        """
+        Compare the storage and score reads of games before and after packing.
+
+        Storage is only reported on SQLite builds with the ``dbstat`` table.
+        """
+        game_ids = self.seed_games(database_size)
+        games = Game.objects.filter(id__in=game_ids).order_by("id")
+
+        def score_all():
+            started = time.perf_counter()
+            for game in games.iterator():
+                calculate_score(game)
+            return (time.perf_counter() - started) * 1e6 / len(game_ids)
+
+        rows_us, rows_bytes = score_all(), table_bytes()
+        loaded = list(games.only("id", "created_at", "roll_count", "score"))
+        for start in range(0, len(loaded), batch_size):
+            compact_games(loaded[start : start + batch_size])
+        packed_us, packed_bytes = score_all(), table_bytes()
+
+        results = {
+            "games": database_size,
+            "rows_score_us": rows_us,
+            "packed_score_us": packed_us,
+            "packed_bytes_per_game": statistics.mean(
+                len(game.packed_rolls) for game in loaded
+            ),
+        }
+        self.stdout.write(
+            f"calculate_score: {rows_us:.0f} us per game from rows, "
+            f"{packed_us:.0f} us packed"
+        )
+        self.stdout.write(
+            f"packed rolls: {results['packed_bytes_per_game']:.1f} bytes per game"
+        )
+        if rows_bytes is not None:
+            results["rows_bytes"], results["packed_bytes"] = rows_bytes, packed_bytes
+            self.stdout.write(
+                f"game, roll, event and snapshot tables: {rows_bytes / 1e6:.1f} MB "
+                f"from rows, {packed_bytes / 1e6:.1f} MB packed "
+                f"({rows_bytes / packed_bytes:.1f}x smaller)"
+            )
+        return results
+
+    def concurrent_writes(self, profiles, writers, games):
+        """
+        Compare roll submission throughput across database profiles.
+
+        Every profile but ``current`` is measured by running this scenario
+        again in a child process whose environment selects the profile.
+        """
+        results = {}
+        for name in profiles:
+            if name not in DATABASE_PROFILES:
+                raise CommandError(
+                    f"Unknown database profile {name!r}, choose among: "
+                    f"{', '.join(DATABASE_PROFILES)}"
+                )
+            if name == "current":
+                results[name] = self.bowl_concurrently(writers, games)
+            else:
+                results[name] = self.run_profile(name, writers, games)
+
+        self.stdout.write(
+            f"{'profile':<16} {'writers':>7} {'rolls':>6} {'rolls/s':>8} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>6}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<16} {result['writers']:>7} {result['requests']:>6} "
+                f"{result['throughput']:>8.0f} {result['p50_ms']:>8.2f} "
+                f"{result['p99_ms']:>8.2f} {result['errors']:>6}"
+            )
+        return results
+
+    def run_profile(self, name, writers, games):
+        """Measure concurrent roll submissions in a child process using a database profile."""
+        manage = str(settings.BASE_DIR / "manage.py")
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, **DATABASE_PROFILES[name]}
+            # The child writes to the primary only
+            env.pop("DATABASE_REPLICAS", None)
+            if env["DATABASE_ENGINE"] == "sqlite":
+                env["DATABASE_NAME"] = os.path.join(directory, "db.sqlite3")
+                subprocess.run(
+                    [sys.executable, manage, "migrate", "--verbosity=0"],
+                    env=env,
+                    check=True,
+                )
+
+            report = os.path.join(directory, "results.json")
+            child = subprocess.run(
+                [
+                    sys.executable,
+                    manage,
+                    "benchmark",
+                    "concurrent-writes",
+                    "--profiles=current",
+                    f"--writers={writers}",
+                    f"--writer-games={games}",
+                    f"--json={report}",
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if child.returncode:
+                raise CommandError(f"Profile {name} failed:\n{child.stderr}")
+            with open(report) as results:
+                return json.load(results)["results"]["concurrent-writes"]["current"]
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def bowl_concurrently(self, writers, games):
+        """
+        Submit full games roll by roll from concurrent writers.
+
+        Each writer bowls its own games through the full request stack on its
+        own connection, closing it after each request like the server does
+        once CONN_MAX_AGE has passed. The games are committed, and deleted
+        afterwards.
+        """
+        lanes = [
+            [Game.objects.create(title="benchmark").id for _ in range(games)]
+            for _ in range(writers)
+        ]
+        latencies, errors = [], []
+        start = threading.Barrier(writers)
+
+        def bowl(game_ids):
+            client = Client(raise_request_exception=False)
+            try:
+                start.wait()
+                for game_id in game_ids:
+                    for pins in SAMPLE_GAME:
+                        started = time.perf_counter()
+                        response = client.post(
+                            f"/games/{game_id}/rolls/",
+                            {"knocked_down_pins": pins},
+                            content_type="application/json",
+                        )
+                        latencies.append(time.perf_counter() - started)
+                        if response.status_code >= 400:
+                            errors.append(response.status_code)
+                        # The test client does not end requests like the
+                        # server, so release the connection here
+                        close_old_connections()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=bowl, args=(lane,)) for lane in lanes]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        game_ids = [game_id for lane in lanes for game_id in lane]
+        Game.objects.filter(id__in=game_ids).delete()
+        for game_id in game_ids:
+            game_state_cache.delete(game_id)
+
+        return {
+            **latency_stats(latencies),
+            # Rolls recorded per second by all writers together
+            "throughput": len(latencies) / elapsed,
+            "writers": writers,
+            "errors": len(errors),
+            "profile": database_profile(connection),
+        }
+
+    def measure(self, call, arguments):
+        """
+        Time a call for each set of arguments, counting its queries.
+
+        Parameters:
+            call (callable): The call to time; HTTP responses are checked for errors.
+            arguments (list[tuple]): The positional arguments of each call.
+
+        Returns:
+            dict: Latency statistics, errors and the most queries of any call.
+        """
+        latencies, errors, max_queries = [], 0, 0
+        for args in arguments:
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = call(*args)
+                latencies.append(time.perf_counter() - started)
+            if getattr(response, "status_code", 200) >= 400:
+                errors += 1
+            max_queries = max(max_queries, sum(count_queries(queries)))
+        return {**latency_stats(latencies), "errors": errors, "max_queries": max_queries}
+
+    def check_budgets(self, results):
+        """Raise a CommandError if a hot path issued more queries than its budget."""
+        if not results:
+            raise CommandError("--check needs the hot-paths scenario")
+
+        exceeded = [
+            f"{path}: {result['max_queries']} queries, budget {QUERY_BUDGETS[path]}"
+            for path, result in results.items()
+            if result["max_queries"] > QUERY_BUDGETS[path]
+        ]
+        errors = [
+            f"{path}: {result['errors']} failed requests"
+            for path, result in results.items()
+            if result["errors"]
+        ]
+        if exceeded or errors:
+            raise CommandError("\n".join(["Hot path checks failed:"] + exceeded + errors))
+        self.stdout.write("All hot paths are within their query budgets.")
+
+    def seed_games(self, count, in_progress=False, batch_size=2000):
+        """
+        Insert games with random, valid rolls.
+
+        The rolls are recorded with ``record_rolls``, so the games get the
+        same Roll rows, events and snapshots as games played through the API.
+        The states it caches are dropped, so reads start from a cold cache.
+
+        Parameters:
+            count (int): Number of games to insert.
+            in_progress (bool): Stop each game after a random number of
+                rolls instead of completing it.
+            batch_size (int): Number of games recorded per transaction.
+
+        Returns:
+            list[int]: The IDs of the inserted games.
+        """
+        game_ids = []
+        for start in range(0, count, batch_size):
+            games_pins = []
+            for _ in range(min(batch_size, count - start)):
+                state, pins = FrameState(), []
+                limit = self.random.randint(1, 12) if in_progress else None
+                while not state.completed and state.roll_count != limit:
+                    pins.append(self.random.randint(0, state.pins_standing))
+                    state.advance(pins[-1])
+                games_pins.append((Game(title="benchmark"), pins))
+
+            Game.objects.bulk_create([game for game, _ in games_pins])
+            record_rolls(games_pins)
+            game_ids += [game.id for game, _ in games_pins]
+        game_state_cache.clear()
+        return game_ids
+
+
+def table_bytes():
+    """
+    Return the bytes used by the tables that store a game and its rolls.
+
+    These are the game, roll, event and snapshot tables and their indexes.
+
+    Returns:
+        int: The used bytes, or None if the database cannot report them.
+    """
+    if connection.vendor != "sqlite":
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT SUM(pgsize - unused) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_schema WHERE tbl_name IN (%s, %s, %s, %s))",
+                [model._meta.db_table for model in (Game, Roll, GameEvent, GameSnapshot)],
+            )
+            return cursor.fetchone()[0]
+    except DatabaseError:
+        # SQLite was built without the dbstat virtual table
+        return None
+
+
+def latency_stats(latencies):
+    """
+    Summarize the latencies of sequential calls.
+
+    Parameters:
+        latencies (list[float]): The duration of each call, in seconds.
+
+    Returns:
+        dict: The number of calls, calls per second and p50/p99/max latency in ms.
+    """
+    ordered = sorted(latencies)
+
+    def percentile(share):
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))] * 1e3
+
+    return {
+        "requests": len(ordered),
+        "throughput": len(ordered) / sum(ordered) if sum(ordered) else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1e3 if ordered else 0.0,
+    }
+
+
+def environment(options):
+    """Describe the code and machine the benchmark ran on, for comparing results."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "database_profile": database_profile(connection),
+        "machine": platform.machine(),
+        "seed": options["seed"],
+        "database_size": options["database_size"],
+        "requests": options["requests"],
+    }
+
+
+def count_queries(queries):
+    """
+    Split captured queries into reads and writes.
+
+    Savepoint bookkeeping is ignored, since its presence depends on whether
+    the caller is already inside a transaction.
+
+    Parameters:
+        queries (CaptureQueriesContext): The captured queries.
+
+    Returns:
+        tuple[int, int]: The number of read and write statements.
+    """
+    reads = writes = 0
+    for query in queries.captured_queries:
+        statement = query["sql"].lstrip().split(" ", 1)[0].upper()
+        if statement in ("SAVEPOINT", "RELEASE", "ROLLBACK"):
+            continue
+        if statement == "SELECT":
+            reads += 1
+        else:
+            writes += 1
+    return reads, writes
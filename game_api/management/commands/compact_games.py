@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from game_api.archive import compact_games
+from game_api.models import Game
+
+
+class Command(BaseCommand):
+    """
+    Archive completed games by packing their rolls into the game row.
+
+    Games are compacted in batches, each in its own transaction, so the
+    command can be interrupted and run again; it only picks up games that
+    are not packed yet.
+    """
+
+    help = (
+        "Pack the rolls of completed games and delete their Roll rows, events "
+        "and snapshots."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "game_ids", nargs="*", type=int, help="Only compact these games."
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=30,
+            help="Only compact games created at least this many days ago (default 30).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of games compacted per transaction.",
+        )
+        parser.add_argument(
+            "--no-times",
+            action="store_true",
+            help="Drop the roll timestamps instead of packing them.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        games = Game.objects.filter(
+            completed=True, packed_rolls__isnull=True, created_at__lte=cutoff
+        )
+        if options["game_ids"]:
+            games = games.filter(id__in=options["game_ids"])
+        games = games.order_by("id").only("id", "created_at", "roll_count", "score")
+
+        compacted = skipped = rolls = size = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    games.filter(id__gt=last_id).select_for_update()[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+                done, failed = compact_games(batch, keep_times=not options["no_times"])
+
+            last_id = batch[-1].id
+            compacted += len(done)
+            skipped += len(failed)
+            rolls += sum(game.roll_count for game in done)
+            size += sum(len(game.packed_rolls) for game in done)
+            for game in failed:
+                self.stderr.write(
+                    f"Game {game.id}: rolls do not match its stored state, skipped"
+                )
+
+        self.stdout.write(
+            f"Compacted {compacted} games ({rolls} rolls into {size} bytes), "
+            f"{skipped} skipped."
+        )
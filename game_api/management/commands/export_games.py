@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from game_api.export import FORMATS, export_records, render
+
+
+class Command(BaseCommand):
+    """
+    Export every game with its rolls and scores as NDJSON or CSV.
+
+    Records are written as they are read from the database. To resume an
+    interrupted export, pass the ID of the last exported game as --after.
+    """
+
+    help = "Stream games with their rolls and scores to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", dest="export_format", choices=FORMATS, default="ndjson"
+        )
+        parser.add_argument(
+            "--output", help="File to write to (default: stdout). Appended to with --after."
+        )
+        parser.add_argument(
+            "--after", type=int, help="Only export games with a greater ID."
+        )
+        parser.add_argument(
+            "--completed", action="store_true", help="Only export completed games."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        records = export_records(
+            after=options["after"],
+            completed=True if options["completed"] else None,
+            chunk_size=options["chunk_size"],
+        )
+        chunks = render(records, options["export_format"])
+
+        # A resumed CSV export must not repeat the header
+        if options["after"] is not None and options["export_format"] == "csv":
+            next(chunks)
+
+        if options["output"]:
+            mode = "a" if options["after"] is not None else "w"
+            with open(options["output"], mode, newline="") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
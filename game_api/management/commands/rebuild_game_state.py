@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+
+from game_api.models import Game
+from game_api.services import (
+    CURSOR_FIELDS,
+    InvalidRollError,
+    calculate_score,
+    rebuild_frame_state,
+)
+from game_api.state import invalidate_game_state
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the frame cursor and running score stored on games.
+
+    Each game's rolls are replayed and the resulting score is checked
+    against calculate_score, which scores the rolls from scratch.
+    """
+
+    help = "Rebuild the frame cursor and running score of games from their rolls."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "game_ids", nargs="*", type=int, help="Only rebuild these games."
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report games whose stored state is out of date.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of games to load per query.",
+        )
+
+    def handle(self, *args, **options):
+        games = Game.objects.order_by("id")
+        if options["game_ids"]:
+            games = games.filter(id__in=options["game_ids"])
+
+        checked = stale = failed = 0
+        for game in games.iterator(chunk_size=options["batch_size"]):
+            checked += 1
+            stored = [getattr(game, field) for field in CURSOR_FIELDS]
+
+            try:
+                rebuild_frame_state(game)
+            except InvalidRollError as error:
+                failed += 1
+                self.stderr.write(f"Game {game.id}: invalid rolls ({error})")
+                continue
+
+            expected = calculate_score(game)
+            if game.score != expected:
+                failed += 1
+                self.stderr.write(
+                    f"Game {game.id}: rebuilt score {game.score} "
+                    f"does not match calculate_score {expected}"
+                )
+                continue
+
+            if stored == [getattr(game, field) for field in CURSOR_FIELDS]:
+                continue
+
+            stale += 1
+            if options["check"]:
+                self.stdout.write(f"Game {game.id}: stored state is out of date")
+            else:
+                game.save(update_fields=CURSOR_FIELDS)
+                invalidate_game_state(game.id)
+
+        action = "out of date" if options["check"] else "rebuilt"
+        self.stdout.write(
+            f"Checked {checked} games: {stale} {action}, {failed} failed."
+        )
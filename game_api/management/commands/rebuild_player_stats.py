@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from game_api.stats import rebuild_player_stats
+
+
+class Command(BaseCommand):
+    """
+    Recompute the statistics of every player from their completed games.
+
+    The games are scored with the vectorized batch scorer and every
+    statistics row is replaced in one transaction.
+    """
+
+    help = "Rebuild player statistics from the rolls of completed games."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of rolls fetched from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        players = rebuild_player_stats(chunk_size=options["chunk_size"])
+        self.stdout.write(f"Rebuilt the statistics of {players} players.")
@@ -0,0 +1,64 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from game_api.batch_summaries import summarize_games
+from game_api.models import Game
+
+
+class Command(BaseCommand):
+    """
+    Summarize many games with batched LLM calls, e.g. for an end-of-night recap.
+
+    Games are packed several per call within the SUMMARY_BATCH token budget
+    and the calls run concurrently; summaries already cached are reused.
+    """
+
+    help = "Summarize games in batches and print one line (or JSON object) per game."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "game_ids", nargs="*", type=int, help="Only summarize these games."
+        )
+        parser.add_argument(
+            "--center", help="Only summarize the games of this bowling center."
+        )
+        parser.add_argument(
+            "--since-hours",
+            type=float,
+            help="Only summarize games created within this many hours.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print one JSON object per game, then the cost of the run.",
+        )
+
+    def handle(self, *args, **options):
+        games = Game.objects.only("id", "roll_count", "packed_rolls").order_by("id")
+        if options["game_ids"]:
+            games = games.filter(id__in=options["game_ids"])
+        if options["center"] is not None:
+            games = games.filter(center=options["center"])
+        if options["since_hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["since_hours"])
+            games = games.filter(created_at__gte=since)
+
+        result = summarize_games(games).as_dict()
+        for game in result.pop("games"):
+            if options["json"]:
+                self.stdout.write(json.dumps(game))
+            elif game["summary"] is None:
+                self.stderr.write(f"Game {game['game_id']}: {game['error']}")
+            else:
+                self.stdout.write(f"Game {game['game_id']}: {game['summary']}")
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.stdout.write(
+                f"{result['llm_calls']} LLM calls, about {result['prompt_tokens']} "
+                f"prompt tokens, {result['cached']} summaries from the cache."
+            )
@@ -0,0 +1,406 @@
+"""
+Request, database, LLM and cache metrics in the Prometheus text format.
+
+``MetricsMiddleware`` times every request and counts the SQL queries it
+issues, labelled by view. The LLM client times its calls and reports its
+retries and circuit breaker state, and registered caches report their hit
+and miss counters when the metrics are scraped.
+Recording a sample takes a lock and a few additions, so the metrics can stay
+enabled in production; the ``METRICS`` setting turns them off.
+"""
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Buckets for the number of queries issued by a request
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Request methods labelled by name; any other verb a client sends is labelled
+# "other", so the number of samples stays bounded
+HTTP_METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT")
+)
+
+# Query counters of the request being served, if it is instrumented
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+
+def metrics_settings():
+    """Return the metrics settings dictionary, with defaults filled in."""
+    options = {"ENABLED": True, "DB_QUERIES": True, "BUCKETS": DEFAULT_BUCKETS}
+    options.update(getattr(settings, "METRICS", {}))
+    return options
+
+
+def format_labels(labels):
+    """Format label pairs as a Prometheus label set."""
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value):
+    """Format a sample value, using integers where possible."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    Base class of labelled metrics.
+
+    Parameters:
+        name (str): The metric name.
+        help (str): The description shown on the metrics page.
+        labelnames (tuple[str]): The names of the labels of every sample.
+    """
+
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def label_values(self, labels):
+        """Return the label values of a sample, in labelnames order."""
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        """Return the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in sorted(values):
+            lines += self.render_samples(list(zip(self.labelnames, label_values)), value)
+        return "\n".join(lines)
+
+    def render_samples(self, labels, value):
+        return [f"{self.name}{format_labels(labels)} {format_value(value)}"]
+
+    def clear(self):
+        """Drop every sample."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """A monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Add amount to the sample with the given labels."""
+        key = self.label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Return the sample with the given labels."""
+        return self._values.get(self.label_values(labels), 0)
+
+
+class Gauge(Metric):
+    """A value that goes up and down, such as a state or a level."""
+
+    type = "gauge"
+
+    def set(self, value, **labels):
+        """Set the sample with the given labels."""
+        key = self.label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels):
+        """Return the sample with the given labels."""
+        return self._values.get(self.label_values(labels), 0)
+
+
+class Histogram(Metric):
+    """
+    Observations counted into cumulative buckets.
+
+    Parameters:
+        buckets (tuple[float]): The upper bounds of the buckets, ascending.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Record an observation in the sample with the given labels."""
+        key = self.label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                # Per-bucket counts (the last one is +Inf), sum and count
+                sample = self._values[key] = [[0] * (len(self.buckets) + 1), 0, 0]
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    def count(self, **labels):
+        """Return the number of observations with the given labels."""
+        sample = self._values.get(self.label_values(labels))
+        return sample[2] if sample else 0
+
+    def render_samples(self, labels, value):
+        counts, total, count = value
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            bucket_labels = format_labels(labels + [("le", format_value(bound))])
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(total)}")
+        lines.append(f"{self.name}_count{format_labels(labels)} {count}")
+        return lines
+
+
+class CacheCollector:
+    """
+    Reports the counters of registered caches when the metrics are scraped.
+
+    Any object with a ``stats`` attribute holding a CacheStats can be registered.
+    """
+
+    def __init__(self):
+        self.caches = {}
+
+    def register(self, name, cache):
+        """Report the counters of cache under the given name."""
+        self.caches[name] = cache
+
+    def render(self):
+        """Return the cache counters in the Prometheus text format."""
+        families = [
+            ("cache_hits_total", "counter", "Cache lookups that found an entry.", "hits"),
+            ("cache_misses_total", "counter", "Cache lookups that found no entry.", "misses"),
+            ("cache_evictions_total", "counter", "Entries evicted to bound cache size.", "evictions"),
+            ("cache_hit_ratio", "gauge", "Share of cache lookups that were hits.", "hit_rate"),
+        ]
+        lines = []
+        for name, kind, help, attribute in families:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for cache_name, cache in sorted(self.caches.items()):
+                value = getattr(cache.stats, attribute)
+                labels = format_labels([("cache", cache_name)])
+                lines.append(f"{name}{labels} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Registry:
+    """The metrics rendered by the metrics endpoint."""
+
+    def __init__(self):
+        self.metrics = []
+        self.caches = CacheCollector()
+
+    def register(self, metric):
+        """Add a metric to the registry and return it."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text format."""
+        parts = [metric.render() for metric in self.metrics]
+        if self.caches.caches:
+            parts.append(self.caches.render())
+        return "\n".join(parts) + "\n"
+
+    def clear(self):
+        """Drop every sample; cache counters are left to the caches."""
+        for metric in self.metrics:
+            metric.clear()
+
+
+registry = Registry()
+_buckets = metrics_settings()["BUCKETS"]
+
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time to produce the response of a request.",
+        ("view", "method", "status"),
+        buckets=_buckets,
+    )
+)
+request_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL queries issued by a request.",
+        ("view",),
+        buckets=QUERY_BUCKETS,
+    )
+)
+request_query_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time a request spent waiting on SQL queries.",
+        ("view",),
+        buckets=_buckets,
+    )
+)
+llm_duration = registry.register(
+    Histogram(
+        "llm_request_duration_seconds",
+        "Time to get a completion from the LLM API.",
+        ("client", "outcome"),
+        buckets=_buckets,
+    )
+)
+llm_retries = registry.register(
+    Counter(
+        "llm_retries_total",
+        "LLM API calls retried after a transient error.",
+        ("client",),
+    )
+)
+llm_circuit_state = registry.register(
+    Gauge(
+        "llm_circuit_state",
+        "State of the LLM circuit breaker: 0 closed, 1 half open, 2 open.",
+    )
+)
+llm_fallbacks = registry.register(
+    Counter(
+        "llm_fallback_summaries_total",
+        "Summaries built from the scorecard because the LLM was unavailable.",
+        ("reason",),
+    )
+)
+
+
+@contextmanager
+def time_llm_call(client):
+    """
+    Time an LLM API call, recording whether it raised.
+
+    Parameters:
+        client (str): ``sync`` or ``async``.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        llm_duration.observe(time.perf_counter() - started, client=client, outcome=outcome)
+
+
+class QueryStats:
+    """The number of SQL queries issued by a request and the time they took."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def instrument_queries(execute, sql, params, many, context):
+    """
+    Database execute wrapper counting the queries of instrumented requests.
+
+    Installed on every connection; queries run outside of a request, such as
+    in management commands or background jobs, are not counted.
+    """
+    stats = _request_queries.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def install_query_instrumentation(sender, connection, **kwargs):
+    """Add instrument_queries to a new database connection."""
+    if instrument_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(instrument_queries)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency and SQL queries of every request, per view.
+
+    Views are labelled by URL name rather than path and unknown request
+    methods as "other", so the number of samples stays bounded. For
+    streaming responses, only the time to start the response is measured.
+    Works with both sync and async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_settings()["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    async def __acall__(self, request):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self.finish(request, response, stats, started)
+        return response
+
+    def start(self):
+        """Start timing a request and counting its queries."""
+        stats = QueryStats()
+        return stats, _request_queries.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, started):
+        """Record the samples of a finished request."""
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match is not None and match.view_name else "unmatched"
+        method = request.method if request.method in HTTP_METHODS else "other"
+
+        request_duration.observe(
+            duration, view=view, method=method, status=response.status_code
+        )
+        request_queries.observe(stats.count, view=view)
+        request_query_duration.observe(stats.duration, view=view)
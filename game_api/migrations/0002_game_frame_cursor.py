@@ -0,0 +1,80 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:18
+
+from django.db import migrations, models
+
+
+def backfill_frame_cursor(apps, schema_editor):
+    """Replay the rolls of existing games to initialise their frame cursor."""
+    Game = apps.get_model("game_api", "Game")
+
+    for game in Game.objects.filter(rolls__isnull=False).distinct().iterator():
+        frame, roll_number, standing, pending, finished = 1, 1, 10, [], False
+        pins = game.rolls.order_by("frame", "roll_number", "id").values_list(
+            "knocked_down_pins", flat=True
+        )
+        for knocked_down_pins in pins:
+            if finished:
+                break
+            standing = max(standing - knocked_down_pins, 0)
+            filling = any(bonus_frame == 10 for bonus_frame, _ in pending)
+            pending = [[f, rolls - 1] for f, rolls in pending if rolls > 1]
+            if frame < 10:
+                if standing == 0:
+                    pending.append([frame, 2 if roll_number == 1 else 1])
+                if standing == 0 or roll_number == 2:
+                    frame, roll_number, standing = frame + 1, 1, 10
+                else:
+                    roll_number = 2
+            else:
+                if standing == 0:
+                    if not filling:
+                        pending.append([10, 2 if roll_number == 1 else 1])
+                    standing = 10
+                if roll_number > 1 and not any(f == 10 for f, _ in pending):
+                    finished = True
+                else:
+                    roll_number += 1
+            game.roll_count += 1
+
+        game.current_frame = frame
+        game.current_roll = roll_number
+        game.pins_standing = standing
+        game.pending_bonuses = pending
+        game.completed = game.completed or finished
+        game.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='current_frame',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='current_roll',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='pending_bonuses',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='pins_standing',
+            field=models.PositiveSmallIntegerField(default=10),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='roll_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_frame_cursor, migrations.RunPython.noop),
+    ]
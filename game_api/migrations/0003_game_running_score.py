@@ -0,0 +1,52 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:19
+
+from django.db import migrations, models
+
+
+def backfill_running_score(apps, schema_editor):
+    """Score the rolls of existing games to initialise their running score."""
+    Game = apps.get_model("game_api", "Game")
+
+    for game in Game.objects.filter(rolls__isnull=False).distinct().iterator():
+        pins = list(
+            game.rolls.order_by("frame", "roll_number", "id").values_list(
+                "knocked_down_pins", flat=True
+            )
+        )
+        frame_scores = []
+        index = 0
+        while index < len(pins) and len(frame_scores) < 10:
+            if pins[index] == 10:
+                frame_scores.append(sum(pins[index : index + 3]))
+                index += 1
+            elif sum(pins[index : index + 2]) == 10:
+                frame_scores.append(sum(pins[index : index + 3]))
+                index += 2
+            else:
+                frame_scores.append(sum(pins[index : index + 2]))
+                index += 2
+
+        game.frame_scores = frame_scores
+        game.score = sum(frame_scores)
+        game.save(update_fields=["frame_scores", "score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0002_game_frame_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='frame_scores',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='score',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_running_score, migrations.RunPython.noop),
+    ]
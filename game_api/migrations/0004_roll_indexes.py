@@ -0,0 +1,78 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:29
+
+import django.db.models.deletion
+from django.db import IntegrityError, migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_rolls(apps, schema_editor):
+    """
+    Refuse to add the unique roll constraint over duplicate roll slots.
+
+    Concurrent requests could record two rolls for the same frame and roll
+    number before the constraint existed. The frame cursor and running score
+    backfilled by the previous migrations already count those rolls, so which
+    of them to keep is left to the operator instead of being guessed here.
+    """
+    Roll = apps.get_model("game_api", "Roll")
+
+    duplicates = list(
+        Roll.objects.values("game_id", "frame", "roll_number")
+        .annotate(rolls=Count("id"))
+        .filter(rolls__gt=1)
+        .order_by("game_id", "frame", "roll_number")
+    )
+    if not duplicates:
+        return
+
+    slots = ", ".join(
+        f"game {slot['game_id']} frame {slot['frame']} roll {slot['roll_number']}"
+        f" ({slot['rolls']} rows)"
+        for slot in duplicates[:20]
+    )
+    more = f" and {len(duplicates) - 20} more" if len(duplicates) > 20 else ""
+    raise IntegrityError(
+        f"Cannot add unique_game_frame_roll: {len(duplicates)} roll slots are "
+        f"recorded more than once: {slots}{more}. Delete the extra game_api_roll "
+        "rows of each slot (or the affected games) and run migrate again; "
+        "nothing has been changed."
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0003_game_running_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_rolls, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='roll',
+            name='frame',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='roll',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rolls', to='game_api.game'),
+        ),
+        migrations.AlterField(
+            model_name='roll',
+            name='knocked_down_pins',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='roll',
+            name='roll_number',
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='roll',
+            index=models.Index(fields=['game', 'created_at'], name='roll_game_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='roll',
+            constraint=models.UniqueConstraint(fields=('game', 'frame', 'roll_number'), name='unique_game_frame_roll'),
+        ),
+    ]
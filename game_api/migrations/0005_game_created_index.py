@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0004_roll_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-created_at', '-id'], name='game_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0005_game_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='center',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0006_game_center'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roll',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='roll',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key__isnull', False)), fields=('game', 'idempotency_key'), name='unique_game_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0007_roll_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='packed_rolls',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
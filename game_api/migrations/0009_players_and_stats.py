@@ -0,0 +1,55 @@
+# Generated by Django 5.1.2 on 2026-10-17 22:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0008_game_packed_rolls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Player',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('league', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='players', to='game_api.league')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='player',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='games', to='game_api.player'),
+        ),
+        migrations.CreateModel(
+            name='PlayerStats',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='game_api.player')),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('total_score', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(default=0)),
+                ('high_game', models.PositiveSmallIntegerField(default=0)),
+                ('frames', models.PositiveIntegerField(default=0)),
+                ('strikes', models.PositiveIntegerField(default=0)),
+                ('spares', models.PositiveIntegerField(default=0)),
+                ('open_frames', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('league', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='game_api.league')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-average', 'player'], name='stats_average_idx'), models.Index(fields=['-high_game', 'player'], name='stats_high_game_idx'), models.Index(fields=['league', '-average', 'player'], name='stats_league_average_idx'), models.Index(fields=['league', '-high_game', 'player'], name='stats_league_high_game_idx')],
+            },
+        ),
+    ]
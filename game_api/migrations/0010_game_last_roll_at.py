@@ -0,0 +1,74 @@
+# Generated by Django 5.1.2 on 2026-10-17 23:40
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+# Version 1 of the packed rolls format, frozen here so that later changes to
+# game_api.archive do not change what this migration does
+FORMAT_VERSION = 1
+HAS_TIMES = 0x80
+
+
+def last_roll_time(data, start):
+    """Decode the time of the last packed roll, or None if times were not stored."""
+    data = bytes(data)
+    if not data or data[0] & ~HAS_TIMES != FORMAT_VERSION:
+        raise ValueError("Unsupported packed rolls format")
+    if not data[0] & HAS_TIMES:
+        return None
+
+    count = data[1]
+    previous, offset = (start if count else None), 2 + count
+    for _ in range(count):
+        # Zigzag encoded varint of the milliseconds since the previous roll
+        value = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += timedelta(milliseconds=(value >> 1) ^ -(value & 1))
+    return previous
+
+
+def backfill_last_roll_at(apps, schema_editor):
+    """Copy the time of each game's latest roll, from its rows or packed rolls."""
+    Game = apps.get_model("game_api", "Game")
+    Roll = apps.get_model("game_api", "Roll")
+
+    latest = (
+        Roll.objects.filter(game_id=OuterRef("id"))
+        .values("game_id")
+        .annotate(latest=Max("created_at"))
+        .values("latest")
+    )
+    Game.objects.filter(packed_rolls__isnull=True).update(last_roll_at=Subquery(latest))
+
+    packed = Game.objects.filter(packed_rolls__isnull=False).only(
+        "id", "created_at", "packed_rolls"
+    )
+    for game in packed.iterator():
+        last_roll_at = last_roll_time(game.packed_rolls, game.created_at)
+        if last_roll_at is not None:
+            game.last_roll_at = last_roll_at
+            game.save(update_fields=["last_roll_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0009_players_and_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='last_roll_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_last_roll_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.1.2 on 2026-10-17 22:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# Version 1 of the packed rolls format, frozen here so that later changes to
+# game_api.archive do not change what this migration does
+FORMAT_VERSION = 1
+HAS_TIMES = 0x80
+
+
+def packed_roll_count(data):
+    """Return the number of rolls packed into an archived game."""
+    data = bytes(data)
+    if len(data) < 2 or data[0] & ~HAS_TIMES != FORMAT_VERSION:
+        raise ValueError("Unsupported packed rolls format")
+    return data[1]
+
+
+def backfill_events(apps, schema_editor):
+    """
+    Log a roll event for every stored roll, and snapshot each game's rolls.
+
+    Archived games keep no event log, since their packed rolls already are
+    their final state, so they only get their event sequence: one event per
+    packed roll, without writing the events.
+    """
+    Game = apps.get_model("game_api", "Game")
+    Roll = apps.get_model("game_api", "Roll")
+    GameEvent = apps.get_model("game_api", "GameEvent")
+    GameSnapshot = apps.get_model("game_api", "GameSnapshot")
+
+    games = Game.objects.only("id", "packed_rolls")
+    for game in games.iterator(chunk_size=500):
+        if game.packed_rolls is not None:
+            game.event_sequence = packed_roll_count(game.packed_rolls)
+            game.save(update_fields=["event_sequence"])
+            continue
+
+        rolls = list(
+            Roll.objects.filter(game_id=game.id)
+            .order_by("frame", "roll_number")
+            .values_list("knocked_down_pins", "created_at")
+        )
+        if not rolls:
+            continue
+
+        GameEvent.objects.bulk_create(
+            GameEvent(
+                game_id=game.id,
+                sequence=index + 1,
+                kind="roll",
+                roll_index=index,
+                knocked_down_pins=pins,
+                created_at=created_at,
+            )
+            for index, (pins, created_at) in enumerate(rolls)
+        )
+        GameSnapshot.objects.create(
+            game_id=game.id, sequence=len(rolls), pins=bytes(pins for pins, _ in rolls)
+        )
+        game.event_sequence = len(rolls)
+        game.save(update_fields=["event_sequence"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_api', '0010_game_last_roll_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='event_sequence',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='GameEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('roll', 'Roll'), ('correction', 'Correction'), ('undo', 'Undo')], max_length=10)),
+                ('roll_index', models.PositiveSmallIntegerField()),
+                ('knocked_down_pins', models.PositiveSmallIntegerField()),
+                ('previous_pins', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('game', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='game_api.game')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'sequence'), name='unique_game_event_sequence')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GameSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('pins', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='game_api.game')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'sequence'), name='unique_game_snapshot_sequence')],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,43 @@
 from django.db import models
+from django.utils import timezone
+
+
+class League(models.Model):
+    """
+    Represents a bowling league.
+
+    Attributes:
+        name (str): The unique name of the league.
+        created_at (datetime): The timestamp when the league was created.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Return a string representation of the League instance."""
+        return self.name
+
+
+class Player(models.Model):
+    """
+    Represents a bowler.
+
+    Attributes:
+        name (str): The name of the player.
+        league (League): The league the player bowls in, optional.
+        created_at (datetime): The timestamp when the player was created.
+    """
+
+    name = models.CharField(max_length=100)
+    league = models.ForeignKey(
+        League, on_delete=models.SET_NULL, null=True, blank=True, related_name="players"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Return a string representation of the Player instance."""
+        return self.name
 
 
 class Game(models.Model):
@@ -7,14 +46,64 @@ class Game(models.Model):
 
     Attributes:
         title (str): The title of the game, optional.
+        center (str): The bowling center the game is played at, optional.
+        player (Player): The player bowling the game, optional.
         created_at (datetime): The timestamp when the game was created.
         completed (bool): Indicates whether the game has been completed.
+        current_frame (int): The frame the next roll will be recorded in (1 to 10).
+        current_roll (int): The roll number the next roll will be recorded as.
+        pins_standing (int): The pins left standing for the next roll.
+        pending_bonuses (list): ``[frame, rolls]`` pairs for strikes and spares
+            still waiting on bonus rolls.
+        roll_count (int): The number of rolls recorded so far.
+        frame_scores (list[int]): The score of each frame started so far,
+            including the strike and spare bonuses credited so far.
+        score (int): The running total of ``frame_scores``.
+        last_roll_at (datetime): When the game's rolls were last recorded or
+            corrected, or None if it has no rolls.
+        event_sequence (int): The sequence number of the game's latest event.
+        packed_rolls (bytes): The rolls of an archived game, packed by
+            ``game_api.archive.pack_rolls``; its Roll rows have been deleted.
     """
 
     title = models.CharField(max_length=255, null=True, blank=True)
+    center = models.CharField(max_length=100, blank=True, default="")
+    player = models.ForeignKey(
+        Player, on_delete=models.SET_NULL, null=True, blank=True, related_name="games"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     completed = models.BooleanField(default=False)
 
+    # Frame cursor, advanced together with every Roll insert so that recording
+    # a roll never needs to rescan the rolls already stored for the game.
+    current_frame = models.PositiveSmallIntegerField(default=1)
+    current_roll = models.PositiveSmallIntegerField(default=1)
+    pins_standing = models.PositiveSmallIntegerField(default=10)
+    pending_bonuses = models.JSONField(default=list, blank=True)
+    roll_count = models.PositiveSmallIntegerField(default=0)
+
+    # Running score, kept up to date with the frame cursor so reading the
+    # score never has to load the game's rolls.
+    frame_scores = models.JSONField(default=list, blank=True)
+    score = models.PositiveSmallIntegerField(default=0)
+
+    # Time of the latest roll, saved with the cursor and served as the game's
+    # Last-Modified validator
+    last_roll_at = models.DateTimeField(null=True, blank=True)
+
+    # Position of the game's event log, advanced with every roll, correction
+    # and undo; it versions the game's cached state and HTTP validators
+    event_sequence = models.PositiveIntegerField(default=0)
+
+    # Rolls of archived games, packed one byte per roll instead of one row each
+    packed_rolls = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the game listing, newest first
+            models.Index(fields=["-created_at", "-id"], name="game_created_idx"),
+        ]
+
     def __str__(self):
         """Return a string representation of the Game instance."""
         return self.title or f"Game {self.id}"
@@ -30,14 +119,200 @@ class Roll(models.Model):
         roll_number (int): The number of the roll within the frame (1 or 2, or 3 for a strike).
         knocked_down_pins (int): The number of pins knocked down in this roll.
         created_at (datetime): The timestamp when the roll was recorded.
+        idempotency_key (str): The Idempotency-Key header of the request that
+            recorded the roll, if any.
     """
 
-    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="rolls")
-    frame = models.IntegerField()
-    roll_number = models.IntegerField()
-    knocked_down_pins = models.IntegerField()
+    # The game column is indexed as the prefix of the composite indexes below
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="rolls", db_index=False
+    )
+    frame = models.PositiveSmallIntegerField()
+    roll_number = models.PositiveSmallIntegerField()
+    knocked_down_pins = models.PositiveSmallIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+    idempotency_key = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # Also serves as the (game, frame, roll_number) index used to
+            # read a game's rolls in order without sorting them
+            models.UniqueConstraint(
+                fields=["game", "frame", "roll_number"], name="unique_game_frame_roll"
+            ),
+            # Retried requests find the roll they recorded through this index
+            models.UniqueConstraint(
+                fields=["game", "idempotency_key"],
+                condition=models.Q(idempotency_key__isnull=False),
+                name="unique_game_idempotency_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["game", "created_at"], name="roll_game_created_idx"),
+        ]
 
     def __str__(self):
         """Return a string representation of the Roll instance."""
         return f"Roll {self.id}"
+
+
+class GameEvent(models.Model):
+    """
+    An entry of a game's append-only event log.
+
+    Every change to a game's rolls is appended as an event with the next
+    sequence number of the game, under the game's row lock, so replaying
+    the events in sequence order rebuilds the game's rolls exactly.
+
+    Attributes:
+        game (Game): The game the event belongs to.
+        sequence (int): The position of the event in the game's log, from 1.
+        kind (str): ``roll``, ``correction`` or ``undo``.
+        roll_index (int): The position of the affected roll in the game's
+            roll sequence, from 0.
+        knocked_down_pins (int): The pins of the recorded or corrected roll,
+            or of the roll removed by an undo.
+        previous_pins (int): The pins a correction replaced, if any.
+        created_at (datetime): When the event was recorded.
+    """
+
+    ROLL = "roll"
+    CORRECTION = "correction"
+    UNDO = "undo"
+    KINDS = [(ROLL, "Roll"), (CORRECTION, "Correction"), (UNDO, "Undo")]
+
+    # The game column is indexed as the prefix of the unique constraint
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="events", db_index=False
+    )
+    sequence = models.PositiveIntegerField()
+    kind = models.CharField(max_length=10, choices=KINDS)
+    roll_index = models.PositiveSmallIntegerField()
+    knocked_down_pins = models.PositiveSmallIntegerField()
+    previous_pins = models.PositiveSmallIntegerField(null=True, blank=True)
+    # Not auto_now_add, so that events backfilled from rolls keep their times
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            # Also serves as the index events are replayed in order from
+            models.UniqueConstraint(
+                fields=["game", "sequence"], name="unique_game_event_sequence"
+            ),
+        ]
+
+    def __str__(self):
+        """Return a string representation of the GameEvent instance."""
+        return f"Event {self.sequence} of game {self.game_id}"
+
+
+class GameSnapshot(models.Model):
+    """
+    The rolls of a game as of one of its events.
+
+    Replaying a game starts from its latest snapshot instead of its first
+    event, so it costs as many steps as there are events after the snapshot.
+
+    Attributes:
+        game (Game): The game the snapshot belongs to.
+        sequence (int): The sequence number of the last event included.
+        pins (bytes): The pins knocked down by each roll, one byte per roll.
+        created_at (datetime): When the snapshot was taken.
+    """
+
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="snapshots", db_index=False
+    )
+    sequence = models.PositiveIntegerField()
+    pins = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also serves as the index the latest snapshot is found through
+            models.UniqueConstraint(
+                fields=["game", "sequence"], name="unique_game_snapshot_sequence"
+            ),
+        ]
+
+    def __str__(self):
+        """Return a string representation of the GameSnapshot instance."""
+        return f"Snapshot {self.sequence} of game {self.game_id}"
+
+
+class PlayerStats(models.Model):
+    """
+    Aggregate statistics of a player's completed games.
+
+    Updated in the same transaction as the roll that completes each of the
+    player's games, and rebuilt from scratch by the ``rebuild_player_stats``
+    command.
+
+    Attributes:
+        player (Player): The player the statistics belong to.
+        league (League): The player's league, copied so that league
+            leaderboards are served from an index.
+        games (int): The number of completed games.
+        total_score (int): The sum of the scores of those games.
+        average (float): ``total_score / games``, stored to be indexed.
+        high_game (int): The highest score of those games.
+        frames (int): The number of frames bowled.
+        strikes (int): The number of frames started with a strike.
+        spares (int): The number of frames completed with a spare.
+        open_frames (int): The number of frames with pins left standing.
+        updated_at (datetime): When a game was last added.
+    """
+
+    player = models.OneToOneField(
+        Player, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    league = models.ForeignKey(
+        League, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    games = models.PositiveIntegerField(default=0)
+    total_score = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0)
+    high_game = models.PositiveSmallIntegerField(default=0)
+    frames = models.PositiveIntegerField(default=0)
+    strikes = models.PositiveIntegerField(default=0)
+    spares = models.PositiveIntegerField(default=0)
+    open_frames = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Leaderboards read the top N rows of these indexes in order
+            models.Index(fields=["-average", "player"], name="stats_average_idx"),
+            models.Index(fields=["-high_game", "player"], name="stats_high_game_idx"),
+            models.Index(
+                fields=["league", "-average", "player"], name="stats_league_average_idx"
+            ),
+            models.Index(
+                fields=["league", "-high_game", "player"],
+                name="stats_league_high_game_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Return a string representation of the PlayerStats instance."""
+        return f"Stats of player {self.player_id}"
+
+    @property
+    def strike_percentage(self):
+        """float: The share of frames started with a strike, in percent."""
+        return percentage(self.strikes, self.frames)
+
+    @property
+    def spare_percentage(self):
+        """float: The share of non-strike frames converted to a spare, in percent."""
+        return percentage(self.spares, self.frames - self.strikes)
+
+    @property
+    def open_frame_percentage(self):
+        """float: The share of frames left open, in percent."""
+        return percentage(self.open_frames, self.frames)
+
+
+def percentage(count, total):
+    """Return count as a percentage of total, rounded to one decimal."""
+    return round(100 * count / total, 1) if total else 0.0
@@ -0,0 +1,110 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over ``(created_at, id)``, newest first.
+
+    Each page is fetched with an indexed range query that starts right after
+    the last row of the previous page, so the cost of a page does not grow
+    with the size of the table or how deep the client has paged.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return the page of rows following the cursor in the request.
+
+        Parameters:
+            queryset (QuerySet): The rows to paginate.
+            request (Request): The HTTP request object.
+            view (APIView): The view being paginated.
+
+        Returns:
+            list: The rows of the requested page.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = self.filter_after(queryset, cursor)
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset.order_by("-created_at", "-id")[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        """Wrap the serialized page with the link to the next page."""
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def filter_after(self, queryset, cursor):
+        """
+        Restrict a queryset to the rows following a cursor.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        created_at, last_id = self.decode_cursor(cursor)
+        # The plain upper bound on created_at lets the database seek the
+        # (created_at, id) index instead of filtering every row
+        return queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(id__lt=last_id)
+        )
+
+    def get_page_size(self, request):
+        """Return the page size requested by the client, capped at max_page_size."""
+        # request.GET works for both DRF and plain Django requests
+        try:
+            page_size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None on the last page."""
+        if not self.has_next:
+            return None
+        return self.next_link(self.request.build_absolute_uri(), self.page[-1])
+
+    def next_link(self, url, last):
+        """Return url with its cursor moved past the row last."""
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(last.created_at, last.id)
+        )
+
+    def encode_cursor(self, created_at, last_id):
+        """Encode the position after a row as an opaque cursor string."""
+        position = f"{created_at.isoformat()}|{last_id}"
+        return urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """
+        Decode a cursor produced by encode_cursor.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        try:
+            created_at, last_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+            created_at = parse_datetime(created_at)
+            last_id = int(last_id)
+        except (Base64Error, UnicodeDecodeError, ValueError):
+            created_at = None
+        if created_at is None:
+            raise NotFound("Invalid cursor")
+        return created_at, last_id
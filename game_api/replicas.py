@@ -0,0 +1,159 @@
+"""
+Read replica routing.
+
+Views opted in with ``ReplicaReadsMixin`` send their reads to a read
+replica, so listing, score, summary and export traffic does not compete with
+roll writes on the primary. Everything else, and every write, uses the
+primary.
+
+Replicas lag behind the primary, so a client that has just written keeps
+reading from the primary for ``STICKY_SECONDS``: ``ReadYourWritesMiddleware``
+sets a short-lived cookie on every successful write, and replica reads are
+skipped while it is present.
+"""
+
+import contextvars
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+# Cookie marking a client that wrote within the last STICKY_SECONDS
+STICKY_COOKIE = "read_primary"
+
+# HTTP methods that only read
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Database alias reads of the current request are routed to, if any
+_read_alias = contextvars.ContextVar("read_alias", default=None)
+
+
+def replica_settings():
+    """Return the read replica settings dictionary, with defaults filled in."""
+    options = {"ALIASES": [], "STICKY_SECONDS": 5}
+    options.update(getattr(settings, "READ_REPLICAS", {}))
+    return options
+
+
+def current_read_alias():
+    """Return the replica reads are routed to, or None when reading from the primary."""
+    return _read_alias.get()
+
+
+@contextmanager
+def reading_from(alias):
+    """
+    Route the reads made inside the block to a database.
+
+    Parameters:
+        alias (str): The replica alias, or None to read from the primary.
+    """
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def choose_replica(request):
+    """
+    Choose the replica to serve a request's reads from.
+
+    Parameters:
+        request (HttpRequest): The HTTP request.
+
+    Returns:
+        str: A replica alias, or None if the request must read from the
+            primary: it writes, its client wrote recently or no replica is
+            configured.
+    """
+    aliases = replica_settings()["ALIASES"]
+    if not aliases or request.method not in SAFE_METHODS:
+        return None
+    if request.COOKIES.get(STICKY_COOKIE):
+        return None
+    return random.choice(aliases)
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of opted-in views to a replica.
+
+    Writes always go to the primary, even for rows read from a replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaReadsMixin:
+    """
+    View mixin routing the reads of safe requests to a read replica.
+
+    Works with DRF views and with async Django views. Streaming responses
+    are consumed after the view returns, so views streaming from the
+    database must pass ``current_read_alias()`` to their queries explicitly.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        alias = choose_replica(request)
+        if getattr(self, "view_is_async", False):
+            return self.adispatch(alias, request, *args, **kwargs)
+
+        with reading_from(alias):
+            return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, alias, request, *args, **kwargs):
+        with reading_from(alias):
+            return await super().dispatch(request, *args, **kwargs)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keep clients that just wrote on the primary for ``STICKY_SECONDS``.
+
+    Every successful request with an unsafe method sets a cookie that
+    expires after the window, so the client's next reads see its writes
+    even if the replicas have not caught up yet.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        options = replica_settings()
+        if not options["ALIASES"]:
+            raise MiddlewareNotUsed
+        self.sticky_seconds = options["STICKY_SECONDS"]
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.mark_writer(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.mark_writer(request, await self.get_response(request))
+
+    def mark_writer(self, request, response):
+        """Set the sticky cookie on the response to a successful write."""
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                STICKY_COOKIE, "1", max_age=self.sticky_seconds, httponly=True
+            )
+        return response
@@ -0,0 +1,255 @@
+"""
+Pure-Python bowling scoring engine.
+
+The engine works on plain sequences of pin counts (a list, ``array("B")`` or
+``bytes``) ordered by frame and roll, and has no Django dependencies, so the
+same rules are shared by the API, batch jobs and background workers.
+"""
+
+FRAMES = 10
+PINS = 10
+
+
+class InvalidRollError(ValueError):
+    """Raised when a roll cannot be recorded against the game's current state."""
+
+
+class FrameState:
+    """
+    Incremental scoring state of a game, advanced one roll at a time.
+
+    Attributes:
+        frame (int): The frame the next roll will be recorded in (1 to 10).
+        roll (int): The roll number the next roll will be recorded as.
+        pins_standing (int): The pins left standing for the next roll.
+        pending_bonuses (list): ``[frame, rolls]`` pairs for strikes and spares
+            still waiting on bonus rolls.
+        frame_scores (list[int]): The score of each frame started so far,
+            including the bonuses credited so far.
+        roll_count (int): The number of rolls recorded so far.
+        completed (bool): Whether the game has been completed.
+    """
+
+    __slots__ = (
+        "frame",
+        "roll",
+        "pins_standing",
+        "pending_bonuses",
+        "frame_scores",
+        "roll_count",
+        "completed",
+    )
+
+    def __init__(
+        self,
+        frame=1,
+        roll=1,
+        pins_standing=PINS,
+        pending_bonuses=(),
+        frame_scores=(),
+        roll_count=0,
+        completed=False,
+    ):
+        self.frame = frame
+        self.roll = roll
+        self.pins_standing = pins_standing
+        self.pending_bonuses = [list(bonus) for bonus in pending_bonuses]
+        self.frame_scores = list(frame_scores)
+        self.roll_count = roll_count
+        self.completed = completed
+
+    @property
+    def score(self):
+        """int: The running total of the frame scores."""
+        return sum(self.frame_scores)
+
+    def max_score(self):
+        """
+        Return the highest final score the game can still reach.
+
+        Knocking down more pins never lowers a score, so the best game from
+        here knocks down every pin left standing on each remaining roll.
+        """
+        best = FrameState(
+            self.frame,
+            self.roll,
+            self.pins_standing,
+            self.pending_bonuses,
+            self.frame_scores,
+            self.roll_count,
+            self.completed,
+        )
+        while not best.completed:
+            best.advance(best.pins_standing)
+        return best.score
+
+    def advance(self, pins):
+        """
+        Record a single roll.
+
+        Parameters:
+            pins (int): The pins knocked down by the roll.
+
+        Returns:
+            tuple[int, int]: The frame and roll number the roll belongs to.
+
+        Raises:
+            InvalidRollError: If the game is completed or the roll knocks down
+                more pins than are standing.
+        """
+        if self.completed:
+            raise InvalidRollError("Game is already completed")
+
+        if pins < 0 or pins > self.pins_standing:
+            raise InvalidRollError(
+                "Total knocked down pins for the frame cannot exceed 10"
+            )
+
+        frame, roll = self.frame, self.roll
+        standing = self.pins_standing - pins
+        frame_scores = self.frame_scores
+
+        # Every strike or spare still owed a bonus is credited with this roll
+        filling = False
+        pending = []
+        for bonus in self.pending_bonuses:
+            frame_scores[bonus[0] - 1] += pins
+            filling = filling or bonus[0] == FRAMES
+            if bonus[1] > 1:
+                pending.append([bonus[0], bonus[1] - 1])
+
+        # 10th frame fill balls only count as the bonus of the strike or spare
+        if roll == 1:
+            frame_scores.append(pins)
+        elif not filling:
+            frame_scores[-1] += pins
+
+        if frame < FRAMES:
+            if standing == 0:
+                # A strike earns the next two rolls, a spare the next one
+                pending.append([frame, 2 if roll == 1 else 1])
+            if standing == 0 or roll == 2:
+                self.frame, self.roll, standing = frame + 1, 1, PINS
+            else:
+                self.roll = 2
+        else:
+            # In the 10th frame a strike or spare earns fill balls instead of
+            # moving on, and the pins are reset whenever they are all down
+            if standing == 0:
+                if not filling:
+                    pending.append([FRAMES, 2 if roll == 1 else 1])
+                standing = PINS
+            if roll > 1 and not any(bonus[0] == FRAMES for bonus in pending):
+                self.completed = True
+            else:
+                self.roll = roll + 1
+
+        self.pins_standing = standing
+        self.pending_bonuses = pending
+        self.roll_count += 1
+
+        return frame, roll
+
+
+class Frame:
+    """
+    A scored frame.
+
+    Attributes:
+        number (int): The frame number (1 to 10).
+        rolls (list[int]): The pins knocked down by each roll of the frame.
+        score (int): The frame score, including the bonuses credited so far.
+        cumulative (int): The running total up to and including this frame.
+        pending_bonus (bool): Whether the frame is a strike or spare still
+            waiting on bonus rolls, so its score is not final yet.
+    """
+
+    __slots__ = ("number", "rolls", "score", "cumulative", "pending_bonus")
+
+    def __init__(self, number, rolls=None, score=0, cumulative=0, pending_bonus=False):
+        self.number = number
+        self.rolls = rolls if rolls is not None else []
+        self.score = score
+        self.cumulative = cumulative
+        self.pending_bonus = pending_bonus
+
+    def __repr__(self):
+        return f"Frame({self.number}, rolls={self.rolls}, score={self.score})"
+
+
+class GameScore:
+    """
+    The result of scoring a sequence of rolls.
+
+    Attributes:
+        frames (list[Frame]): The frames started so far.
+        total (int): The running total score.
+        valid (bool): Whether every roll was valid; scoring stops at the
+            first invalid roll.
+        error (str): Why the first invalid roll was rejected, if any.
+        completed (bool): Whether the rolls make up a complete game.
+        next_frame (int): The frame of the next expected roll, or None.
+        next_roll (int): The roll number of the next expected roll, or None.
+        max_score (int): The highest final score the game can still reach.
+    """
+
+    __slots__ = (
+        "frames",
+        "total",
+        "valid",
+        "error",
+        "completed",
+        "next_frame",
+        "next_roll",
+        "max_score",
+    )
+
+    def __init__(self, frames, state, error=None):
+        self.frames = frames
+        self.total = state.score
+        self.max_score = state.max_score()
+        self.valid = error is None
+        self.error = error
+        self.completed = state.completed
+        self.next_frame = None if state.completed else state.frame
+        self.next_roll = None if state.completed else state.roll
+
+    def __repr__(self):
+        return f"GameScore(total={self.total}, frames={len(self.frames)}, valid={self.valid})"
+
+
+def score_rolls(pins):
+    """
+    Score a sequence of rolls in a single pass.
+
+    Parameters:
+        pins (Iterable[int]): The pins knocked down by each roll, ordered by
+            frame and roll number.
+
+    Returns:
+        GameScore: The per-frame scores, running total, validity and the
+            next expected frame and roll.
+    """
+    state = FrameState()
+    frames = []
+    error = None
+
+    for knocked_down_pins in pins:
+        try:
+            frame, roll = state.advance(knocked_down_pins)
+        except InvalidRollError as invalid:
+            error = str(invalid)
+            break
+        if roll == 1:
+            frames.append(Frame(frame))
+        frames[-1].rolls.append(knocked_down_pins)
+
+    cumulative = 0
+    pending = {bonus[0] for bonus in state.pending_bonuses}
+    for frame, frame_score in zip(frames, state.frame_scores):
+        cumulative += frame_score
+        frame.score = frame_score
+        frame.cumulative = cumulative
+        frame.pending_bonus = frame.number in pending
+
+    return GameScore(frames, state, error)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Game, Roll
+from .models import Game, GameEvent, League, Player, PlayerStats, Roll
 
 
 class GameSerializer(serializers.ModelSerializer):
@@ -11,12 +11,30 @@ class GameSerializer(serializers.ModelSerializer):
         - id: The unique identifier of the game (read-only).
         - created_at: The timestamp when the game was created (read-only).
         - title: The title of the game, optional.
+        - center: The bowling center the game is played at, optional.
+        - player: The ID of the player bowling the game, optional.
         - completed: Indicates whether the game has been completed (read-only).
+        - score: The running score of the game (read-only, only when requested).
+
+    The ``fields`` argument limits the output to the given fields, and
+    ``include`` adds optional fields such as ``score`` to the default ones.
     """
+    # Fields only serialized when explicitly requested
+    optional_fields = ["score"]
+
     class Meta:
         model = Game
-        fields = ["id", "created_at", "title", "completed"]
-        read_only_fields = ["completed"]
+        fields = ["id", "created_at", "title", "center", "player", "completed", "score"]
+        read_only_fields = ["completed", "score"]
+
+    def __init__(self, *args, fields=None, include=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            selected = set(fields)
+        else:
+            selected = set(self.fields) - set(self.optional_fields) | set(include)
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
 
 
 class RollSerializer(serializers.ModelSerializer):
@@ -42,3 +60,177 @@ class RollSerializer(serializers.ModelSerializer):
             "knocked_down_pins",
             "created_at",
         ]
+
+
+class GameEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the GameEvent model.
+
+    It includes the following fields:
+        - sequence: The position of the event in the game's log, from 1.
+        - kind: roll, correction or undo.
+        - roll_index: The position of the affected roll in the game, from 0.
+        - knocked_down_pins: The pins of the recorded, corrected or removed roll.
+        - previous_pins: The pins a correction replaced.
+        - created_at: The timestamp when the event was recorded.
+    """
+    class Meta:
+        model = GameEvent
+        fields = [
+            "sequence",
+            "kind",
+            "roll_index",
+            "knocked_down_pins",
+            "previous_pins",
+            "created_at",
+        ]
+
+
+class RollCorrectionSerializer(serializers.Serializer):
+    """
+    Serializer for the correction of a mis-keyed roll.
+
+    It includes the following fields:
+        - roll: The position of the roll in the game, from 1.
+        - knocked_down_pins: The pins the roll actually knocked down.
+    """
+    roll = serializers.IntegerField(min_value=1, max_value=21)
+    knocked_down_pins = serializers.IntegerField(min_value=0, max_value=10)
+
+
+class BulkRollSerializer(serializers.Serializer):
+    """
+    Serializer for an ordered batch of rolls submitted for a single game.
+
+    It includes the following fields:
+        - rolls: The pins knocked down by each roll, in the order they were bowled.
+    """
+    rolls = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=10),
+        allow_empty=False,
+        max_length=21,
+    )
+
+
+class BulkGameRollsSerializer(BulkRollSerializer):
+    """
+    Serializer for an ordered batch of rolls submitted as part of a multi-game batch.
+
+    It includes the following fields:
+        - game_id: The ID of the game the rolls belong to.
+        - rolls: The pins knocked down by each roll, in the order they were bowled.
+    """
+    game_id = serializers.IntegerField()
+
+
+class BulkGamesSerializer(serializers.Serializer):
+    """
+    Serializer for rolls submitted for several games in a single request.
+
+    It includes the following fields:
+        - games: A list of game_id and rolls pairs, each game appearing once.
+    """
+    games = BulkGameRollsSerializer(many=True, allow_empty=False)
+
+    def validate_games(self, games):
+        """Ensure every game appears only once in the batch."""
+        game_ids = [game["game_id"] for game in games]
+        if len(game_ids) != len(set(game_ids)):
+            raise serializers.ValidationError("Each game may only appear once.")
+        return games
+
+
+class SummaryBatchSerializer(serializers.Serializer):
+    """
+    Serializer for a request to summarize many games at once.
+
+    It includes the following fields:
+        - game_ids: The IDs of the games to summarize.
+        - center: Summarize the games of this bowling center instead.
+        - created_after: With center, only summarize games created since then.
+    """
+    MAX_GAMES = 1000
+
+    game_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_GAMES,
+    )
+    center = serializers.CharField(required=False, max_length=100)
+    created_after = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        """Ensure the games are given either by ID or by center."""
+        if ("game_ids" in data) == ("center" in data):
+            raise serializers.ValidationError("Give either game_ids or center.")
+        if "game_ids" in data:
+            data["game_ids"] = list(dict.fromkeys(data["game_ids"]))
+        return data
+
+
+class LeagueSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the League model.
+
+    It includes the following fields:
+        - id: The unique identifier of the league (read-only).
+        - name: The unique name of the league.
+        - created_at: The timestamp when the league was created (read-only).
+    """
+    class Meta:
+        model = League
+        fields = ["id", "name", "created_at"]
+
+
+class PlayerSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the Player model.
+
+    It includes the following fields:
+        - id: The unique identifier of the player (read-only).
+        - name: The name of the player.
+        - league: The ID of the league the player bowls in, optional.
+        - created_at: The timestamp when the player was created (read-only).
+    """
+    class Meta:
+        model = Player
+        fields = ["id", "name", "league", "created_at"]
+
+
+class PlayerStatsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the aggregate statistics of a player.
+
+    It includes the following fields:
+        - player: The ID of the player.
+        - name: The name of the player.
+        - league: The ID of the player's league, if any.
+        - games: The number of completed games.
+        - average: The average score, rounded to two decimals.
+        - high_game: The highest score.
+        - strike_percentage: The share of frames started with a strike.
+        - spare_percentage: The share of non-strike frames converted to a spare.
+        - open_frame_percentage: The share of frames left open.
+    """
+    name = serializers.CharField(source="player.name", read_only=True)
+    average = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlayerStats
+        fields = [
+            "player",
+            "name",
+            "league",
+            "games",
+            "average",
+            "high_game",
+            "strike_percentage",
+            "spare_percentage",
+            "open_frame_percentage",
+        ]
+        read_only_fields = fields
+
+    def get_average(self, stats):
+        """Return the average score rounded to two decimals."""
+        return round(stats.average, 2)
@@ -1,5 +1,37 @@
-from openai import OpenAI
-from decouple import config
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .archive import unpack_rolls
+from .cache import summary_cache
+from .events import append_events
+from .feed import game_channels, score_feed, score_update
+from .llm import (
+    CircuitOpenError,
+    acomplete_summary,
+    call_llm,
+    get_openai_client,
+    llm_settings,
+)
+from .metrics import llm_fallbacks, time_llm_call
+from .models import Game, GameEvent, Roll
+from .scoring import PINS, FrameState, InvalidRollError, score_rolls
+from .state import write_game_state
+from .stats import record_player_game
+
+# Game fields that make up the frame cursor and event log position, saved with
+# every roll.
+CURSOR_FIELDS = [
+    "current_frame",
+    "current_roll",
+    "pins_standing",
+    "pending_bonuses",
+    "roll_count",
+    "frame_scores",
+    "score",
+    "completed",
+    "event_sequence",
+]
 
 
 def calculate_score(game):
@@ -12,68 +44,659 @@ def calculate_score(game):
     Returns:
         int: The total score for the game.
     """
-    score = 0
-    rolls = list(game.rolls.all().order_by("frame", "roll_number"))
-    frame_index = 0
-
-    for frame in range(10):
-        if frame_index >= len(rolls):
-            break
-
-        if rolls[frame_index].knocked_down_pins == 10:
-            score += 10 + next_two_rolls(rolls, frame_index)
-            frame_index += 1
-        elif (
-            sum([r.knocked_down_pins for r in rolls[frame_index : frame_index + 2]])
-            == 10
-        ):
-            score += 10 + next_roll(rolls, frame_index + 2)
-            frame_index += 2
-        else:
-            score += sum(
-                [r.knocked_down_pins for r in rolls[frame_index : frame_index + 2]]
+    return score_rolls(game_pins(game)).total
+
+
+def game_pins(game):
+    """
+    Get the pins knocked down by each roll of a game, in frame order.
+
+    The rolls of archived games are decoded from the game itself.
+
+    Parameters:
+        game (Game): The Game instance containing the rolls.
+
+    Returns:
+        QuerySet | bytes: The flat ``knocked_down_pins`` values of the game's rolls.
+    """
+    if game.packed_rolls is not None:
+        return unpack_rolls(game.packed_rolls).pins
+    return game.rolls.order_by("frame", "roll_number").values_list(
+        "knocked_down_pins", flat=True
+    )
+
+
+def frame_state(game):
+    """
+    Load the frame cursor and running score stored on a game.
+
+    Parameters:
+        game (Game): The Game instance to read.
+
+    Returns:
+        FrameState: The scoring engine state of the game.
+    """
+    return FrameState(
+        frame=game.current_frame,
+        roll=game.current_roll,
+        pins_standing=game.pins_standing,
+        pending_bonuses=game.pending_bonuses,
+        frame_scores=game.frame_scores,
+        roll_count=game.roll_count,
+        completed=game.completed,
+    )
+
+
+def store_frame_state(game, state):
+    """
+    Copy a scoring engine state onto the cursor and score fields of a game.
+
+    Parameters:
+        game (Game): The Game instance to update. Nothing is saved.
+        state (FrameState): The state to copy.
+    """
+    game.current_frame = state.frame
+    game.current_roll = state.roll
+    game.pins_standing = state.pins_standing
+    game.pending_bonuses = state.pending_bonuses
+    game.roll_count = state.roll_count
+    game.frame_scores = state.frame_scores
+    game.score = state.score
+    game.completed = state.completed
+
+
+def advance_frame_state(game, knocked_down_pins):
+    """
+    Advance the game's frame cursor and running score by a single roll.
+
+    Only the cursor and score fields on the Game instance are updated;
+    nothing is saved.
+
+    Parameters:
+        game (Game): The Game instance whose cursor should be advanced.
+        knocked_down_pins (int): The pins knocked down by the roll.
+
+    Returns:
+        tuple[int, int]: The frame and roll number the roll belongs to.
+
+    Raises:
+        InvalidRollError: If the game is completed or the roll knocks down
+            more pins than are standing.
+    """
+    state = frame_state(game)
+    frame, roll_number = state.advance(knocked_down_pins)
+    store_frame_state(game, state)
+    return frame, roll_number
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an idempotency key is reused for a different roll."""
+
+
+def lock_game(game_id):
+    """
+    Load a game and lock its row until the current transaction ends.
+
+    Concurrent roll submissions for the same game wait for each other here,
+    so each one advances the frame cursor left by the previous one. SQLite
+    ignores the row lock, but the ``IMMEDIATE`` transaction mode configured
+    in the settings gives every transaction the database write lock instead.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        Game: The locked game.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+    """
+    return Game.objects.select_for_update().get(id=game_id)
+
+
+def lock_games(game_ids):
+    """
+    Load several games and lock their rows until the current transaction ends.
+
+    Rows are locked in ID order, so concurrent bulk submissions sharing
+    games cannot deadlock.
+
+    Parameters:
+        game_ids (list[int]): The IDs of the games.
+
+    Returns:
+        dict[int, Game]: The locked games that exist, by ID.
+    """
+    games = Game.objects.select_for_update().filter(id__in=game_ids).order_by("id")
+    return {game.id: game for game in games}
+
+
+def submit_roll(game_id, knocked_down_pins, idempotency_key=None):
+    """
+    Record a roll submitted through the API, at most once per idempotency key.
+
+    The game is locked for the whole submission. If a roll was already
+    recorded for the game with the same idempotency key, that roll is
+    returned instead of recording a new one, so a retried request gets the
+    original result.
+
+    Parameters:
+        game_id (int): The ID of the game.
+        knocked_down_pins (int): The pins knocked down by the roll.
+        idempotency_key (str): The Idempotency-Key header of the request, if any.
+
+    Returns:
+        tuple[Roll, bool]: The roll, and whether it was recorded by an
+            earlier request with the same idempotency key.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+        InvalidRollError: If the roll is not valid for the game's current state.
+        IdempotencyKeyReused: If the key was used for a different roll.
+    """
+    with transaction.atomic():
+        game = lock_game(game_id)
+
+        if idempotency_key is not None:
+            roll = game.rolls.filter(idempotency_key=idempotency_key).first()
+            if roll is not None:
+                if roll.knocked_down_pins != knocked_down_pins:
+                    raise IdempotencyKeyReused(
+                        "Idempotency-Key was already used for a different roll"
+                    )
+                return roll, True
+
+        roll = record_roll(
+            game, knocked_down_pins, idempotency_key=idempotency_key, locked=True
+        )
+    return roll, False
+
+
+def record_roll(game, knocked_down_pins, idempotency_key=None, locked=False):
+    """
+    Record a roll and advance the game's frame cursor in one transaction.
+
+    Unless ``locked`` is set, the game is locked and its frame cursor
+    reloaded first, so the roll is never recorded against a stale cursor.
+    The roll is appended to the game's event log, and the roll that
+    completes a game adds it to its player's statistics.
+
+    Parameters:
+        game (Game): The Game instance the roll belongs to.
+        knocked_down_pins (int): The pins knocked down by the roll.
+        idempotency_key (str): The Idempotency-Key header of the request, if any.
+        locked (bool): Whether the caller loaded the game with lock_game in
+            the current transaction.
+
+    Returns:
+        Roll: The newly created Roll instance.
+
+    Raises:
+        InvalidRollError: If the roll is not valid for the game's current state.
+    """
+    if not locked:
+        with transaction.atomic():
+            current = lock_game(game.id)
+            for field in CURSOR_FIELDS + ["player_id", "last_roll_at"]:
+                setattr(game, field, getattr(current, field))
+            return record_roll(game, knocked_down_pins, idempotency_key, locked=True)
+
+    previous_frame_scores = list(game.frame_scores)
+    frame, roll_number = advance_frame_state(game, knocked_down_pins)
+
+    with transaction.atomic(savepoint=False):
+        roll = Roll.objects.create(
+            game=game,
+            frame=frame,
+            roll_number=roll_number,
+            knocked_down_pins=knocked_down_pins,
+            idempotency_key=idempotency_key,
+        )
+        append_events([(game, [roll_event(game.roll_count - 1, knocked_down_pins)])])
+        game.last_roll_at = roll.created_at
+        game.save(update_fields=CURSOR_FIELDS + ["last_roll_at"])
+        if game.completed:
+            record_player_game(game, game_pins(game))
+        invalidate_game_summary(game.id)
+        write_game_state(game, [knocked_down_pins])
+        publish_score_update(game, previous_frame_scores, [roll])
+
+    return roll
+
+
+def record_rolls(games_pins, locked=False):
+    """
+    Validate and record whole sequences of rolls for one or more games.
+
+    Every sequence is first validated in memory against its game's frame
+    cursor, so either all rolls are recorded or none are. The rolls are then
+    inserted with a single bulk insert, appended to the games' event logs
+    with another, and the games updated with a single bulk update, inside
+    one transaction. Unless ``locked`` is set, the games
+    are locked and their frame cursors reloaded first. Games completed by
+    their rolls are added to their players' statistics.
+
+    Parameters:
+        games_pins (list[tuple[Game, list[int]]]): Each game together with
+            the pins knocked down by its new rolls, in order.
+        locked (bool): Whether the caller loaded the games with lock_game or
+            lock_games in the current transaction.
+
+    Returns:
+        list[Roll]: The newly created Roll instances, in the order given.
+
+    Raises:
+        InvalidRollError: If any roll is not valid for its game's state.
+    """
+    if not locked:
+        with transaction.atomic():
+            current = lock_games([game.id for game, _ in games_pins])
+            for game, _ in games_pins:
+                for field in CURSOR_FIELDS + ["player_id", "last_roll_at"]:
+                    setattr(game, field, getattr(current[game.id], field))
+            return record_rolls(games_pins, locked=True)
+
+    rolls, states, events = [], [], []
+    previous_frame_scores = [list(game.frame_scores) for game, _ in games_pins]
+    for game, pins in games_pins:
+        state = frame_state(game)
+        states.append(state)
+        events.append(
+            (
+                game,
+                [
+                    roll_event(game.roll_count + index, knocked_down_pins)
+                    for index, knocked_down_pins in enumerate(pins)
+                ],
             )
-            frame_index += 2
+        )
+        for index, knocked_down_pins in enumerate(pins):
+            try:
+                frame, roll_number = state.advance(knocked_down_pins)
+            except InvalidRollError as error:
+                raise InvalidRollError(
+                    f"Game {game.id}, roll {index + 1}: {error}"
+                ) from error
+            rolls.append(
+                Roll(
+                    game=game,
+                    frame=frame,
+                    roll_number=roll_number,
+                    knocked_down_pins=knocked_down_pins,
+                )
+            )
+
+    for (game, _), state in zip(games_pins, states):
+        store_frame_state(game, state)
+
+    with transaction.atomic(savepoint=False):
+        rolls = Roll.objects.bulk_create(rolls)
+        append_events(events)
+        for roll in rolls:
+            roll.game.last_roll_at = roll.created_at
+        Game.objects.bulk_update(
+            [game for game, _ in games_pins], CURSOR_FIELDS + ["last_roll_at"]
+        )
+        start = 0
+        for (game, pins), previous in zip(games_pins, previous_frame_scores):
+            invalidate_game_summary(game.id)
+            if pins:
+                if game.completed:
+                    record_player_game(game, game_pins(game))
+                write_game_state(game, pins)
+                publish_score_update(game, previous, rolls[start : start + len(pins)])
+            start += len(pins)
+
+    return rolls
+
+
+def roll_event(roll_index, knocked_down_pins):
+    """Build the unsaved event logging a recorded roll."""
+    return GameEvent(
+        kind=GameEvent.ROLL, roll_index=roll_index, knocked_down_pins=knocked_down_pins
+    )
+
+
+def correct_roll(game_id, roll_index, knocked_down_pins):
+    """
+    Replace a mis-keyed roll of a game in progress.
+
+    The rolls after it are renumbered into the frames they now fall in, the
+    game's cursor and score are recomputed from its rolls, and the change is
+    appended to the game's event log as a ``correction``.
+
+    Parameters:
+        game_id (int): The ID of the game.
+        roll_index (int): The position of the roll in the game, from 0.
+        knocked_down_pins (int): The pins the roll actually knocked down.
+
+    Returns:
+        GameEvent: The correction event.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+        InvalidRollError: If the game is completed, has no such roll, or the
+            corrected rolls do not form a valid game.
+    """
+    with transaction.atomic():
+        game = lock_game(game_id)
+        pins = editable_pins(game)
+        if not 0 <= roll_index < len(pins):
+            raise InvalidRollError(f"Game {game.id} has no roll {roll_index + 1}")
+
+        event = GameEvent(
+            kind=GameEvent.CORRECTION,
+            roll_index=roll_index,
+            knocked_down_pins=knocked_down_pins,
+            previous_pins=pins[roll_index],
+        )
+        pins[roll_index] = knocked_down_pins
+        rewrite_rolls(game, pins, roll_index, event)
+    return event
+
+
+def undo_roll(game_id):
+    """
+    Remove the last roll of a game in progress.
+
+    The removal is appended to the game's event log as an ``undo``.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        GameEvent: The undo event.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+        InvalidRollError: If the game is completed or has no rolls.
+    """
+    with transaction.atomic():
+        game = lock_game(game_id)
+        pins = editable_pins(game)
+        if not pins:
+            raise InvalidRollError(f"Game {game.id} has no rolls to undo")
+
+        event = GameEvent(
+            kind=GameEvent.UNDO, roll_index=len(pins) - 1, knocked_down_pins=pins.pop()
+        )
+        rewrite_rolls(game, pins, len(pins), event)
+    return event
+
+
+def editable_pins(game):
+    """
+    Load the rolls of a game that may be corrected.
+
+    Completed games are already counted in their players' statistics, so
+    their rolls cannot change.
+
+    Parameters:
+        game (Game): The locked game.
+
+    Returns:
+        list[int]: The pins knocked down by each roll, in order.
+
+    Raises:
+        InvalidRollError: If the game is completed.
+    """
+    if game.completed:
+        raise InvalidRollError("The rolls of a completed game cannot be changed")
+    return list(game_pins(game))
+
+
+def rewrite_rolls(game, pins, start, event):
+    """
+    Replace the rolls of a game from a position on, and log the change.
+
+    The Roll rows from ``start`` on are deleted and recreated from ``pins``
+    with their new frame and roll numbers; rows keep the idempotency key of
+    the position they replace.
+
+    Parameters:
+        game (Game): The game, locked by the caller's transaction.
+        pins (list[int]): All of the game's pins after the change.
+        start (int): The position of the first roll that changed, from 0.
+        event (GameEvent): The unsaved event describing the change.
+
+    Raises:
+        InvalidRollError: If the pins do not form a valid game.
+    """
+    state, positions = FrameState(), []
+    for index, knocked_down_pins in enumerate(pins):
+        try:
+            positions.append(state.advance(knocked_down_pins))
+        except InvalidRollError as error:
+            raise InvalidRollError(f"Roll {index + 1}: {error}") from error
+
+    replaced = list(
+        game.rolls.order_by("frame", "roll_number").values_list("id", "idempotency_key")
+    )[start:]
+    keys = [key for _, key in replaced]
+    rolls = [
+        Roll(
+            game=game,
+            frame=frame,
+            roll_number=roll_number,
+            knocked_down_pins=pins[index],
+            idempotency_key=keys[index - start] if index - start < len(keys) else None,
+        )
+        for index, (frame, roll_number) in enumerate(positions[start:], start)
+    ]
+
+    previous_frame_scores = list(game.frame_scores)
+    store_frame_state(game, state)
+    game.last_roll_at = timezone.now()
+
+    with transaction.atomic(savepoint=False):
+        Roll.objects.filter(id__in=[roll_id for roll_id, _ in replaced]).delete()
+        rolls = Roll.objects.bulk_create(rolls)
+        append_events([(game, [event])])
+        game.save(update_fields=CURSOR_FIELDS + ["last_roll_at"])
+        if game.completed:
+            record_player_game(game, pins)
+        invalidate_game_summary(game.id)
+        write_game_state(game, [])
+        publish_score_update(game, previous_frame_scores, rolls)
+
+
+def publish_score_update(game, previous_frame_scores, rolls):
+    """
+    Publish a game's new score to the live feed once the transaction commits.
+
+    Parameters:
+        game (Game): The game, with its cursor and score already advanced.
+        previous_frame_scores (list[int]): The frame scores before the rolls.
+        rolls (list[Roll]): The rolls just recorded, in order.
+    """
+    update = score_update(game, previous_frame_scores, rolls)
+    channels = game_channels(game)
+    transaction.on_commit(lambda: score_feed.publish(channels, update))
+
+
+def rebuild_frame_state(game):
+    """
+    Recompute the frame cursor and running score of a game from its rolls.
+
+    A game that was already marked as completed stays completed.
+
+    Parameters:
+        game (Game): The Game instance to rebuild. Nothing is saved.
+
+    Raises:
+        InvalidRollError: If the stored rolls do not form a valid game.
+    """
+    completed = game.completed
+    state = FrameState()
+    for knocked_down_pins in game_pins(game):
+        state.advance(knocked_down_pins)
+
+    store_frame_state(game, state)
+    game.completed = state.completed or completed
+
+
+def build_summary_prompt(game):
+    """
+    Build the prompt asking the LLM to summarize a game.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+
+    Returns:
+        str: The prompt, listing every roll of the game.
+    """
+    return format_summary_prompt(game, list(summary_rolls(game)))
+
+
+async def abuild_summary_prompt(game):
+    """
+    Build the prompt asking the LLM to summarize a game, using the async ORM.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+
+    Returns:
+        str: The prompt, listing every roll of the game.
+    """
+    rolls = summary_rolls(game)
+    if not isinstance(rolls, list):
+        rolls = [roll async for roll in rolls]
+    return format_summary_prompt(game, rolls)
+
+
+def summary_rolls(game):
+    """
+    Get the rolls listed in a game's summary prompt.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+
+    Returns:
+        QuerySet | list: ``(frame, roll_number, knocked_down_pins)`` rows in
+            the order they were bowled, decoded into a list for archived games.
+    """
+    if game.packed_rolls is not None:
+        return unpack_rolls(game.packed_rolls).rows()
 
-    return score
+    # Retrieve all rolls for the game in frame order, from the unique index;
+    # creation times can be out of order under clock skew
+    return game.rolls.order_by("frame", "roll_number").values_list(
+        "frame", "roll_number", "knocked_down_pins"
+    )
 
 
-def next_two_rolls(rolls, index):
+def format_summary_prompt(game, rolls):
     """
-    Sum the pins knocked down in the next two rolls.
+    Format the summary prompt of a game.
 
     Parameters:
-        rolls (list[Roll]): List of Roll instances.
-        index (int): Current roll index.
+        game (Game): The Game instance to summarize.
+        rolls (list[tuple]): The rows returned by summary_rolls.
 
     Returns:
-        int: Total pins knocked down in the next two rolls.
+        str: The prompt, listing every roll of the game.
     """
-    total_score = 0
+    lines = [
+        "Summarize a bowling game with the following stats:",
+        f"Game ID: {game.id}",
+        f"Total Rolls: {len(rolls)}",
+    ]
+    lines.extend(
+        f"Frame {frame}, Roll {roll_number}: {pins} pins knocked down."
+        for frame, roll_number, pins in rolls
+    )
+
+    # Indicate if the game is completed or still in progress
+    lines.append("Game Completed" if game.completed else "Game In Progress")
+    return "\n".join(lines)
 
-    for i in range(1, 3):  # Check index+1 and index+2
-        if index + i < len(rolls):  # Ensure we're within bounds
-            total_score += rolls[index + i].knocked_down_pins
 
-    return total_score
+def count_phrase(count, noun):
+    """Write a count with its noun, e.g. ``1 strike`` or ``3 strikes``."""
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
 
 
-def next_roll(rolls, index):
+def format_fallback_summary(game, rolls):
     """
-    Get the pins knocked down in the next roll.
+    Summarize a game from its scorecard, without the LLM.
+
+    Served while the LLM is unavailable. The same rolls always give the
+    same summary.
 
     Parameters:
-        rolls (list[Roll]): List of Roll instances.
-        index (int): Current roll index.
+        game (Game): The Game instance to summarize.
+        rolls (list[tuple]): The rows returned by summary_rolls.
 
     Returns:
-        int: Pins knocked down in the next roll, or 0 if none.
+        str: The summary, with the score and the strikes, spares and open
+            frames of the game.
     """
-    return rolls[index].knocked_down_pins if index < len(rolls) else 0
+    result = score_rolls(pins for _, _, pins in rolls)
+    if not result.frames:
+        return f"Game {game.id} has not started yet."
+
+    # Only the first two rolls of the 10th frame decide its mark
+    strikes = spares = opens = 0
+    for frame in result.frames:
+        if frame.rolls[0] == PINS:
+            strikes += 1
+        elif len(frame.rolls) > 1 and sum(frame.rolls[:2]) == PINS:
+            spares += 1
+        elif len(frame.rolls) > 1:
+            opens += 1
+    marks = (
+        f"{count_phrase(strikes, 'strike')}, {count_phrase(spares, 'spare')} "
+        f"and {count_phrase(opens, 'open frame')}"
+    )
 
+    if result.completed:
+        return f"Game {game.id} finished with a score of {result.total}: {marks}."
+    return (
+        f"Game {game.id} is in progress with {result.total} points after "
+        f"{count_phrase(len(result.frames), 'frame')}: {marks}. "
+        f"The highest score still within reach is {result.max_score}."
+    )
+
+
+def get_fallback_summary(game, error):
+    """
+    Summarize a game from its scorecard because the LLM is unavailable.
+
+    Fallback summaries are not cached, so the LLM summary replaces them as
+    soon as the LLM recovers.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+        error (LLMUnavailableError): Why the LLM could not be used.
+
+    Returns:
+        str: The summary built by format_fallback_summary.
+    """
+    llm_fallbacks.inc(reason=fallback_reason(error))
+    return format_fallback_summary(game, list(summary_rolls(game)))
+
+
+async def aget_fallback_summary(game, error):
+    """
+    Summarize a game from its scorecard, using the async ORM.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+        error (LLMUnavailableError): Why the LLM could not be used.
+
+    Returns:
+        str: The summary built by format_fallback_summary.
+    """
+    llm_fallbacks.inc(reason=fallback_reason(error))
+    rolls = summary_rolls(game)
+    if not isinstance(rolls, list):
+        rolls = [roll async for roll in rolls]
+    return format_fallback_summary(game, rolls)
 
-from openai import OpenAI
-from decouple import config
+
+def fallback_reason(error):
+    """Label a fallback summary with why the LLM was unavailable."""
+    return "circuit_open" if isinstance(error, CircuitOpenError) else "llm_error"
 
 
 def generate_game_summary(game):
@@ -86,31 +709,170 @@ def generate_game_summary(game):
     Returns:
         str: A summary of the bowling game, including total rolls and pin counts for each roll.
     """
-    client = OpenAI(api_key=config("OPENAI_API_KEY"))
+    return complete_summary(build_summary_prompt(game))
 
-    # Retrieve all rolls for the game, ordered by creation time
-    rolls = game.rolls.all().order_by("created_at")
 
-    # Prepare the prompt for the OpenAI API
-    prompt = (
-        f"Summarize a bowling game with the following stats:\n"
-        f"Game ID: {game.id}\n"
-        f"Total Rolls: {len(rolls)}\n"
-    )
+def complete_summary(prompt, timeout=None, max_tokens=None):
+    """
+    Ask the LLM to complete a summary prompt.
 
-    # Add details of each roll to the prompt
-    for roll in rolls:
-        prompt += f"Frame {roll.frame}, Roll {roll.roll_number}: {roll.knocked_down_pins} pins knocked down.\n"
+    This does not touch the database, so it can run in a background worker.
 
-    # Indicate if the game is completed or still in progress
-    prompt += "Game Completed" if game.completed else "Game In Progress"
+    Parameters:
+        prompt (str): The prompt built by build_summary_prompt.
+        timeout (float): Seconds to wait for the API, or None for the client default.
+        max_tokens (int): The most tokens the answer may take, or None for no limit.
+
+    Returns:
+        str: The generated summary.
+
+    Raises:
+        LLMUnavailableError: If the LLM API is unavailable.
+    """
+    options = {} if timeout is None else {"timeout": timeout}
+    if max_tokens is not None:
+        options["max_tokens"] = max_tokens
 
     # Call the OpenAI API to generate the summary
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",  # Specify the model to use
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.8,  # Set the temperature for response variability
-    )
+    def create():
+        with time_llm_call("sync"):
+            return get_openai_client().chat.completions.create(
+                model=llm_settings()["MODEL"],  # Specify the model to use
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.8,  # Set the temperature for response variability
+                **options,
+            )
+
+    response = call_llm(create)
 
     # Return the generated summary content
     return response.choices[0].message.content
+
+
+def summary_fingerprint(game):
+    """
+    Identify the roll state a summary was generated for.
+
+    Parameters:
+        game (Game): The Game instance.
+
+    Returns:
+        tuple[int, int]: The game's roll count and the ID of its last roll.
+    """
+    # Archived games are completed, so their rolls can no longer change
+    if game.packed_rolls is not None:
+        return (game.roll_count, None)
+    last_roll_id = game.rolls.order_by("-id").values_list("id", flat=True).first()
+    return (game.roll_count, last_roll_id)
+
+
+def summary_fingerprints(games):
+    """
+    Identify the roll state of several games with a single query.
+
+    Parameters:
+        games (list[Game]): The Game instances.
+
+    Returns:
+        dict[int, tuple[int, int]]: The summary_fingerprint of each game, by ID.
+    """
+    last_roll_ids = dict(
+        Roll.objects.filter(game_id__in=[game.id for game in games])
+        .values("game_id")
+        .annotate(last_roll_id=Max("id"))
+        .values_list("game_id", "last_roll_id")
+    )
+    return {
+        game.id: (
+            game.roll_count,
+            None if game.packed_rolls is not None else last_roll_ids.get(game.id),
+        )
+        for game in games
+    }
+
+
+async def asummary_fingerprint(game):
+    """
+    Identify the roll state a summary was generated for, using the async ORM.
+
+    Parameters:
+        game (Game): The Game instance.
+
+    Returns:
+        tuple[int, int]: The game's roll count and the ID of its last roll.
+    """
+    # Archived games are completed, so their rolls can no longer change
+    if game.packed_rolls is not None:
+        return (game.roll_count, None)
+    last_roll_id = await game.rolls.order_by("-id").values_list("id", flat=True).afirst()
+    return (game.roll_count, last_roll_id)
+
+
+def get_game_summary(game):
+    """
+    Get the summary of a game, generating it only if the game has changed.
+
+    Summaries are cached per game together with the fingerprint of the roll
+    state they describe, so a cached summary is only served while no roll
+    has been recorded since.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+
+    Returns:
+        str: The summary of the game.
+    """
+    fingerprint = summary_fingerprint(game)
+    summary = get_cached_summary(game.id, fingerprint)
+    if summary is None:
+        summary = generate_game_summary(game)
+        summary_cache.set(game.id, (fingerprint, summary))
+    return summary
+
+
+async def aget_game_summary(game):
+    """
+    Get the summary of a game without blocking the event loop.
+
+    Uses the same cache as get_game_summary, and the shared AsyncOpenAI
+    client for the LLM call.
+
+    Parameters:
+        game (Game): The Game instance to summarize.
+
+    Returns:
+        str: The summary of the game.
+    """
+    fingerprint = await asummary_fingerprint(game)
+    summary = get_cached_summary(game.id, fingerprint)
+    if summary is None:
+        summary = await acomplete_summary(await abuild_summary_prompt(game))
+        summary_cache.set(game.id, (fingerprint, summary))
+    return summary
+
+
+def get_cached_summary(game_id, fingerprint):
+    """
+    Get the cached summary of a game if it still matches its roll state.
+
+    Parameters:
+        game_id (int): The ID of the game.
+        fingerprint (tuple): The current fingerprint from summary_fingerprint.
+
+    Returns:
+        str: The cached summary, or None if there is no up-to-date one.
+    """
+    cached = summary_cache.get(game_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    return None
+
+
+def invalidate_game_summary(game_id):
+    """
+    Drop the cached summary of a game once the current transaction commits.
+
+    Parameters:
+        game_id (int): The ID of the game whose rolls changed.
+    """
+    transaction.on_commit(lambda: summary_cache.delete(game_id))
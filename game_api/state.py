@@ -0,0 +1,282 @@
+"""
+Cached score state of games.
+
+Active games are polled for their score far more often than they receive
+rolls. Each game's score state is kept in a bounded cache, written through
+whenever rolls are recorded, so score reads of hot games neither load the
+game's rolls nor rescore them.
+
+Every state carries a version stamp, the sequence number of the game's latest
+event, which only grows, even when a roll is corrected or undone.
+A state is never replaced by an older one, so a slow writer or a reader
+repopulating the cache after a miss cannot roll a game back.
+
+A cache shared between workers is written through by every one of them, so
+its states are served without touching the database. A per-process cache
+misses the rolls recorded by other workers, so before one of its states is
+served, its version is checked against the game's ``event_sequence`` with a
+single-row query, and a stale state is reloaded.
+"""
+
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from .archive import unpack_rolls
+from .cache import build_cache
+from .metrics import registry
+from .models import Game
+from .replicas import current_read_alias
+
+# Game fields a state is built from
+STATE_FIELDS = [
+    "id",
+    "created_at",
+    "event_sequence",
+    "roll_count",
+    "score",
+    "frame_scores",
+    "completed",
+    "last_roll_at",
+]
+
+
+class GameState:
+    """
+    The score state of a game at a given version.
+
+    States are shared by every reader of the cache and must not be modified.
+
+    Attributes:
+        game_id (int): The ID of the game.
+        version (int): The sequence number of the latest event the state
+            includes; each recorded roll adds one.
+        score (int): The running total.
+        frame_scores (tuple[int]): The score of each frame started so far.
+        completed (bool): Whether the game is completed.
+        modified_at (datetime): When the latest roll was recorded, or when the
+            game was created if it has no rolls.
+        pins (bytes): The pins knocked down by each roll in order, one byte
+            per roll, or None if they have not been loaded.
+    """
+
+    __slots__ = (
+        "game_id",
+        "version",
+        "score",
+        "frame_scores",
+        "completed",
+        "modified_at",
+        "pins",
+    )
+
+    def __init__(
+        self, game_id, version, score, frame_scores, completed, modified_at=None, pins=None
+    ):
+        self.game_id = game_id
+        self.version = version
+        self.score = score
+        self.frame_scores = tuple(frame_scores)
+        self.completed = completed
+        self.modified_at = modified_at
+        self.pins = pins
+
+    @classmethod
+    def from_game(cls, game, pins=None):
+        """Build the state of a Game instance."""
+        return cls(
+            game.id,
+            game.event_sequence,
+            game.score,
+            game.frame_scores,
+            game.completed,
+            game.last_roll_at or game.created_at,
+            pins,
+        )
+
+
+def get_cached_game_state(game_id):
+    """
+    Get the cached state of a game if it is current.
+
+    States of a shared cache are served as they are. A per-process cache may
+    miss rolls recorded by other workers, so its states are checked against
+    the game's latest event sequence, read from the database.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        GameState: The cached state, or None if it is missing or stale.
+
+    Raises:
+        Game.DoesNotExist: If the game is cached but no longer exists.
+    """
+    state = game_state_cache.get(game_id)
+    if state is None or game_state_cache.shared:
+        return state
+    version = Game.objects.values_list("event_sequence", flat=True).get(id=game_id)
+    return state if state.version >= version else None
+
+
+async def aget_cached_game_state(game_id):
+    """
+    Get the cached state of a game if it is current, using the async ORM.
+
+    Behaves like get_cached_game_state.
+    """
+    state = game_state_cache.get(game_id)
+    if state is None or game_state_cache.shared:
+        return state
+    version = await Game.objects.values_list("event_sequence", flat=True).aget(id=game_id)
+    return state if state.version >= version else None
+
+
+def get_game_state(game_id):
+    """
+    Get the score state of a game, from the cache if possible.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        GameState: The state of the game.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+    """
+    state = get_cached_game_state(game_id)
+    if state is None:
+        state = GameState.from_game(Game.objects.only(*STATE_FIELDS).get(id=game_id))
+        cache_read_state(state)
+    return state
+
+
+async def aget_game_state(game_id):
+    """
+    Get the score state of a game using the async ORM on a cache miss.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        GameState: The state of the game.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+    """
+    state = await aget_cached_game_state(game_id)
+    if state is None:
+        game = await Game.objects.only(*STATE_FIELDS).aget(id=game_id)
+        state = GameState.from_game(game)
+        cache_read_state(state)
+    return state
+
+
+def get_game_pins(game_id):
+    """
+    Get the score state of a game with its pins loaded.
+
+    Parameters:
+        game_id (int): The ID of the game.
+
+    Returns:
+        GameState: The state of the game, with ``pins`` set.
+
+    Raises:
+        Game.DoesNotExist: If the game does not exist.
+    """
+    state = get_game_state(game_id)
+    if state.pins is not None:
+        return state
+
+    for _ in range(3):
+        game = Game.objects.only(*STATE_FIELDS, "packed_rolls").get(id=game_id)
+        if game.packed_rolls is not None:
+            pins = unpack_rolls(game.packed_rolls).pins
+            break
+        pins = bytes(
+            game.rolls.order_by("frame", "roll_number").values_list(
+                "knocked_down_pins", flat=True
+            )
+        )
+        # A roll recorded between the two reads makes them disagree; read again
+        if len(pins) == game.roll_count:
+            break
+    else:
+        # Under a steady stream of rolls, return the pins without caching them
+        return GameState.from_game(game, pins)
+
+    state = GameState.from_game(game, pins)
+    cache_read_state(state)
+    return state
+
+
+def cache_read_state(state):
+    """
+    Cache a state read from the database after a cache miss.
+
+    States read from a replica may lag behind the primary and would be
+    served until the game's next roll, so only primary reads are cached.
+    """
+    if current_read_alias() is None:
+        store_game_state(state)
+
+
+def store_game_state(state, new_pins=b""):
+    """
+    Store a game state unless the cache already holds a newer one.
+
+    Parameters:
+        state (GameState): The state to store.
+        new_pins (bytes): The rolls recorded since the previous version; if
+            the cached state has its pins loaded, they are extended with these
+            instead of being dropped.
+    """
+    with _store_lock:
+        current = game_state_cache.peek(state.game_id)
+        if current is not None:
+            if current.version > state.version:
+                return
+            if state.pins is None and current.pins is not None:
+                if current.version == state.version:
+                    state.pins = current.pins
+                elif current.version + len(new_pins) == state.version:
+                    state.pins = current.pins + new_pins
+        game_state_cache.set(state.game_id, state)
+
+
+def write_game_state(game, new_pins):
+    """
+    Write a game's new state through to the cache once the transaction commits.
+
+    Parameters:
+        game (Game): The game, with its cursor and score already advanced.
+        new_pins (list[int]): The pins of the rolls just recorded, in order.
+    """
+    new_pins = bytes(new_pins)
+    # A game's first rolls are all of its pins
+    pins = new_pins if game.roll_count == len(new_pins) else None
+    state = GameState.from_game(game, pins)
+    transaction.on_commit(lambda: store_game_state(state, new_pins))
+
+
+def invalidate_game_state(game_id):
+    """
+    Drop the cached state of a game once the current transaction commits.
+
+    Parameters:
+        game_id (int): The ID of the game.
+    """
+    transaction.on_commit(lambda: game_state_cache.delete(game_id))
+
+
+# Serializes the version check and update in store_game_state. With a shared
+# Django cache, writers in other processes are not serialized; a lost update
+# leaves a stale state until the game's next roll or the TTL.
+_store_lock = threading.Lock()
+
+# Cached game states, keyed by game ID
+game_state_cache = build_cache(getattr(settings, "GAME_STATE_CACHE", {}), "game-state:")
+registry.caches.register("game_state", game_state_cache)
@@ -0,0 +1,165 @@
+"""
+Player statistics and leaderboards.
+
+Each player's aggregates (games, average, high game and frame counts) are
+kept in a ``PlayerStats`` row that is updated with a single statement when
+one of the player's games is completed, so statistics and leaderboards
+never rescore games. Leaderboards read the top rows of an index on the
+stored average or high game.
+
+``rebuild_player_stats`` recomputes every row from the rolls with the
+vectorized batch scorer.
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
+
+from .batch import load_roll_matrix, score_matrix
+from .models import Game, Player, PlayerStats
+from .scoring import PINS, score_rolls
+
+# Leaderboard orderings, by query parameter value
+LEADERBOARD_ORDERINGS = {
+    "average": ("-average", "player_id"),
+    "high_game": ("-high_game", "player_id"),
+}
+
+
+def frame_counts(pins):
+    """
+    Count the strikes, spares and open frames of a game.
+
+    A frame is counted by its first two rolls, as in the batch scorer, so
+    10th frame fill balls are not counted.
+
+    Parameters:
+        pins (Iterable[int]): The pins knocked down by each roll, in order.
+
+    Returns:
+        dict[str, int]: The ``score`` and the number of ``frames``,
+            ``strikes``, ``spares`` and ``open_frames``.
+    """
+    result = score_rolls(pins)
+    counts = {"score": result.total, "frames": len(result.frames), "strikes": 0, "spares": 0}
+    for frame in result.frames:
+        if frame.rolls[0] == PINS:
+            counts["strikes"] += 1
+        elif sum(frame.rolls[:2]) == PINS:
+            counts["spares"] += 1
+    counts["open_frames"] = counts["frames"] - counts["strikes"] - counts["spares"]
+    return counts
+
+
+def record_player_game(game, pins):
+    """
+    Add a completed game to its player's statistics.
+
+    The row is updated with a single statement computed from its current
+    values, so concurrent games of the same player cannot lose an update.
+
+    Parameters:
+        game (Game): The completed game; nothing is done if it has no player.
+        pins (Iterable[int]): The pins knocked down by each roll of the game.
+    """
+    if game.player_id is None:
+        return
+
+    counts = frame_counts(pins)
+    score = counts["score"]
+    changes = {
+        "games": F("games") + 1,
+        "total_score": F("total_score") + score,
+        "average": Cast(F("total_score") + score, FloatField()) / (F("games") + 1),
+        "high_game": Greatest(F("high_game"), score),
+        "frames": F("frames") + counts["frames"],
+        "strikes": F("strikes") + counts["strikes"],
+        "spares": F("spares") + counts["spares"],
+        "open_frames": F("open_frames") + counts["open_frames"],
+        "league_id": Subquery(
+            Player.objects.filter(id=OuterRef("player_id")).values("league_id")
+        ),
+        "updated_at": timezone.now(),
+    }
+    stats = PlayerStats.objects.filter(player_id=game.player_id)
+    if not stats.update(**changes):
+        PlayerStats.objects.get_or_create(player_id=game.player_id)
+        stats.update(**changes)
+
+
+def leaderboard(order="average", league_id=None, limit=10, min_games=1):
+    """
+    Get the top players by average or high game.
+
+    Parameters:
+        order (str): A key of LEADERBOARD_ORDERINGS.
+        league_id (int): Only rank the players of this league.
+        limit (int): The number of players to return.
+        min_games (int): Only rank players with at least this many games.
+
+    Returns:
+        list[PlayerStats]: The statistics of the top players, with their
+            players loaded.
+    """
+    stats = PlayerStats.objects.select_related("player")
+    if league_id is not None:
+        stats = stats.filter(league_id=league_id)
+    if min_games > 1:
+        stats = stats.filter(games__gte=min_games)
+    return list(stats.order_by(*LEADERBOARD_ORDERINGS[order])[:limit])
+
+
+def rebuild_player_stats(chunk_size=10000):
+    """
+    Recompute the statistics of every player from the rolls of their games.
+
+    Completed games are scored with the batch scorer and aggregated per
+    player with NumPy, then all rows are replaced in one transaction.
+
+    Parameters:
+        chunk_size (int): Number of rolls fetched from the database at a time.
+
+    Returns:
+        int: The number of players with statistics.
+    """
+    games = Game.objects.filter(completed=True, player__isnull=False)
+    with transaction.atomic():
+        game_ids, matrix, lengths = load_roll_matrix(games, chunk_size=chunk_size)
+        result = score_matrix(matrix, lengths)
+
+        owners = dict(games.values_list("id", "player_id"))
+        player_column = np.array([owners[game_id] for game_id in game_ids.tolist()])
+        player_ids, rows = np.unique(player_column, return_inverse=True)
+
+        def total(values):
+            return np.bincount(rows, weights=values, minlength=len(player_ids)).astype(int)
+
+        counts = np.bincount(rows, minlength=len(player_ids))
+        scores = total(result["score"])
+        high_games = np.zeros(len(player_ids), dtype=np.int32)
+        np.maximum.at(high_games, rows, result["score"])
+        strikes, spares = total(result["strikes"]), total(result["spares"])
+        open_frames = total(result["open_frames"])
+
+        leagues = dict(
+            Player.objects.filter(id__in=player_ids.tolist()).values_list("id", "league_id")
+        )
+        PlayerStats.objects.all().delete()
+        PlayerStats.objects.bulk_create(
+            PlayerStats(
+                player_id=player_id,
+                league_id=leagues[player_id],
+                games=int(counts[index]),
+                total_score=int(scores[index]),
+                average=scores[index] / counts[index],
+                high_game=int(high_games[index]),
+                frames=int(strikes[index] + spares[index] + open_frames[index]),
+                strikes=int(strikes[index]),
+                spares=int(spares[index]),
+                open_frames=int(open_frames[index]),
+            )
+            for index, player_id in enumerate(player_ids.tolist())
+        )
+    return len(player_ids)
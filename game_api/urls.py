@@ -1,15 +1,121 @@
 from django.urls import path
-from .views import GameView, GameRollView, GameScoreView, GameSummaryView
+from .async_views import (
+    AsyncCenterLiveView,
+    AsyncGameLiveView,
+    AsyncGameRollView,
+    AsyncGameScoreView,
+    AsyncGameSummaryView,
+    AsyncGameView,
+)
+from .views import (
+    BulkRollView,
+    CenterLiveView,
+    GameBulkRollView,
+    GameEventView,
+    GameExportView,
+    GameLiveView,
+    GameReplayView,
+    GameView,
+    GameRollCorrectionView,
+    GameRollView,
+    MetricsView,
+    GameScoreView,
+    GameScorecardView,
+    GameSummaryBatchView,
+    GameSummaryView,
+    GameUndoRollView,
+    LeaderboardView,
+    LeagueView,
+    PlayerStatsView,
+    PlayerView,
+    SummaryJobView,
+)
 
 urlpatterns = [
     # Endpoint to create a new bowling game or list existing games
     path("games/", GameView.as_view(), name="games"),
     # Endpoint to record a roll for a specific game
     path("games/<int:game_id>/rolls/", GameRollView.as_view(), name="rolls"),
+    # Endpoint to stream every game with its rolls and scores
+    path("games/export/", GameExportView.as_view(), name="game_export"),
+    # Endpoint to record an ordered batch of rolls for a specific game
+    path(
+        "games/<int:game_id>/rolls/bulk/",
+        GameBulkRollView.as_view(),
+        name="bulk_rolls",
+    ),
+    # Endpoints to correct a mis-keyed roll or undo the last roll of a game
+    path(
+        "games/<int:game_id>/rolls/correct/",
+        GameRollCorrectionView.as_view(),
+        name="correct_roll",
+    ),
+    path("games/<int:game_id>/rolls/undo/", GameUndoRollView.as_view(), name="undo_roll"),
+    # Endpoints to read the event log of a game and rebuild it from the log
+    path("games/<int:game_id>/events/", GameEventView.as_view(), name="game_events"),
+    path("games/<int:game_id>/replay/", GameReplayView.as_view(), name="game_replay"),
+    # Endpoint to record ordered batches of rolls for several games
+    path("games/rolls/bulk/", BulkRollView.as_view(), name="bulk_game_rolls"),
     # Endpoint to retrieve the current score of a specific game
     path("games/<int:game_id>/score/", GameScoreView.as_view(), name="score"),
+    # Endpoint to retrieve the frame by frame scorecard of a specific game
+    path(
+        "games/<int:game_id>/scorecard/",
+        GameScorecardView.as_view(),
+        name="scorecard",
+    ),
     # Endpoint to get a natural language summary of the current game state
     path(
         "games/<int:game_id>/summary/", GameSummaryView.as_view(), name="game_summary"
     ),
+    # Endpoint to summarize many games with batched LLM calls
+    path("games/summaries/", GameSummaryBatchView.as_view(), name="game_summaries"),
+    # Former live score streams, now pointing clients to the async streams
+    path("games/<int:game_id>/live/", GameLiveView.as_view(), name="game_live"),
+    path("centers/<str:center>/live/", CenterLiveView.as_view(), name="center_live"),
+    # Endpoint to poll a summary being generated in the background
+    path("summary-jobs/<str:job_id>/", SummaryJobView.as_view(), name="summary_job"),
+    # Endpoints to manage leagues and players
+    path("leagues/", LeagueView.as_view(), name="leagues"),
+    path("players/", PlayerView.as_view(), name="players"),
+    # Endpoint to retrieve the aggregate statistics of a player
+    path(
+        "players/<int:player_id>/stats/", PlayerStatsView.as_view(), name="player_stats"
+    ),
+    # Endpoints ranking the top players overall or within a league
+    path("leaderboard/", LeaderboardView.as_view(), name="leaderboard"),
+    path(
+        "leagues/<int:league_id>/leaderboard/",
+        LeaderboardView.as_view(),
+        name="league_leaderboard",
+    ),
+    # Endpoint exposing request, database, LLM and cache metrics to Prometheus
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    # Native async versions of the endpoints above, for ASGI deployments
+    path("async/games/", AsyncGameView.as_view(), name="async_games"),
+    path(
+        "async/games/<int:game_id>/rolls/",
+        AsyncGameRollView.as_view(),
+        name="async_rolls",
+    ),
+    path(
+        "async/games/<int:game_id>/score/",
+        AsyncGameScoreView.as_view(),
+        name="async_score",
+    ),
+    path(
+        "async/games/<int:game_id>/summary/",
+        AsyncGameSummaryView.as_view(),
+        name="async_game_summary",
+    ),
+    path(
+        "async/games/<int:game_id>/live/",
+        AsyncGameLiveView.as_view(),
+        name="async_game_live",
+    ),
+    path(
+        "async/centers/<str:center>/live/",
+        AsyncCenterLiveView.as_view(),
+        name="async_center_live",
+    ),
 ]
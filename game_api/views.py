@@ -1,22 +1,106 @@
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from rest_framework import views
 from rest_framework import generics
-from .serializers import GameSerializer, RollSerializer
-from .models import Game, Roll
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from .serializers import (
+    BulkGamesSerializer,
+    BulkRollSerializer,
+    GameEventSerializer,
+    GameSerializer,
+    LeagueSerializer,
+    PlayerSerializer,
+    PlayerStatsSerializer,
+    RollCorrectionSerializer,
+    RollSerializer,
+    SummaryBatchSerializer,
+)
+from .batch_summaries import summarize_games
+from .conditional import game_cache_headers, not_modified
+from .events import replay_game
+from .export import FORMATS, export_records, render
+from .feed import EventStreamRenderer
+from .jobs import summary_jobs
+from .llm import LLMUnavailableError, ensure_llm_available
+from .metrics import metrics_settings, registry
+from .models import Game, GameEvent, League, Player, PlayerStats
+from .pagination import KeysetPagination
 from rest_framework.response import Response
 from rest_framework import status
-from .services import calculate_score, generate_game_summary
-
-
-class GameView(generics.ListCreateAPIView):
+from .services import (
+    IdempotencyKeyReused,
+    InvalidRollError,
+    correct_roll,
+    get_cached_summary,
+    get_fallback_summary,
+    get_game_summary,
+    lock_game,
+    lock_games,
+    record_rolls,
+    submit_roll,
+    summary_fingerprint,
+    undo_roll,
+)
+from .replicas import ReplicaReadsMixin, current_read_alias
+from .scoring import score_rolls
+from .state import GameState, get_cached_game_state, get_game_pins, get_game_state
+from .stats import LEADERBOARD_ORDERINGS, leaderboard
+
+
+class GameView(ReplicaReadsMixin, generics.ListCreateAPIView):
     """
     API view to retrieve and create games.
 
-    This view supports GET requests to list all games
-    and POST requests to create a new game.
+    This view supports GET requests to list games, newest first, one keyset
+    paginated page at a time, and POST requests to create a new game.
+
+    The listing accepts the following query parameters:
+        - completed: Only list completed (true) or in-progress (false) games.
+        - created_after, created_before: Limit games to a created_at range.
+        - fields: Comma separated fields to return, e.g. ``fields=id,title``.
+        - include: Comma separated optional fields to add, e.g. ``include=score``.
     """
 
     serializer_class = GameSerializer
     queryset = Game.objects.all()
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Filter the games and load only the columns that are serialized."""
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        completed = params.get("completed")
+        if completed is not None:
+            queryset = queryset.filter(completed=completed.lower() in ("true", "1"))
+
+        for param, lookup in (("created_after", "gte"), ("created_before", "lt")):
+            if params.get(param):
+                created_at = parse_datetime(params[param])
+                if created_at is None:
+                    raise ValidationError({param: "Enter a valid ISO 8601 datetime."})
+                queryset = queryset.filter(**{f"created_at__{lookup}": created_at})
+
+        if self.request.method == "GET":
+            # created_at and id are always needed to build the next page cursor
+            fields = set(self.get_serializer().fields) | {"id", "created_at"}
+            queryset = queryset.only(*fields)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Pass the sparse fieldset and optional fields from the query string."""
+        if self.request.method == "GET":
+            kwargs.setdefault("fields", self.split_param("fields"))
+            kwargs.setdefault("include", self.split_param("include"))
+        return super().get_serializer(*args, **kwargs)
+
+    def split_param(self, name):
+        """Return the comma separated values of a query parameter as a list."""
+        value = self.request.query_params.get(name, "")
+        return [item.strip() for item in value.split(",") if item.strip()]
 
 
 class GameRollView(views.APIView):
@@ -24,7 +108,14 @@ class GameRollView(views.APIView):
     API view to handle roll submissions for a specific game.
 
     This view allows players to submit their knocked down pins for a roll.
-    It also calculates the current frame and determines if the game is complete.
+    The frame, roll number and completion of the game are taken from the
+    frame cursor stored on the game, so no previous rolls are read. The game
+    is locked while the roll is recorded, so concurrent submissions for the
+    same game are recorded one after the other.
+
+    Requests may carry an ``Idempotency-Key`` header: a retried request with
+    the same key gets the original response instead of recording the roll
+    again.
     """
 
     def post(self, request, game_id):
@@ -38,23 +129,6 @@ class GameRollView(views.APIView):
         Returns:
             Response: The response object with the roll data or an error message.
         """
-        # Response to be sent if game is already completed.
-        game_completed_response = Response(
-            {"error": "Game is already completed"}, status=status.HTTP_400_BAD_REQUEST
-        )
-
-        # Retrieve the game or return an error if it doesn't exist
-        try:
-            game = Game.objects.get(id=game_id)
-        except Game.DoesNotExist:
-            return Response(
-                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        # If the game is completed, return an error response
-        if game.completed:
-            return game_completed_response
-
         # Retrieve knocked_down_pins from the request body
         knocked_down_pins = request.data.get("knocked_down_pins")
 
@@ -78,114 +152,395 @@ class GameRollView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Fetch all rolls in database ordered by creation time
-        rolls = game.rolls.all().order_by("created_at")
-
-        # Initialize current_frame and roll_number variable
-        current_frame = 1
-        roll_number = None
-
-        # Determine the current frame by looping through rolls
-        i = 0
-        while i < len(rolls):
-            roll = rolls[i]
-
-            if current_frame < 10:
-                if roll.knocked_down_pins == 10:
-                    current_frame += 1
-                else:
-                    i += 1  # Go to the next roll for this frame
-                    if i < len(rolls):
-                        current_frame += 1
-            else:
-                frame_rolls = rolls.filter(frame=10)
-                if len(frame_rolls) == 3:
-                    game.completed = True
-                    game.save()
-                    return game_completed_response
-                break  # Stay in the 10th frame
-            i += 1  # Move to the next roll
-
-        # Handle frame-specific logic based on frame count
-        frame_rolls = rolls.filter(frame=current_frame)
-
-        if current_frame == 10:
-            if len(frame_rolls) == 3:
-                game.completed = True
-                game.save()
-                return game_completed_response
-
-            if len(frame_rolls) == 1 and frame_rolls[0].knocked_down_pins == 10:
-                roll_number = 2
-            elif len(frame_rolls) == 2:
-                first_roll = frame_rolls[0]
-                second_roll = frame_rolls[1]
-                if first_roll.knocked_down_pins == 10 or (
-                    first_roll.knocked_down_pins + second_roll.knocked_down_pins == 10
-                ):
-                    roll_number = 3
-                else:
-                    game.completed = True
-                    game.save()
-                    return game_completed_response
-            else:
-                roll_number = 1
-        else:
-            if len(frame_rolls) == 0:
-                roll_number = 1
-            elif len(frame_rolls) == 1:
-                if frame_rolls[0].knocked_down_pins + knocked_down_pins > 10:
-                    return Response(
-                        {
-                            "error": "Total knocked down pins for the frame cannot exceed 10"
-                        },
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-                if frame_rolls[0].knocked_down_pins == 10:
-                    current_frame += 1
-                    roll_number = 1
-                else:
-                    roll_number = 2
-
-        if roll_number is None:
-            return Response(
-                {"error": "Could not determine roll number"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        # Create the roll record
-        roll = Roll.objects.create(
-            game=game,
-            frame=current_frame,
-            roll_number=roll_number,
-            knocked_down_pins=knocked_down_pins,
-        )
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+            return Response(
+                {"error": "Idempotency-Key must be between 1 and 255 characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        if (
-            current_frame == 10
-            and len(frame_rolls) == 2
-            and sum([r.knocked_down_pins for r in frame_rolls]) < 10
-        ):
-            game.completed = True
-            game.save()
+        # Record the roll against the game's frame cursor, with the game locked
+        try:
+            roll, replayed = submit_roll(game_id, knocked_down_pins, idempotency_key)
+        except Game.DoesNotExist:
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except InvalidRollError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        except IdempotencyKeyReused as error:
+            return Response(
+                {"error": str(error)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
 
         # Serialize and return the roll data
         serializer = RollSerializer(roll)
-        return Response(
+        response = Response(
             {
                 "message": "Roll recorded successfully",
                 "data": serializer.data,
             },
             status=status.HTTP_201_CREATED,
         )
+        if replayed:
+            response["Idempotent-Replayed"] = "true"
+        return response
+
+
+class GameBulkRollView(views.APIView):
+    """
+    API view to record an ordered batch of rolls for a specific game.
+
+    Consoles replaying buffered rolls can submit a whole frame or a complete
+    game in one request. The batch is validated as a whole, so either every
+    roll is recorded or none are.
+    """
+
+    def post(self, request, game_id):
+        """
+        Submit a batch of rolls for a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object containing the rolls.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The response object with the recorded rolls or an error message.
+        """
+        serializer = BulkRollSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # Retrieve and lock the game or return an error if it doesn't exist
+            try:
+                game = lock_game(game_id)
+            except Game.DoesNotExist:
+                return Response(
+                    {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+
+            try:
+                rolls = record_rolls(
+                    [(game, serializer.validated_data["rolls"])], locked=True
+                )
+            except InvalidRollError as error:
+                return Response(
+                    {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response(
+            {
+                "message": "Rolls recorded successfully",
+                "data": RollSerializer(rolls, many=True).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class BulkRollView(views.APIView):
+    """
+    API view to record ordered batches of rolls for several games at once.
+    """
+
+    def post(self, request):
+        """
+        Submit batches of rolls for several games.
+
+        Parameters:
+            request (Request): The HTTP request object containing the games and their rolls.
+
+        Returns:
+            Response: The response object with the state of each game or an error message.
+        """
+        serializer = BulkGamesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        batches = serializer.validated_data["games"]
+
+        with transaction.atomic():
+            # Retrieve and lock all games at once and report any that don't exist
+            games = lock_games([batch["game_id"] for batch in batches])
+            missing = [
+                batch["game_id"] for batch in batches if batch["game_id"] not in games
+            ]
+            if missing:
+                return Response(
+                    {"error": "Game not found", "game_ids": missing},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            try:
+                record_rolls(
+                    [(games[batch["game_id"]], batch["rolls"]) for batch in batches],
+                    locked=True,
+                )
+            except InvalidRollError as error:
+                return Response(
+                    {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response(
+            {
+                "message": "Rolls recorded successfully",
+                "data": [
+                    {
+                        "game_id": batch["game_id"],
+                        "rolls_recorded": len(batch["rolls"]),
+                        "score": games[batch["game_id"]].score,
+                        "completed": games[batch["game_id"]].completed,
+                    }
+                    for batch in batches
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+def fallback_summary_response(game, error):
+    """Build the scorecard summary answered while the LLM is unavailable."""
+    return Response(
+        {"game_id": game.id, "summary": get_fallback_summary(game, error), "fallback": True},
+        status=status.HTTP_200_OK,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def roll_change_response(event, message):
+    """Build the response to a correction or undo, with the game's new score."""
+    return Response(
+        {
+            "message": message,
+            "event": GameEventSerializer(event).data,
+            "score": event.game.score,
+            "completed": event.game.completed,
+        },
+        status=status.HTTP_201_CREATED,
+    )
+
+
+class GameRollCorrectionView(views.APIView):
+    """
+    API view to correct a mis-keyed roll of a game in progress.
+
+    The rolls after the corrected one are moved into the frames they now
+    fall in, and the game's score is recomputed. The correction is appended
+    to the game's event log, so the original roll stays on record.
+    """
+
+    def post(self, request, game_id):
+        """
+        Correct a roll of a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object with the position of
+                the roll, from 1, and the pins it actually knocked down.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The correction event and the game's new score, or an
+                error message.
+        """
+        serializer = RollCorrectionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            event = correct_roll(
+                game_id,
+                serializer.validated_data["roll"] - 1,
+                serializer.validated_data["knocked_down_pins"],
+            )
+        except Game.DoesNotExist:
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except InvalidRollError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return roll_change_response(event, "Roll corrected successfully")
+
+
+class GameUndoRollView(views.APIView):
+    """
+    API view to remove the last roll of a game in progress.
+
+    The removal is appended to the game's event log like a correction.
+    """
+
+    def post(self, request, game_id):
+        """
+        Undo the last roll of a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The undo event and the game's new score, or an error
+                message.
+        """
+        try:
+            event = undo_roll(game_id)
+        except Game.DoesNotExist:
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except InvalidRollError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return roll_change_response(event, "Roll undone successfully")
+
+
+class GameEventView(views.APIView):
+    """
+    API view to read the event log of a specific game, for auditing.
+
+    Events are listed in sequence order; ``?after=<sequence>`` lists only the
+    events appended since. Archived games have no events left.
+    """
+
+    def get(self, request, game_id):
+        """
+        List the events of a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The game's events, or an error message.
+        """
+        try:
+            after = int(request.query_params.get("after", 0))
+        except ValueError:
+            return Response(
+                {"error": "after must be a sequence number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not Game.objects.filter(id=game_id).exists():
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        events = GameEvent.objects.filter(game_id=game_id, sequence__gt=after).order_by(
+            "sequence"
+        )
+        return Response(
+            {"game_id": game_id, "events": GameEventSerializer(events, many=True).data},
+            status=status.HTTP_200_OK,
+        )
+
+
+class GameReplayView(views.APIView):
+    """
+    API view to rebuild a game as of any event of its log.
+
+    The game is rebuilt from its latest snapshot at or before the event plus
+    the events after it, so the cost grows with the events since the
+    snapshot, not with the length of the game's history.
+    """
+
+    def get(self, request, game_id):
+        """
+        Replay a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object. Accepts a
+                ``sequence`` query parameter, the event to stop at; the
+                default is the latest event.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The rebuilt rolls and frame scores, or an error message.
+        """
+        sequence = request.query_params.get("sequence")
+        try:
+            sequence = int(sequence) if sequence else None
+        except ValueError:
+            return Response(
+                {"error": "sequence must be a sequence number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            replay = replay_game(game_id, sequence)
+        except Game.DoesNotExist:
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(replay.as_dict(), status=status.HTTP_200_OK)
+
+
+class GameExportView(ReplicaReadsMixin, views.APIView):
+    """
+    API view to stream every game with its rolls and scores.
+
+    The export is streamed as it is read from the database, so memory use
+    stays constant regardless of how many games and rolls are exported.
+    """
+
+    def get(self, request):
+        """
+        Stream games as NDJSON or CSV.
+
+        Parameters:
+            request (Request): The HTTP request object. Accepts ``output``
+                (ndjson or csv), ``after`` (the last game ID already exported)
+                and ``completed`` (true or false) query parameters.
+
+        Returns:
+            StreamingHttpResponse: The streamed export, or an error response.
+        """
+        params = request.query_params
+        export_format = params.get("output", "ndjson")
+        if export_format not in FORMATS:
+            return Response(
+                {"error": f"output must be one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            after = int(params["after"]) if params.get("after") else None
+        except ValueError:
+            return Response(
+                {"error": "after must be a game ID"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        completed = params.get("completed")
+        if completed is not None:
+            completed = completed.lower() in ("true", "1")
+
+        # The export is streamed after the view returns, outside of the
+        # replica routing, so the replica is passed explicitly
+        records = export_records(
+            after=after, completed=completed, using=current_read_alias()
+        )
+        response = StreamingHttpResponse(
+            render(records, export_format), content_type=FORMATS[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="games.{export_format}"'
+        return response
 
 
-class GameScoreView(views.APIView):
+class GameScoreView(ReplicaReadsMixin, views.APIView):
     """
     API view to retrieve the score for a specific game.
 
     This view allows players to get the current score of their game.
+    The score is maintained as each roll is recorded and cached with the
+    game's state, so reads of active games only check its version.
+    Responses carry the game's validators and Cache-Control headers.
     """
 
     def get(self, request, game_id):
@@ -199,22 +554,156 @@ class GameScoreView(views.APIView):
         Returns:
             Response: The response object containing the score or an error message.
         """
-        # Retrieve the game or return an error if it doesn't exist
+        # Read the cached running score of the game, or return an error if it doesn't exist
         try:
-            game = Game.objects.get(id=game_id)
+            state = get_game_state(game_id)
         except Game.DoesNotExist:
             return Response(
                 {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        # Calculate the score for the game
-        score = calculate_score(game=game)
-        return Response({"game_id": game.id, "score": score}, status=status.HTTP_200_OK)
+        headers = game_cache_headers(state, "score")
+        return not_modified(request, state, headers) or Response(
+            {"game_id": game_id, "score": state.score},
+            status=status.HTTP_200_OK,
+            headers=headers,
+        )
+
+
+class GameScorecardView(ReplicaReadsMixin, views.APIView):
+    """
+    API view to retrieve the scorecard of a specific game.
+
+    The scorecard lists each frame's rolls, score and running total, flags
+    the strikes and spares still waiting on bonus rolls and gives the highest
+    score the game can still reach, so lane displays do not need the rolls
+    or any scoring logic of their own.
+
+    Responses carry an ETag that changes with every roll. A conditional
+    request whose copy is current gets 304 Not Modified from the cached game
+    state, without loading the rolls.
+    """
+
+    def get(self, request, game_id):
+        """
+        Retrieve the scorecard of a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: The scorecard, 304 Not Modified or an error message.
+        """
+        try:
+            state = get_game_state(game_id)
+            response = not_modified(request, state, game_cache_headers(state, "scorecard"))
+            if response is not None:
+                return response
+            state = get_game_pins(game_id)
+        except Game.DoesNotExist:
+            return Response(
+                {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Score the ordered rolls in a single pass
+        result = score_rolls(state.pins)
+        scorecard = {
+            "game_id": game_id,
+            "score": result.total,
+            "completed": result.completed,
+            "max_possible_score": result.max_score,
+            "frames": [
+                {
+                    "frame": frame.number,
+                    "rolls": frame.rolls,
+                    "score": frame.score,
+                    "cumulative": frame.cumulative,
+                    "pending_bonus": frame.pending_bonus,
+                }
+                for frame in result.frames
+            ],
+        }
+        return Response(
+            scorecard,
+            status=status.HTTP_200_OK,
+            headers=game_cache_headers(state, "scorecard"),
+        )
+
+
+def live_stream_moved(request, path):
+    """Return 410 Gone with the URL where a live score stream is served."""
+    url = request.build_absolute_uri(path)
+    return Response(
+        {"error": f"Live score streams are served at {path}", "stream_url": url},
+        status=status.HTTP_410_GONE,
+    )
 
 
-class GameSummaryView(views.APIView):
+class GameLiveView(views.APIView):
+    """
+    API view pointing clients to the live score stream of a specific game.
+
+    An open stream holds its WSGI worker thread for as long as the client
+    stays connected, so a few lane displays could take every thread of a
+    synchronous deployment. Streams are only served by the async view.
+    """
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, game_id):
+        """
+        Point the client to the async stream of a specific game.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            game_id (int): The ID of the game.
+
+        Returns:
+            Response: An error response with the URL of the async stream.
+        """
+        return live_stream_moved(request, reverse("async_game_live", args=[game_id]))
+
+
+class CenterLiveView(views.APIView):
+    """
+    API view pointing clients to the live score stream of a bowling center.
+
+    Like GameLiveView, streams are only served by the async view.
+    """
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, center):
+        """
+        Point the client to the async stream of a bowling center.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            center (str): The name of the bowling center.
+
+        Returns:
+            Response: An error response with the URL of the async stream.
+        """
+        return live_stream_moved(request, reverse("async_center_live", args=[center]))
+
+
+class GameSummaryView(ReplicaReadsMixin, views.APIView):
     """
     API view to generate a game summary for a specific bowling game.
+
+    Summaries are cached until the next roll is recorded for the game.
+    With ``?async=true`` an uncached summary is generated in the background:
+    the view answers 202 with a job to poll instead of waiting for the LLM.
+
+    Summaries carry the game's validators, with a weak ETag since a
+    regenerated summary is worded differently. A conditional request whose
+    copy is current gets 304 Not Modified before the game is loaded.
+
+    While the LLM is unavailable, the view answers right away with a summary
+    built from the scorecard, flagged with ``"fallback": true`` and never
+    stored by caches. Async requests get it instead of a job while the
+    circuit breaker is open.
     """
 
     def get(self, request, game_id):
@@ -226,19 +715,285 @@ class GameSummaryView(views.APIView):
             game_id (int): The ID of the game.
 
         Returns:
-            Response: The response object containing the game summary or an error message.
+            Response: The response object containing the game summary, the
+                background job generating it, or an error message.
         """
         # Retrieve the game or return an error if it doesn't exist
         try:
-            game = Game.objects.get(id=game_id)
+            # Check the client's copy against the cached state before loading
+            # the game, or against the game itself on a cache miss
+            game = None
+            state = get_cached_game_state(game_id)
+            if state is None:
+                game = Game.objects.get(id=game_id)
+                state = GameState.from_game(game)
+            response = not_modified(
+                request, state, game_cache_headers(state, "summary", weak=True)
+            )
+            if response is not None:
+                return response
+            if game is None:
+                game = Game.objects.get(id=game_id)
         except Game.DoesNotExist:
             return Response(
                 {"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        # Generate the game summary
-        summary = generate_game_summary(game)
+        if request.query_params.get("async", "").lower() in ("true", "1"):
+            # Serve an up-to-date cached summary right away, otherwise queue it
+            fingerprint = summary_fingerprint(game)
+            summary = get_cached_summary(game.id, fingerprint)
+            if summary is None:
+                # A job could not reach the LLM either; answer the fallback now
+                try:
+                    ensure_llm_available()
+                except LLMUnavailableError as error:
+                    return fallback_summary_response(game, error)
+                job = summary_jobs.submit(game, fingerprint=fingerprint)
+                data = job.as_dict()
+                data["status_url"] = request.build_absolute_uri(
+                    reverse("summary_job", args=[job.id])
+                )
+                return Response(data, status=status.HTTP_202_ACCEPTED)
+        else:
+            # Generate the game summary, or reuse it if no roll was recorded since
+            try:
+                summary = get_game_summary(game)
+            except LLMUnavailableError as error:
+                return fallback_summary_response(game, error)
 
         return Response(
-            {"game_id": game.id, "summary": summary}, status=status.HTTP_200_OK
+            {"game_id": game.id, "summary": summary},
+            status=status.HTTP_200_OK,
+            headers=game_cache_headers(GameState.from_game(game), "summary", weak=True),
+        )
+
+
+class GameSummaryBatchView(views.APIView):
+    """
+    API view to summarize many games with as few LLM calls as possible.
+
+    Games are packed several per call in a compact frame notation, within
+    the per-call token budget, and the calls run concurrently. Games are
+    given by ID, or by bowling center for an end-of-night recap.
+    """
+
+    def post(self, request):
+        """
+        Summarize a set of games.
+
+        Parameters:
+            request (Request): The HTTP request object containing the games to
+                summarize.
+
+        Returns:
+            Response: The summary of each game with the number of LLM calls
+                and prompt tokens spent, or an error message.
+        """
+        serializer = SummaryBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        data = serializer.validated_data
+        games = Game.objects.only("id", "roll_count", "packed_rolls")
+
+        if "game_ids" in data:
+            found = games.in_bulk(data["game_ids"])
+            missing = [game_id for game_id in data["game_ids"] if game_id not in found]
+            if missing:
+                return Response(
+                    {"error": "Game not found", "game_ids": missing},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            games = [found[game_id] for game_id in data["game_ids"]]
+        else:
+            games = games.filter(center=data["center"]).order_by("id")
+            if "created_after" in data:
+                games = games.filter(created_at__gte=data["created_after"])
+            games = list(games[: SummaryBatchSerializer.MAX_GAMES + 1])
+            if len(games) > SummaryBatchSerializer.MAX_GAMES:
+                return Response(
+                    {
+                        "error": f"More than {SummaryBatchSerializer.MAX_GAMES} games "
+                        "match, narrow them down with created_after"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        return Response(summarize_games(games).as_dict(), status=status.HTTP_200_OK)
+
+
+class SummaryJobView(views.APIView):
+    """
+    API view to poll a summary being generated in the background.
+    """
+
+    def get(self, request, job_id):
+        """
+        Retrieve the status of a summary job, and the summary once it is done.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            job_id (str): The ID of the job.
+
+        Returns:
+            Response: The response object containing the job status or an error message.
+        """
+        job = summary_jobs.get(job_id)
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(job.as_dict(), status=status.HTTP_200_OK)
+
+
+class MetricsView(views.APIView):
+    """
+    API view exposing the request, database, LLM and cache metrics.
+
+    The metrics are rendered in the Prometheus text format, for scraping.
+    """
+
+    def get(self, request):
+        """
+        Render the metrics.
+
+        Parameters:
+            request (Request): The HTTP request object.
+
+        Returns:
+            HttpResponse: The metrics, or an error if they are disabled.
+        """
+        if not metrics_settings()["ENABLED"]:
+            return Response(
+                {"error": "Metrics are disabled"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
         )
+
+
+class LeagueView(generics.ListCreateAPIView):
+    """
+    API view to list and create leagues.
+    """
+
+    serializer_class = LeagueSerializer
+    queryset = League.objects.order_by("name")
+
+
+class PlayerView(generics.ListCreateAPIView):
+    """
+    API view to list players, newest first, and to create players.
+
+    The listing is keyset paginated like the game listing and accepts a
+    ``league`` query parameter to only list the players of a league.
+    """
+
+    serializer_class = PlayerSerializer
+    queryset = Player.objects.all()
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Filter the players by league."""
+        queryset = super().get_queryset()
+        league = self.request.query_params.get("league")
+        if league:
+            if not league.isdigit():
+                raise ValidationError({"league": "Enter a league ID."})
+            queryset = queryset.filter(league_id=league)
+        return queryset
+
+
+class PlayerStatsView(ReplicaReadsMixin, views.APIView):
+    """
+    API view to retrieve the aggregate statistics of a player.
+
+    The statistics are maintained as the player's games are completed, so
+    this reads a single row.
+    """
+
+    def get(self, request, player_id):
+        """
+        Retrieve the statistics of a specific player.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            player_id (int): The ID of the player.
+
+        Returns:
+            Response: The response object containing the statistics or an error message.
+        """
+        try:
+            stats = PlayerStats.objects.select_related("player").get(player_id=player_id)
+        except PlayerStats.DoesNotExist:
+            # A player without completed games has empty statistics
+            try:
+                player = Player.objects.get(id=player_id)
+            except Player.DoesNotExist:
+                return Response(
+                    {"error": "Player not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+            stats = PlayerStats(player=player, league_id=player.league_id)
+
+        return Response(PlayerStatsSerializer(stats).data, status=status.HTTP_200_OK)
+
+
+class LeaderboardView(ReplicaReadsMixin, views.APIView):
+    """
+    API view to rank the top players overall or within a league.
+
+    Accepts the following query parameters:
+        - order: ``average`` (default) or ``high_game``.
+        - limit: The number of players to return, 1 to 100 (default 10).
+        - min_games: Only rank players with at least this many games (default 1).
+
+    The top players are read from an index on the stored statistics, so
+    the cost does not depend on the number of players or games.
+    """
+
+    max_limit = 100
+
+    def get(self, request, league_id=None):
+        """
+        Retrieve the leaderboard.
+
+        Parameters:
+            request (Request): The HTTP request object.
+            league_id (int): The ID of the league to rank, or None for all players.
+
+        Returns:
+            Response: The response object containing the ranked players or an error message.
+        """
+        params = request.query_params
+        order = params.get("order", "average")
+        if order not in LEADERBOARD_ORDERINGS:
+            return Response(
+                {"error": f"order must be one of: {', '.join(LEADERBOARD_ORDERINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = int(params.get("limit", 10))
+            min_games = int(params.get("min_games", 1))
+        except ValueError:
+            return Response(
+                {"error": "limit and min_games must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= limit <= self.max_limit:
+            return Response(
+                {"error": f"limit must be between 1 and {self.max_limit}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if league_id is not None and not League.objects.filter(id=league_id).exists():
+            return Response({"error": "League not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        stats = leaderboard(order, league_id=league_id, limit=limit, min_games=min_games)
+        results = [
+            {"rank": rank, **data}
+            for rank, data in enumerate(PlayerStatsSerializer(stats, many=True).data, 1)
+        ]
+        return Response({"order": order, "results": results}, status=status.HTTP_200_OK)